@@ -5,50 +5,56 @@ See the LICENSE file for licensing informations
 
 This module contains the 'anwdlclient' CLI.
 
+NOTE : Heavy dependencies (cryptography, requests, SQLite, ...) are imported
+by the subcommands that need them, in order to keep the CLI startup fast.
+Run 'benchmarks/cli_startup.py' to measure it after a modification.
+
 """
 
+# Imported first, so that the profiling mode can measure the importations time
+import time
+
+CLI_IMPORT_START_TIME = time.perf_counter()
+
+from contextlib import nullcontext
 from datetime import datetime
 from getpass import getpass
-from subprocess import Popen, PIPE
+from itertools import islice
 import argparse
 import hashlib
-import random
-import string
 import json
 import sys
 import os
 
 # Intern importation
-from .core.crypto import RSAWrapper, DEFAULT_RSA_KEY_SIZE
-from .core.utilities import isValidIP
-from .core.client import (
-    ClientInterface,
-    DEFAULT_SERVER_LISTEN_PORT,
-    REQUEST_VERB_CREATE,
-    REQUEST_VERB_DESTROY,
-    REQUEST_VERB_STAT,
-)
-from .web.client import (
-    WebClientInterface,
-    DEFAULT_HTTP_SERVER_LISTEN_PORT,
-    DEFAULT_ENABLE_SSL,
+from .core.utilities import isValidIP, waitSSHReady, DEFAULT_SSH_READY_TIMEOUT
+from .utilities import (
+    createFileRecursively,
+    loadRSAKeysCache,
+    storeRSAKeysCache,
+    Colors,
 )
-from .tools.credentials import SessionCredentialsManager, ContainerCredentialsManager
-from .tools.access_token import AccessTokenManager
-
-from .utilities import createFileRecursively, Colors
-from .config import ConfigurationFileManager
 from .__init__ import __version__
 
 
+# Default parameters
+DEFAULT_BATCH_CONCURRENCY = 8
+DEFAULT_DESTROY_CONCURRENCY = 8
+DEFAULT_MAX_REQUESTS_PER_SERVER = 2
+DEFAULT_STAT_CONCURRENCY = 16
+DEFAULT_STAT_TIMEOUT = 5
+DEFAULT_SSH_CONTROL_PERSIST = 600
+
 # Constants definition
 PUBLIC_PEM_KEY_FILENAME = "public_key.pem"
 PRIVATE_PEM_KEY_FILENAME = "private_key.pem"
+RSA_KEYS_CACHE_FILE_SUFFIX = ".cache"
 CONFIG_FILE_PATH = (
     f"C:\\Users\\{os.getlogin()}\\Anweddol\\config.yaml"
     if os.name == "nt"
     else f"/home/{os.getlogin()}/.anweddol/config.yaml"
 )
+SSH_CONTROL_FOLDER_PATH = os.path.join(os.path.dirname(CONFIG_FILE_PATH), "ssh")
 
 LOG_JSON_STATUS_SUCCESS = "OK"
 LOG_JSON_STATUS_ERROR = "ERROR"
@@ -56,48 +62,68 @@ LOG_JSON_STATUS_ERROR = "ERROR"
 ERROR_INVALID_IP = -1
 ERROR_INVALID_PORT = -2
 
+# Keys of the exported entries, in the managers 'exportEntries' order
+SESSION_CREDENTIALS_EXPORT_KEY_LIST = [
+    "created",
+    "server_ip",
+    "server_port",
+    "container_uuid",
+    "client_token",
+]
+CONTAINER_CREDENTIALS_EXPORT_KEY_LIST = [
+    "created",
+    "server_ip",
+    "server_port",
+    "container_username",
+    "container_password",
+    "container_listen_port",
+    "container_uuid",
+]
+ACCESS_TOKEN_EXPORT_KEY_LIST = [
+    "created",
+    "server_ip",
+    "server_port",
+    "access_token",
+]
+
+# Jobs read from stdin are kept in memory up to this factor of the concurrency
+BATCH_QUEUED_JOBS_FACTOR = 2
+
+STAT_SUMMARY_PERCENTILE_LIST = [50, 90, 99]
+
+# Global options, removed from the arguments before the command is parsed
+PROFILE_OPTION = "--profile"
+PROFILE_DUMP_OPTION = "--profile-dump"
+PROFILE_MEMORY_OPTION = "--profile-memory"
+
+# Client methods wrapped in profiling mode, with their stage name
+PROFILED_CLIENT_METHOD_DICT = {
+    "connectServer": "connect",
+    "sendPublicRSAKey": "send public RSA key",
+    "recvPublicRSAKey": "receive public RSA key",
+    "sendAESKey": "send AES key",
+    "recvAESKey": "receive AES key",
+    "sendRequest": "request",
+    "recvResponse": "response wait",
+}
+PROFILED_WEB_CLIENT_METHOD_DICT = {
+    "sendRequest": "request",
+}
+
 
 class MainAnweddolClientCLI:
     def __init__(self):
         self.json = False
+        self.runtime_rsa_wrapper = None
+        self.are_rsa_keys_loaded = False
+        self.rsa_keys_lock = nullcontext()
+        self.credentials_store = None
+        self.crypto_executor = None
+        self.held_json_content = None
+        self.profiler = self._get_profiler()
 
-        try:
-            if not os.path.exists(CONFIG_FILE_PATH):
-                self._log_stdout(
-                    f"The configuration file {CONFIG_FILE_PATH} was not found on system",
-                    error=True,
-                    color=Colors.RED,
-                )
-
-                exit(-1)
-
-            self.config_manager = ConfigurationFileManager(CONFIG_FILE_PATH)
-            (
-                is_config_content_valid,
-                config_validation_content,
-            ) = self.config_manager.loadContent()
-
-            if not is_config_content_valid:
-                self._log_stdout(
-                    "Error in configuration file :", error=True, color=Colors.RED
-                )
-                self._log_stdout(
-                    json.dumps(config_validation_content, indent=4), error=True
-                )
-
-                exit(-1)
-
-            self.config_content = config_validation_content
-
-        except Exception as E:
-            self._log_stdout(
-                "An error occured during configuration file processing :",
-                error=True,
-                color=Colors.RED,
-            )
-            self._log_stdout(str(E), error=True)
-
-            exit(-1)
+        if self.profiler:
+            self._start_profiler()
 
         parser = argparse.ArgumentParser(
             formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -113,12 +139,21 @@ server interaction commands:
   stat        get runtime statistics of a remote server
   ssh-connect 
               establish an SSH tunnel on a created container (not available on Windows)
+  batch       run newline-delimited JSON jobs read from stdin
 
 credentials and authentication management commands:
   session     manage stored session credentials
   container   manage stored container credentials
   access-tk   manage access tokens
-  regen-rsa   regenerate RSA keys""",
+  regen-rsa   regenerate RSA keys
+  purge       purge expired credentials and compact the databases
+
+global options:
+  --profile   print the wall-clock time spent in each stage of the command
+  --profile-dump <path>
+              also dump the cProfile statistics in a file (implies --profile)
+  --profile-memory
+              also report the memory allocations peak (implies --profile)""",
             epilog="""---
 If you encounter any problems while using this tool,
 please report it by opening an issue on the repository : 
@@ -133,7 +168,19 @@ please report it by opening an issue on the repository :
             exit(-1)
 
         try:
-            exit(getattr(self, args.command.replace("-", "_"))())
+            self._run_command(args.command)
+
+        finally:
+            if self.profiler:
+                self._log_profile()
+
+    def _run_command(self, command):
+        with self._profile_stage("config load"):
+            self._load_configuration()
+
+        try:
+            with self._profile_stage(command):
+                exit(getattr(self, command.replace("-", "_"))())
 
         except Exception as E:
             if type(E) is KeyboardInterrupt:
@@ -150,19 +197,177 @@ please report it by opening an issue on the repository :
 
             exit(-1)
 
+    # Removes the profiling options from the arguments, returns None if not set
+    def _get_profiler(self):
+        is_profiling_enabled = False
+        cprofile_dump_path = None
+        trace_memory = False
+        argument_index = 1
+
+        # Global options are only read before the command name, so that
+        # the command arguments are never rewritten
+        while argument_index < len(sys.argv):
+            argument = sys.argv[argument_index]
+
+            if argument == PROFILE_OPTION:
+                is_profiling_enabled = True
+
+            elif argument == PROFILE_MEMORY_OPTION:
+                is_profiling_enabled = True
+                trace_memory = True
+
+            elif argument.split("=")[0] == PROFILE_DUMP_OPTION:
+                if "=" in argument:
+                    cprofile_dump_path = argument.partition("=")[2]
+
+                else:
+                    argument_index += 1
+                    cprofile_dump_path = (
+                        sys.argv[argument_index]
+                        if argument_index < len(sys.argv)
+                        else None
+                    )
+
+                if not cprofile_dump_path:
+                    self._log_stdout(
+                        f"{PROFILE_DUMP_OPTION} expects a file path",
+                        color=Colors.RED,
+                        error=True,
+                    )
+
+                    exit(-1)
+
+                is_profiling_enabled = True
+
+            else:
+                break
+
+            argument_index += 1
+
+        if not is_profiling_enabled:
+            return None
+
+        del sys.argv[1:argument_index]
+
+        from .profiling import StageProfiler
+
+        return StageProfiler(
+            start_time=CLI_IMPORT_START_TIME,
+            cprofile_dump_path=cprofile_dump_path,
+            trace_memory=trace_memory,
+        )
+
+    # The managers are imported before the command in profiling mode,
+    # so that their opening can be measured
+    def _start_profiler(self):
+        from .tools.credentials import (
+            SessionCredentialsManager,
+            ContainerCredentialsManager,
+        )
+        from .tools.access_token import AccessTokenManager
+
+        for manager_class in [
+            SessionCredentialsManager,
+            ContainerCredentialsManager,
+            AccessTokenManager,
+        ]:
+            self.profiler.patchAttribute(manager_class, "__init__", "db open")
+
+        self.profiler.addStage("imports", time.perf_counter() - CLI_IMPORT_START_TIME)
+        self.profiler.start()
+
+    def _profile_stage(self, name):
+        return self.profiler.stage(name) if self.profiler else nullcontext()
+
+    # Client methods are wrapped on the instance, and the response validation
+    # function on the client module
+    def _profile_client(self, client, method_stage_dict):
+        for method_name, stage_name in method_stage_dict.items():
+            setattr(
+                client,
+                method_name,
+                self.profiler.wrapFunction(getattr(client, method_name), stage_name),
+            )
+
+        self.profiler.patchAttribute(
+            sys.modules[type(client).__module__], "verifyResponseContent", "validation"
+        )
+
+    # The report is added to the last JSON document printed by the command,
+    # or printed on stderr
+    def _log_profile(self):
+        self.profiler.stop()
+
+        if self.held_json_content is not None:
+            print(
+                json.dumps(
+                    {**self.held_json_content, "profile": self.profiler.getReport()}
+                )
+            )
+            self.held_json_content = None
+
+            return
+
+        self._log_stdout(self.profiler.formatReport(), error=True)
+
+    def _load_configuration(self):
+        from .config import ConfigurationFileManager
+
+        try:
+            if not os.path.exists(CONFIG_FILE_PATH):
+                self._log_stdout(
+                    f"The configuration file {CONFIG_FILE_PATH} was not found on system",
+                    error=True,
+                    color=Colors.RED,
+                )
+
+                exit(-1)
+
+            self.config_manager = ConfigurationFileManager(CONFIG_FILE_PATH)
+            (
+                is_config_content_valid,
+                config_validation_content,
+            ) = self.config_manager.loadContent()
+
+            if not is_config_content_valid:
+                self._log_stdout(
+                    "Error in configuration file :", error=True, color=Colors.RED
+                )
+                self._log_stdout(
+                    json.dumps(config_validation_content, indent=4), error=True
+                )
+
+                exit(-1)
+
+            self.config_content = config_validation_content
+
+        except Exception as E:
+            self._log_stdout(
+                "An error occured during configuration file processing :",
+                error=True,
+                color=Colors.RED,
+            )
+            self._log_stdout(str(E), error=True)
+
+            exit(-1)
+
     def _format_rsa_fingerprint(self, rsa_fingerprint):
         return " ".join(
             [rsa_fingerprint[i : i + 4] for i in range(0, len(rsa_fingerprint), 4)]
         ).upper()
 
     def _load_rsa_keys(self):
+        from .core.crypto import RSAWrapper
+
         self.runtime_rsa_wrapper = None
+        self.are_rsa_keys_loaded = True
 
         if self.config_content.get("enable_onetime_rsa_keys"):
             return
 
         public_rsa_key_file_path = self.config_content.get("public_rsa_key_file_path")
         private_rsa_key_file_path = self.config_content.get("private_rsa_key_file_path")
+        rsa_keys_cache_file_path = private_rsa_key_file_path + RSA_KEYS_CACHE_FILE_SUFFIX
 
         if not os.path.exists(private_rsa_key_file_path):
             createFileRecursively(private_rsa_key_file_path)
@@ -178,6 +383,23 @@ please report it by opening an issue on the repository :
         else:
             self.runtime_rsa_wrapper = RSAWrapper(generate_key_pair=False)
 
+            if os.path.exists(public_rsa_key_file_path):
+                cached_rsa_keys = loadRSAKeysCache(
+                    rsa_keys_cache_file_path,
+                    private_rsa_key_file_path,
+                    public_rsa_key_file_path,
+                )
+
+                if cached_rsa_keys:
+                    self.runtime_rsa_wrapper.setPrivateKey(
+                        cached_rsa_keys[0], pem_format=False
+                    )
+                    self.runtime_rsa_wrapper.setPublicKey(
+                        cached_rsa_keys[1], pem_format=False
+                    )
+
+                    return
+
             with open(private_rsa_key_file_path, "r") as fd:
                 self.runtime_rsa_wrapper.setPrivateKey(
                     fd.read().encode(),
@@ -192,6 +414,97 @@ please report it by opening an issue on the repository :
                 with open(public_rsa_key_file_path, "r") as fd:
                     self.runtime_rsa_wrapper.setPublicKey(fd.read().encode())
 
+        # A failure to write the cache must not prevent the keys usage
+        try:
+            storeRSAKeysCache(
+                rsa_keys_cache_file_path,
+                private_rsa_key_file_path,
+                public_rsa_key_file_path,
+                self.runtime_rsa_wrapper,
+            )
+
+        except OSError:
+            pass
+
+    # RSA keys are only needed by the native protocol, they are loaded on first use
+    def _get_runtime_rsa_wrapper(self):
+        with self.rsa_keys_lock:
+            if not self.are_rsa_keys_loaded:
+                with self._profile_stage("key load"):
+                    self._load_rsa_keys()
+
+        return self.runtime_rsa_wrapper
+
+    # The remote public key is set on the RSA wrapper during the handshake :
+    # Each connection gets its own wrapper, sharing the loaded keys
+    def _get_client_rsa_wrapper(self):
+        runtime_rsa_wrapper = self._get_runtime_rsa_wrapper()
+
+        if not runtime_rsa_wrapper:
+            return None
+
+        from .core.crypto import RSAWrapper
+
+        rsa_wrapper = RSAWrapper(generate_key_pair=False)
+        rsa_wrapper.setPrivateKey(
+            runtime_rsa_wrapper.getPrivateKey(pem_format=False), pem_format=False
+        )
+        rsa_wrapper.setPublicKey(
+            runtime_rsa_wrapper.getPublicKey(pem_format=False), pem_format=False
+        )
+
+        return rsa_wrapper
+
+    # The RSA operations of concurrent handshakes are run on a single executor
+    # sized to the usable cores, instead of on the threads sending the requests
+    def _start_crypto_executor(self):
+        from .core.crypto import CryptoExecutor
+
+        self.crypto_executor = CryptoExecutor()
+
+    def _stop_crypto_executor(self):
+        if self.crypto_executor:
+            self.crypto_executor.shutdown()
+            self.crypto_executor = None
+
+    # If a store is set in the configuration file, every manager shares it.
+    # Otherwise, each manager uses its own database file
+    def _get_credentials_store(self):
+        credentials_store_db_file_path = self.config_content.get(
+            "credentials_store_db_file_path"
+        )
+
+        if not credentials_store_db_file_path:
+            return None
+
+        if not self.credentials_store:
+            from .tools.store import CredentialsStore
+
+            if not os.path.exists(credentials_store_db_file_path):
+                createFileRecursively(credentials_store_db_file_path)
+
+            with self._profile_stage("db open"):
+                self.credentials_store = CredentialsStore(
+                    credentials_store_db_file_path
+                )
+
+        return self.credentials_store
+
+    # Retention policies are disabled unless set in the configuration file
+    def _get_retention_policy(self):
+        return {
+            "max_age": self.config_content.get("credentials_max_age"),
+            "max_rows_per_server": self.config_content.get(
+                "credentials_max_rows_per_server"
+            ),
+        }
+
+    # Groups the writes of a command into a single transaction, if possible
+    def _credentials_transaction(self):
+        credentials_store = self._get_credentials_store()
+
+        return credentials_store.transaction() if credentials_store else nullcontext()
+
     def _log_stdout(self, message, bypass=False, color=None, end="\n", error=False):
         if bypass:
             return
@@ -203,186 +516,547 @@ please report it by opening an issue on the repository :
         )
 
     def _log_json(self, status, message, result={}):
-        print(json.dumps({"status": status, "message": message, "result": result}))
+        json_content = {"status": status, "message": message, "result": result}
 
-    def _check_parameters_validity(self, ip=None, port=None):
-        if ip and not isValidIP(ip):
-            return ERROR_INVALID_IP
+        # In profiling mode, the last document is held back to receive the report
+        if self.profiler:
+            if self.held_json_content is not None:
+                print(json.dumps(self.held_json_content))
 
-        if port and (port >= 65535 or port <= 0):
-            return ERROR_INVALID_PORT
+            self.held_json_content = json_content
 
-    def create(self):
-        parser = argparse.ArgumentParser(
-            description="| Create a container on a remote server",
-            usage=f"""{sys.argv[0]} create <IP> [OPT]""",
-        )
-        parser.add_argument("ip", help="specify the server IP", type=str)
+            return
+
+        print(json.dumps(json_content))
+
+    def _add_listing_arguments(self, parser, add_port_argument=True):
         parser.add_argument(
-            "-p", "--port", help="specify the server listen port", type=int
+            "--server",
+            help="only list the entries of a server (with -l)",
+            dest="list_server_ip",
+            metavar="SERVER_IP",
+            type=str,
         )
+
+        if add_port_argument:
+            parser.add_argument(
+                "--port",
+                help="only list the entries of a server port (with -l)",
+                dest="server_port",
+                type=int,
+            )
+
         parser.add_argument(
-            "-w", "--web", help="use the web version of the client", action="store_true"
+            "--since",
+            help="only list the entries created at or after a timestamp (with -l)",
+            metavar="TIMESTAMP",
+            type=int,
         )
         parser.add_argument(
-            "-s",
-            "--ssl",
-            help="enable SSL for HTTP communications",
-            action="store_true",
+            "--until",
+            help="only list the entries created before a timestamp (with -l)",
+            metavar="TIMESTAMP",
+            type=int,
         )
         parser.add_argument(
-            "--no-ssl-verification",
-            help="do not verify the server SSL certificate (for self-signed ones)",
+            "--desc",
+            help="list the most recent entries first (with -l)",
             action="store_true",
         )
         parser.add_argument(
-            "--show-credentials",
-            help="display the received credentials in the terminal",
-            action="store_true",
+            "--limit",
+            help="specify the maximum amount of listed entries (with -l)",
+            type=int,
+        )
+
+    # Entries are printed as they are read, the JSON output included
+    def _log_entries(self, manager, args):
+        entry_iterator = manager.iterEntries(
+            server_ip=args.list_server_ip,
+            server_port=args.server_port,
+            created_after=args.since,
+            created_before=args.until,
+            descending_order=args.desc,
         )
+
+        if args.limit is not None:
+            entry_iterator = islice(entry_iterator, max(args.limit, 0))
+
+        if args.json:
+            json_header, json_footer = json.dumps(
+                {
+                    "status": LOG_JSON_STATUS_SUCCESS,
+                    "message": "Recorded entries ID",
+                    "result": {"entry_list": []},
+                }
+            ).rsplit("[]", 1)
+
+            sys.stdout.write(json_header + "[")
+
+            for index, entry in enumerate(entry_iterator):
+                sys.stdout.write((", " if index else "") + json.dumps(entry))
+
+            sys.stdout.write("]" + json_footer + "\n")
+
+            return
+
+        for entry_id, creation_timestamp, server_ip in entry_iterator:
+            self._log_stdout(f"- Entry ID {entry_id}")
+            self._log_stdout(f"  Created : {datetime.fromtimestamp(creation_timestamp)}")
+            self._log_stdout(f"  Server IP : {server_ip}\n")
+
+    def _add_transfer_arguments(self, parser):
         parser.add_argument(
-            "--do-not-store",
-            help="do not store received credentials",
+            "--export",
+            help="export every entry as newline-delimited JSON on stdout",
+            dest="export_entries",
             action="store_true",
         )
         parser.add_argument(
-            "--check-server-rsa-fingerprint",
-            help="check the remote server RSA fingerprint",
+            "--import",
+            help="import newline-delimited JSON entries from stdin",
+            dest="import_entries",
             action="store_true",
         )
         parser.add_argument(
-            "--json", help="print output in JSON format", action="store_true"
+            "--chunk-size",
+            help="specify the amount of entries imported per transaction (with --import)",
+            type=int,
         )
-        args = parser.parse_args(sys.argv[2:])
 
-        self.json = args.json
-        self._load_rsa_keys()
-
-        check_result = self._check_parameters_validity(args.ip, args.port)
-        if check_result == ERROR_INVALID_IP:
-            if args.json:
-                self._log_json(
-                    LOG_JSON_STATUS_ERROR,
-                    f"'{args.ip}' is not a valid IPv4 IP format",
-                )
+    # One JSON object per line, the entries are written as they are read
+    def _export_entries(self, manager, key_list):
+        try:
+            for entry in manager.exportEntries():
+                sys.stdout.write(json.dumps(dict(zip(key_list, entry))) + "\n")
 
-            else:
-                self._log_stdout(
-                    f"'{args.ip}' is not a valid IPv4 IP format",
-                    color=Colors.RED,
-                    error=True,
-                )
+            sys.stdout.flush()
 
-            return -1
+        # The output was closed by the reading process (head, ...)
+        except BrokenPipeError:
+            sys.stdout = open(os.devnull, "w")
 
-        if check_result == ERROR_INVALID_PORT:
-            if args.json:
-                self._log_json(
-                    LOG_JSON_STATUS_ERROR,
-                    f"'{args.port}' is not a non-zero integer less than 65535",
-                )
+    # The creation timestamp is optional, like the keys of 'default_values'
+    def _read_import_entries(self, key_list, default_values):
+        for line_number, line in enumerate(sys.stdin, start=1):
+            if not line.strip():
+                continue
 
-            else:
-                self._log_stdout(
-                    f"'{args.port}' is not a non-zero integer less than 65535",
-                    color=Colors.RED,
-                    error=True,
+            try:
+                entry_content = {
+                    "created": int(time.time()),
+                    **default_values,
+                    **json.loads(line),
+                }
+                entry = tuple(entry_content[key] for key in key_list)
+
+            except KeyError as E:
+                raise ValueError(f"Invalid entry on line {line_number} : Missing {E} key")
+
+            except (ValueError, TypeError) as E:
+                raise ValueError(f"Invalid entry on line {line_number} : {E}")
+
+            if not isValidIP(entry_content["server_ip"]):
+                raise ValueError(
+                    f"Invalid entry on line {line_number} : '{entry_content['server_ip']}' is not a valid IPv4 IP format"
                 )
 
-            return -1
+            yield entry
 
-        access_token_db_file_path = self.config_content.get("access_token_db_file_path")
-        session_credentials_db_file_path = self.config_content.get(
-            "session_credentials_db_file_path"
+    def _import_entries(self, manager, key_list, args, default_values={}):
+        import_parameters = (
+            {"chunk_size": args.chunk_size} if args.chunk_size is not None else {}
         )
-        container_credentials_db_file_path = self.config_content.get(
-            "container_credentials_db_file_path"
+        imported_entries_amount, duplicate_entries_amount = manager.importEntries(
+            self._read_import_entries(key_list, default_values), **import_parameters
         )
 
-        if not os.path.exists(access_token_db_file_path):
-            createFileRecursively(access_token_db_file_path)
+        if args.json:
+            self._log_json(
+                LOG_JSON_STATUS_SUCCESS,
+                "Entries imported",
+                result={
+                    "imported_entries": imported_entries_amount,
+                    "duplicate_entries": duplicate_entries_amount,
+                },
+            )
 
-        if not os.path.exists(session_credentials_db_file_path):
-            createFileRecursively(session_credentials_db_file_path)
+        else:
+            self._log_stdout("Entries imported", color=Colors.GREEN)
+            self._log_stdout(f"  Imported entries : {imported_entries_amount}")
+            self._log_stdout(f"  Duplicate entries : {duplicate_entries_amount}")
 
-        if not os.path.exists(container_credentials_db_file_path):
-            createFileRecursively(container_credentials_db_file_path)
+    def _check_parameters_validity(self, ip=None, port=None):
+        if ip and not isValidIP(ip):
+            return ERROR_INVALID_IP
+
+        if port and (port >= 65535 or port <= 0):
+            return ERROR_INVALID_PORT
 
-        request_parameters = {}
+    def _get_server_port(self, port, web):
+        if port:
+            return port
 
-        with AccessTokenManager(access_token_db_file_path) as access_token_manager:
-            entry_id = access_token_manager.getEntryID(args.ip)
+        if web:
+            from .web.client import DEFAULT_HTTP_SERVER_LISTEN_PORT
 
-            if entry_id:
-                request_parameters.update(
-                    {"access_token": access_token_manager.getEntry(entry_id)[4]}
-                )
+            return DEFAULT_HTTP_SERVER_LISTEN_PORT
+
+        from .core.client import DEFAULT_SERVER_LISTEN_PORT
+
+        return DEFAULT_SERVER_LISTEN_PORT
+
+    # The stored access token of the server is sent with the request, if any
+    def _make_request_parameters(self, access_token_manager, server_ip, parameters={}):
+        access_token = access_token_manager.getAccessToken(server_ip)
+
+        return (
+            {**parameters, "access_token": access_token}
+            if access_token
+            else dict(parameters)
+        )
+
+    # Returns the response tuple, or None if the server RSA fingerprint was refused
+    def _send_request(
+        self,
+        verb,
+        server_ip,
+        server_port,
+        request_parameters,
+        web=False,
+        enable_ssl=False,
+        verify_ssl_certificate=True,
+        check_server_rsa_fingerprint=False,
+        waiting_message=None,
+        timeout=None,
+        crypto_executor=None,
+    ):
+        if web:
+            with self._profile_stage("client import"):
+                from .web.client import WebClientInterface
 
-        if args.web:
             web_client = WebClientInterface(
-                args.ip,
-                server_listen_port=args.port
-                if args.port
-                else DEFAULT_HTTP_SERVER_LISTEN_PORT,
-                enable_ssl=args.ssl if args.ssl else DEFAULT_ENABLE_SSL,
+                server_ip,
+                server_listen_port=server_port,
+                enable_ssl=enable_ssl,
+                timeout=timeout,
             )
 
-            self._log_stdout(
-                "Sending request, waiting for response. This can take some time ... ",
-                bypass=args.json,
-            )
+            if self.profiler:
+                self._profile_client(web_client, PROFILED_WEB_CLIENT_METHOD_DICT)
 
-            (
-                is_response_valid,
-                response_content,
-                response_error_dict,
-            ) = web_client.sendRequest(
-                REQUEST_VERB_CREATE,
+                # The connection and the request are sent along the response wait
+                self.profiler.patchAttribute(
+                    web_client.getSession(), "post", "response wait"
+                )
+
+            if waiting_message:
+                self._log_stdout(waiting_message)
+
+            return web_client.sendRequest(
+                verb,
                 parameters=request_parameters,
-                verify_ssl_certificate=not args.no_ssl_verification,
+                verify_ssl_certificate=verify_ssl_certificate,
+            )
+
+        with self._profile_stage("client import"):
+            from .core.client import ClientInterface
+
+        rsa_wrapper = self._get_client_rsa_wrapper()
+
+        # One-time RSA keys are generated by the client, along the AES key
+        with self._profile_stage("key generation"):
+            client = ClientInterface(
+                server_ip,
+                server_listen_port=server_port,
+                timeout=timeout,
+                rsa_wrapper=rsa_wrapper,
+                crypto_executor=crypto_executor,
             )
 
+        if self.profiler:
+            self._profile_client(client, PROFILED_CLIENT_METHOD_DICT)
+
+        with client:
+            client.connectServer()
+
+            if check_server_rsa_fingerprint:
+                server_rsa_fingerprint = hashlib.sha256(
+                    client.getRSAWrapper().getRemotePublicKey()
+                ).hexdigest()
+
+                self._log_stdout(
+                    f"Server RSA fingerprint : {self._format_rsa_fingerprint(server_rsa_fingerprint)}"
+                )
+
+                if input("Continue ? (y/n) : ") != "y":
+                    self._log_stdout("Aborting ...")
+
+                    client.closeConnection()
+
+                    return None
+
+            client.sendRequest(verb, parameters=request_parameters)
+
+            if waiting_message:
+                self._log_stdout(waiting_message)
+
+            return client.recvResponse()
+
+    # Calls 'function' on every item from a thread pool, with at most 'max_per_server'
+    # calls at once per server. Results are passed to 'on_result' from this thread
+    def _run_per_server(
+        self,
+        item_list,
+        server_key_function,
+        function,
+        on_result,
+        concurrency,
+        max_per_server,
+    ):
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+        from collections import deque
+
+        pending_item_dict = {}
+
+        for item in item_list:
+            pending_item_dict.setdefault(server_key_function(item), deque()).append(item)
+
+        running_item_dict = {}
+        running_amount_dict = dict.fromkeys(pending_item_dict, 0)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while pending_item_dict or running_item_dict:
+                for server_key in list(pending_item_dict):
+                    pending_item_queue = pending_item_dict[server_key]
+
+                    while (
+                        pending_item_queue
+                        and running_amount_dict[server_key] < max_per_server
+                        and len(running_item_dict) < concurrency
+                    ):
+                        item = pending_item_queue.popleft()
+                        running_item_dict[executor.submit(function, item)] = (
+                            server_key,
+                            item,
+                        )
+                        running_amount_dict[server_key] += 1
+
+                    if not pending_item_queue:
+                        del pending_item_dict[server_key]
+
+                done_future_set, _ = wait(
+                    running_item_dict, return_when=FIRST_COMPLETED
+                )
+
+                for future in done_future_set:
+                    server_key, item = running_item_dict.pop(future)
+                    running_amount_dict[server_key] -= 1
+
+                    on_result(item, future.result())
+
+    def _log_error(self, message, result={}):
+        if self.json:
+            self._log_json(LOG_JSON_STATUS_ERROR, message, result=result)
+
         else:
-            with ClientInterface(
-                args.ip,
-                server_listen_port=args.port
-                if args.port
-                else DEFAULT_SERVER_LISTEN_PORT,
-                rsa_wrapper=self.runtime_rsa_wrapper,
-            ) as client:
-                client.connectServer()
-
-                if args.check_server_rsa_fingerprint:
-                    server_rsa_fingerprint = hashlib.sha256(
-                        client.getRSAWrapper().getRemotePublicKey()
-                    ).hexdigest()
+            self._log_stdout(message, color=Colors.RED, error=True)
+
+    # Both entries are committed at once with a shared store
+    def _store_created_credentials(
+        self,
+        session_credentials_manager,
+        container_credentials_manager,
+        server_ip,
+        server_port,
+        response_data,
+    ):
+        with self._profile_stage("db commit"), self._credentials_transaction():
+            new_session_credentials_entry_id, _ = session_credentials_manager.addEntry(
+                server_ip,
+                server_port,
+                response_data.get("container_uuid"),
+                response_data.get("client_token"),
+            )
+            (
+                new_container_credentials_entry_id,
+                _,
+            ) = container_credentials_manager.addEntry(
+                server_ip,
+                server_port,
+                response_data.get("container_username"),
+                response_data.get("container_password"),
+                response_data.get("container_listen_port"),
+                container_uuid=response_data.get("container_uuid"),
+            )
 
-                    self._log_stdout(
-                        f"Server RSA fingerprint : {self._format_rsa_fingerprint(server_rsa_fingerprint)}"
-                    )
+        return (new_session_credentials_entry_id, new_container_credentials_entry_id)
+
+    def _delete_destroyed_credentials(
+        self,
+        session_credentials_manager,
+        container_credentials_manager,
+        session_entry_content,
+    ):
+        (
+            session_entry_id,
+            _,
+            server_ip,
+            server_port,
+            container_uuid,
+            _,
+        ) = session_entry_content
+
+        with self._profile_stage("db commit"), self._credentials_transaction():
+            session_credentials_manager.deleteEntry(session_entry_id)
+            container_credentials_manager.deleteEntriesBySession(
+                [(container_uuid, server_ip, server_port)]
+            )
+
+    def _add_wait_ready_argument(self, parser):
+        parser.add_argument(
+            "--wait-ready",
+            help=f"wait until the container SSH server is ready, up to TIMEOUT seconds (default {DEFAULT_SSH_READY_TIMEOUT})",
+            nargs="?",
+            const=DEFAULT_SSH_READY_TIMEOUT,
+            type=float,
+            metavar="TIMEOUT",
+        )
+
+    def _wait_container_ready(self, server_ip, container_listen_port, timeout):
+        with self._profile_stage("ssh ready wait"):
+            return waitSSHReady(server_ip, container_listen_port, timeout=timeout)
 
-                    if input("Continue ? (y/n) : ") != "y":
-                        self._log_stdout("Aborting ...")
+    def create(self):
+        parser = argparse.ArgumentParser(
+            description="| Create a container on a remote server",
+            usage=f"""{sys.argv[0]} create <IP> [OPT]""",
+        )
+        parser.add_argument("ip", help="specify the server IP", type=str)
+        parser.add_argument(
+            "-p", "--port", help="specify the server listen port", type=int
+        )
+        parser.add_argument(
+            "-w", "--web", help="use the web version of the client", action="store_true"
+        )
+        parser.add_argument(
+            "-s",
+            "--ssl",
+            help="enable SSL for HTTP communications",
+            action="store_true",
+        )
+        parser.add_argument(
+            "--no-ssl-verification",
+            help="do not verify the server SSL certificate (for self-signed ones)",
+            action="store_true",
+        )
+        parser.add_argument(
+            "--show-credentials",
+            help="display the received credentials in the terminal",
+            action="store_true",
+        )
+        parser.add_argument(
+            "--do-not-store",
+            help="do not store received credentials",
+            action="store_true",
+        )
+        self._add_wait_ready_argument(parser)
+        parser.add_argument(
+            "--check-server-rsa-fingerprint",
+            help="check the remote server RSA fingerprint",
+            action="store_true",
+        )
+        parser.add_argument(
+            "--json", help="print output in JSON format", action="store_true"
+        )
+        args = parser.parse_args(sys.argv[2:])
 
-                        client.closeConnection()
+        from .core.client import REQUEST_VERB_CREATE
+        from .tools.credentials import (
+            SessionCredentialsManager,
+            ContainerCredentialsManager,
+        )
+        from .tools.access_token import AccessTokenManager
 
-                        return 0
+        self.json = args.json
 
-                client.sendRequest(
-                    REQUEST_VERB_CREATE,
-                    parameters=request_parameters,
+        check_result = self._check_parameters_validity(args.ip, args.port)
+        if check_result == ERROR_INVALID_IP:
+            if args.json:
+                self._log_json(
+                    LOG_JSON_STATUS_ERROR,
+                    f"'{args.ip}' is not a valid IPv4 IP format",
                 )
 
+            else:
                 self._log_stdout(
-                    "Request sent, waiting for response. This can take some time ... ",
-                    bypass=args.json,
+                    f"'{args.ip}' is not a valid IPv4 IP format",
+                    color=Colors.RED,
+                    error=True,
                 )
 
-                (
-                    is_response_valid,
-                    response_content,
-                    response_error_dict,
-                ) = client.recvResponse()
+            return -1
+
+        if check_result == ERROR_INVALID_PORT:
+            if args.json:
+                self._log_json(
+                    LOG_JSON_STATUS_ERROR,
+                    f"'{args.port}' is not a non-zero integer less than 65535",
+                )
+
+            else:
+                self._log_stdout(
+                    f"'{args.port}' is not a non-zero integer less than 65535",
+                    color=Colors.RED,
+                    error=True,
+                )
+
+            return -1
+
+        access_token_db_file_path = self.config_content.get("access_token_db_file_path")
+        session_credentials_db_file_path = self.config_content.get(
+            "session_credentials_db_file_path"
+        )
+        container_credentials_db_file_path = self.config_content.get(
+            "container_credentials_db_file_path"
+        )
+
+        if not os.path.exists(access_token_db_file_path):
+            createFileRecursively(access_token_db_file_path)
+
+        if not os.path.exists(session_credentials_db_file_path):
+            createFileRecursively(session_credentials_db_file_path)
+
+        if not os.path.exists(container_credentials_db_file_path):
+            createFileRecursively(container_credentials_db_file_path)
+
+        server_port = self._get_server_port(args.port, args.web)
+
+        with AccessTokenManager(
+            access_token_db_file_path, store=self._get_credentials_store()
+        ) as access_token_manager:
+            request_parameters = self._make_request_parameters(
+                access_token_manager, args.ip
+            )
+
+        response = self._send_request(
+            REQUEST_VERB_CREATE,
+            args.ip,
+            server_port,
+            request_parameters,
+            web=args.web,
+            enable_ssl=args.ssl,
+            verify_ssl_certificate=not args.no_ssl_verification,
+            check_server_rsa_fingerprint=args.check_server_rsa_fingerprint,
+            waiting_message=None
+            if args.json
+            else "Request sent, waiting for response. This can take some time ... ",
+        )
+
+        if not response:
+            return 0
+
+        is_response_valid, response_content, response_error_dict = response
 
         if not is_response_valid:
             if args.json:
@@ -444,120 +1118,341 @@ please report it by opening an issue on the repository :
             self._log_stdout(f"  Container password : {container_password}")
             self._log_stdout(f"  Container listen port : {container_listen_port}")
 
+        new_session_credentials_entry_id = None
+        new_container_credentials_entry_id = None
+
         if not args.do_not_store:
             with SessionCredentialsManager(
-                session_credentials_db_file_path
-            ) as session_credentials_manager:
+                session_credentials_db_file_path,
+                store=self._get_credentials_store(),
+                **self._get_retention_policy(),
+            ) as session_credentials_manager, ContainerCredentialsManager(
+                container_credentials_db_file_path,
+                store=self._get_credentials_store(),
+                **self._get_retention_policy(),
+            ) as container_credentials_manager:
                 (
                     new_session_credentials_entry_id,
-                    _,
-                ) = session_credentials_manager.addEntry(
+                    new_container_credentials_entry_id,
+                ) = self._store_created_credentials(
+                    session_credentials_manager,
+                    container_credentials_manager,
                     args.ip,
-                    args.port
-                    if args.port
-                    else (
-                        DEFAULT_SERVER_LISTEN_PORT
-                        if not args.web
-                        else DEFAULT_HTTP_SERVER_LISTEN_PORT
-                    ),
-                    container_uuid,
-                    client_token,
+                    server_port,
+                    response_content["data"],
                 )
 
+            self._log_stdout(
+                f"  Session credentials ID : {new_session_credentials_entry_id}",
+                bypass=args.json,
+            )
+            self._log_stdout(
+                f"  Container credentials ID : {new_container_credentials_entry_id}",
+                bypass=args.json,
+            )
+
+        is_ssh_ready = None
+
+        if args.wait_ready is not None:
+            self._log_stdout(
+                "Waiting for the container SSH server ... ", bypass=args.json
+            )
+
+            is_ssh_ready = self._wait_container_ready(
+                args.ip, container_listen_port, args.wait_ready
+            )
+
+            if is_ssh_ready:
                 self._log_stdout(
-                    f"  Session credentials ID : {new_session_credentials_entry_id}",
+                    "Container SSH server is ready",
                     bypass=args.json,
+                    color=Colors.GREEN,
                 )
 
-            with ContainerCredentialsManager(
-                container_credentials_db_file_path
-            ) as container_credentials_manager:
-                (
-                    new_container_credentials_entry_id,
-                    _,
-                ) = container_credentials_manager.addEntry(
-                    args.ip,
-                    args.port
-                    if args.port
-                    else (
-                        DEFAULT_SERVER_LISTEN_PORT
-                        if not args.web
-                        else DEFAULT_HTTP_SERVER_LISTEN_PORT
-                    ),
-                    container_username,
-                    container_password,
-                    container_listen_port,
-                )
-
+            elif not args.json:
                 self._log_stdout(
-                    f"  Container credentials ID : {new_container_credentials_entry_id}",
-                    bypass=args.json,
+                    f"Container SSH server is not ready after {args.wait_ready} seconds",
+                    color=Colors.RED,
+                    error=True,
                 )
 
         if args.json:
             self._log_json(
-                LOG_JSON_STATUS_SUCCESS,
-                "Container successfully created",
+                LOG_JSON_STATUS_ERROR
+                if is_ssh_ready is False
+                else LOG_JSON_STATUS_SUCCESS,
+                "Container SSH server is not ready"
+                if is_ssh_ready is False
+                else "Container successfully created",
                 result={
                     "message": message,
                     "data": response_content.get("data"),
                     "session_entry_id": new_session_credentials_entry_id,
                     "container_entry_id": new_container_credentials_entry_id,
+                    "ssh_ready": is_ssh_ready,
                 },
             )
 
-        return 0
-
-    def destroy(self):
-        parser = argparse.ArgumentParser(
-            description="| Destroy a created container on a remote server",
-            usage=f"{sys.argv[0]} destroy <session_entry_id> [OPT] ",
-        )
-        parser.add_argument(
-            "session_entry_id", help="specify the local session ID", type=int
-        )
-        parser.add_argument(
-            "-w", "--web", help="use the web version of the client", action="store_true"
-        )
-        parser.add_argument(
-            "-s",
-            "--ssl",
-            help="enable SSL for HTTP communications",
-            action="store_true",
-        )
-        parser.add_argument(
-            "--no-ssl-verification",
-            help="do not verify the server SSL certificate (for self-signed ones)",
-            action="store_true",
-        )
-        parser.add_argument(
-            "--check-server-rsa-fingerprint",
-            help="check the remote server RSA fingerprint",
-            action="store_true",
-        )
-        parser.add_argument(
-            "--do-not-delete",
-            help="do not delete credentials on local storage",
-            action="store_true",
-        )
-        parser.add_argument(
-            "--json", help="print output in JSON format", action="store_true"
-        )
-        args = parser.parse_args(sys.argv[2:])
-
-        self.json = args.json
-        self._load_rsa_keys()
+        return -1 if is_ssh_ready is False else 0
 
-        access_token_db_file_path = self.config_content.get("access_token_db_file_path")
-        session_credentials_db_file_path = self.config_content.get(
-            "session_credentials_db_file_path"
-        )
-        container_credentials_db_file_path = self.config_content.get(
-            "container_credentials_db_file_path"
-        )
+    # Entry IDs are specified one by one, or as ranges ('3-8')
+    def _parse_entry_id_ranges(self, value_list):
+        entry_id_range_list = []
 
-        if not os.path.exists(access_token_db_file_path):
-            createFileRecursively(access_token_db_file_path)
+        for value in value_list:
+            start, _, end = value.partition("-")
+
+            try:
+                entry_id_range_list.append((int(start), int(end if end else start)))
+
+            except ValueError:
+                raise ValueError(f"'{value}' is not a valid entry ID or entry ID range")
+
+        return entry_id_range_list
+
+    def _destroy_entries(
+        self,
+        args,
+        entry_id_range_list,
+        session_credentials_manager,
+        container_credentials_manager,
+        access_token_manager,
+    ):
+        selected_entry_id_list = [
+            entry_id
+            for entry_id, _, _ in session_credentials_manager.iterEntries(
+                server_ip=args.server_ip, server_port=args.server_port
+            )
+            if args.destroy_all
+            or not entry_id_range_list
+            or any(start <= entry_id <= end for start, end in entry_id_range_list)
+        ]
+        entry_list = session_credentials_manager.getEntries(selected_entry_id_list)
+
+        entry_result_list = []
+        destroyed_entry_list = []
+
+        # Single entry IDs that were not found are reported, ranges may have gaps
+        if not (args.server_ip or args.destroy_all):
+            for entry_id in sorted(
+                {start for start, end in entry_id_range_list if start == end}
+                - set(selected_entry_id_list)
+            ):
+                entry_result_list.append(
+                    {
+                        "session_entry_id": entry_id,
+                        "status": LOG_JSON_STATUS_ERROR,
+                        "message": f"Session ID '{entry_id}' does not exists",
+                        "result": {},
+                    }
+                )
+                self._log_stdout(
+                    f"Session ID '{entry_id}' does not exists",
+                    bypass=args.json,
+                    color=Colors.RED,
+                    error=True,
+                )
+
+        # Loaded before the requests are sent, instead of by the first one
+        if not args.web:
+            self._get_runtime_rsa_wrapper()
+
+        destroy_job = {
+            "web": args.web,
+            "ssl": args.ssl,
+            "no_ssl_verification": args.no_ssl_verification,
+        }
+        manager_dict = {"access-tk": access_token_manager}
+
+        def _destroy_entry(entry_content):
+            try:
+                return self._destroy_container(destroy_job, entry_content, manager_dict)
+
+            except Exception as E:
+                return (LOG_JSON_STATUS_ERROR, "An error occured", {"error": str(E)})
+
+        def _on_entry_destroyed(entry_content, entry_result):
+            status, message, result = entry_result
+
+            entry_result_list.append(
+                {
+                    "session_entry_id": entry_content[0],
+                    "status": status,
+                    "message": message,
+                    "result": result,
+                }
+            )
+
+            if status == LOG_JSON_STATUS_SUCCESS:
+                destroyed_entry_list.append(entry_content)
+
+                self._log_stdout(
+                    f"Session ID {entry_content[0]} : {message}",
+                    bypass=args.json,
+                    color=Colors.GREEN,
+                )
+                self._log_stdout(
+                    f"  Message : {result.get('message')}", bypass=args.json
+                )
+
+            else:
+                self._log_stdout(
+                    f"Session ID {entry_content[0]} : {message}",
+                    bypass=args.json,
+                    color=Colors.RED,
+                    error=True,
+                )
+                self._log_stdout(
+                    f"  Error : {json.dumps(result)}", bypass=args.json, error=True
+                )
+
+        if not args.web:
+            self._start_crypto_executor()
+
+        # The destroyed containers credentials are deleted at once, even if interrupted
+        try:
+            self._run_per_server(
+                entry_list,
+                lambda entry_content: (entry_content[2], entry_content[3]),
+                _destroy_entry,
+                _on_entry_destroyed,
+                args.concurrency,
+                args.max_per_server,
+            )
+
+        finally:
+            self._stop_crypto_executor()
+
+            if destroyed_entry_list and not args.do_not_delete:
+                with self._profile_stage("db commit"), self._credentials_transaction():
+                    session_credentials_manager.deleteEntries(
+                        [entry_content[0] for entry_content in destroyed_entry_list]
+                    )
+                    container_credentials_manager.deleteEntriesBySession(
+                        [
+                            (entry_content[4], entry_content[2], entry_content[3])
+                            for entry_content in destroyed_entry_list
+                        ]
+                    )
+
+        failed_entries_amount = len(entry_result_list) - len(destroyed_entry_list)
+
+        if args.json:
+            self._log_json(
+                LOG_JSON_STATUS_ERROR
+                if failed_entries_amount
+                else LOG_JSON_STATUS_SUCCESS,
+                "Failed to destroy some containers"
+                if failed_entries_amount
+                else "Containers successfully destroyed",
+                result={
+                    "entry_list": sorted(
+                        entry_result_list,
+                        key=lambda entry_result: entry_result["session_entry_id"],
+                    ),
+                    "destroyed_entries": len(destroyed_entry_list),
+                    "failed_entries": failed_entries_amount,
+                },
+            )
+
+        else:
+            self._log_stdout(
+                f"Destroyed containers : {len(destroyed_entry_list)}, failed : {failed_entries_amount}"
+            )
+
+        return -1 if failed_entries_amount else 0
+
+    def destroy(self):
+        parser = argparse.ArgumentParser(
+            description="| Destroy a created container on a remote server",
+            usage=f"{sys.argv[0]} destroy [session_entry_id ...] [OPT] ",
+        )
+        parser.add_argument(
+            "session_entry_id",
+            help="specify the local session IDs, or ID ranges (e.g. 3-8)",
+            nargs="*",
+            type=str,
+        )
+        parser.add_argument(
+            "--server",
+            help="destroy the containers of a server",
+            dest="server_ip",
+            metavar="SERVER_IP",
+            type=str,
+        )
+        parser.add_argument(
+            "--port",
+            help="only destroy the containers of a server port (with --server)",
+            dest="server_port",
+            type=int,
+        )
+        parser.add_argument(
+            "--all",
+            help="destroy every stored container",
+            dest="destroy_all",
+            action="store_true",
+        )
+        parser.add_argument(
+            "-c",
+            "--concurrency",
+            help=f"specify the maximum amount of requests sent at the same time (default is {DEFAULT_DESTROY_CONCURRENCY})",
+            type=int,
+            default=DEFAULT_DESTROY_CONCURRENCY,
+        )
+        parser.add_argument(
+            "--max-per-server",
+            help=f"specify the maximum amount of requests sent at the same time to a server (default is {DEFAULT_MAX_REQUESTS_PER_SERVER})",
+            type=int,
+            default=DEFAULT_MAX_REQUESTS_PER_SERVER,
+        )
+        parser.add_argument(
+            "-w", "--web", help="use the web version of the client", action="store_true"
+        )
+        parser.add_argument(
+            "-s",
+            "--ssl",
+            help="enable SSL for HTTP communications",
+            action="store_true",
+        )
+        parser.add_argument(
+            "--no-ssl-verification",
+            help="do not verify the server SSL certificate (for self-signed ones)",
+            action="store_true",
+        )
+        parser.add_argument(
+            "--check-server-rsa-fingerprint",
+            help="check the remote server RSA fingerprint",
+            action="store_true",
+        )
+        parser.add_argument(
+            "--do-not-delete",
+            help="do not delete credentials on local storage",
+            action="store_true",
+        )
+        parser.add_argument(
+            "--json", help="print output in JSON format", action="store_true"
+        )
+        args = parser.parse_args(sys.argv[2:])
+
+        from .core.client import REQUEST_VERB_DESTROY
+        from .tools.credentials import (
+            SessionCredentialsManager,
+            ContainerCredentialsManager,
+        )
+        from .tools.access_token import AccessTokenManager
+
+        self.json = args.json
+
+        access_token_db_file_path = self.config_content.get("access_token_db_file_path")
+        session_credentials_db_file_path = self.config_content.get(
+            "session_credentials_db_file_path"
+        )
+        container_credentials_db_file_path = self.config_content.get(
+            "container_credentials_db_file_path"
+        )
+
+        if not os.path.exists(access_token_db_file_path):
+            createFileRecursively(access_token_db_file_path)
 
         if not os.path.exists(session_credentials_db_file_path):
             createFileRecursively(session_credentials_db_file_path)
@@ -565,8 +1460,63 @@ please report it by opening an issue on the repository :
         if not os.path.exists(container_credentials_db_file_path):
             createFileRecursively(container_credentials_db_file_path)
 
+        try:
+            entry_id_range_list = self._parse_entry_id_ranges(args.session_entry_id)
+
+        except ValueError as E:
+            self._log_error(str(E))
+
+            return -1
+
+        if not (entry_id_range_list or args.server_ip or args.destroy_all):
+            self._log_error("Specify session entry IDs, a server or --all")
+
+            return -1
+
+        # Several containers are destroyed concurrently, see '_destroy_entries'
+        if (
+            args.server_ip
+            or args.destroy_all
+            or len(entry_id_range_list) > 1
+            or entry_id_range_list[0][0] != entry_id_range_list[0][1]
+        ):
+            if args.check_server_rsa_fingerprint:
+                self._log_error(
+                    "The server RSA fingerprint can only be checked with a single container"
+                )
+
+                return -1
+
+            if args.concurrency <= 0 or args.max_per_server <= 0:
+                self._log_error("The concurrency must be a non-zero positive integer")
+
+                return -1
+
+            with SessionCredentialsManager(
+                session_credentials_db_file_path,
+                store=self._get_credentials_store(),
+                **self._get_retention_policy(),
+            ) as session_credentials_manager, ContainerCredentialsManager(
+                container_credentials_db_file_path,
+                store=self._get_credentials_store(),
+                **self._get_retention_policy(),
+            ) as container_credentials_manager, AccessTokenManager(
+                access_token_db_file_path, store=self._get_credentials_store()
+            ) as access_token_manager:
+                return self._destroy_entries(
+                    args,
+                    entry_id_range_list,
+                    session_credentials_manager,
+                    container_credentials_manager,
+                    access_token_manager,
+                )
+
+        args.session_entry_id = entry_id_range_list[0][0]
+
         session_credentials_manager = SessionCredentialsManager(
-            session_credentials_db_file_path
+            session_credentials_db_file_path,
+            store=self._get_credentials_store(),
+            **self._get_retention_policy(),
         )
         entry_content = session_credentials_manager.getEntry(args.session_entry_id)
 
@@ -595,71 +1545,33 @@ please report it by opening an issue on the repository :
             client_token,
         ) = entry_content
 
-        request_parameters = {
-            "container_uuid": container_uuid,
-            "client_token": client_token,
-        }
-
-        with AccessTokenManager(access_token_db_file_path) as access_token_manager:
-            entry_id = access_token_manager.getEntryID(server_ip)
-
-            if entry_id:
-                request_parameters.update(
-                    {"access_token": access_token_manager.getEntry(entry_id)[4]}
-                )
+        with AccessTokenManager(
+            access_token_db_file_path, store=self._get_credentials_store()
+        ) as access_token_manager:
+            request_parameters = self._make_request_parameters(
+                access_token_manager,
+                server_ip,
+                {"container_uuid": container_uuid, "client_token": client_token},
+            )
 
         try:
-            if args.web:
-                client = WebClientInterface(
-                    server_ip,
-                    server_listen_port=server_port,
-                    enable_ssl=args.ssl if args.ssl else DEFAULT_ENABLE_SSL,
-                )
-
-                (
-                    is_response_valid,
-                    response_content,
-                    response_error_dict,
-                ) = client.sendRequest(
-                    REQUEST_VERB_DESTROY,
-                    parameters=request_parameters,
-                    verify_ssl_certificate=not args.no_ssl_verification,
-                )
-
-            else:
-                with ClientInterface(
-                    server_ip,
-                    server_listen_port=server_port,
-                    rsa_wrapper=self.runtime_rsa_wrapper,
-                ) as client:
-                    client.connectServer()
-
-                    if args.check_server_rsa_fingerprint:
-                        server_rsa_fingerprint = hashlib.sha256(
-                            client.getRSAWrapper().getRemotePublicKey()
-                        ).hexdigest()
-
-                        self._log_stdout(
-                            f"Server RSA fingerprint : {self._format_rsa_fingerprint(server_rsa_fingerprint)}"
-                        )
-
-                        if input("Continue ? (y/n) : ") != "y":
-                            self._log_stdout("Aborting ...")
-
-                            client.closeConnection()
+            response = self._send_request(
+                REQUEST_VERB_DESTROY,
+                server_ip,
+                server_port,
+                request_parameters,
+                web=args.web,
+                enable_ssl=args.ssl,
+                verify_ssl_certificate=not args.no_ssl_verification,
+                check_server_rsa_fingerprint=args.check_server_rsa_fingerprint,
+            )
 
-                            return 0
+            if not response:
+                session_credentials_manager.closeDatabase()
 
-                    client.sendRequest(
-                        REQUEST_VERB_DESTROY,
-                        parameters=request_parameters,
-                    )
+                return 0
 
-                    (
-                        is_response_valid,
-                        response_content,
-                        response_error_dict,
-                    ) = client.recvResponse()
+            is_response_valid, response_content, response_error_dict = response
 
             if not is_response_valid:
                 if args.json:
@@ -703,18 +1615,17 @@ please report it by opening an issue on the repository :
                 return -1
 
             if not args.do_not_delete:
-                session_credentials_manager.deleteEntry(args.session_entry_id)
-
                 with ContainerCredentialsManager(
-                    container_credentials_db_file_path
+                    container_credentials_db_file_path,
+                    store=self._get_credentials_store(),
+                    **self._get_retention_policy(),
                 ) as container_credentials_manager:
-                    container_entry_id = container_credentials_manager.getEntryID(
-                        server_ip
+                    self._delete_destroyed_credentials(
+                        session_credentials_manager,
+                        container_credentials_manager,
+                        entry_content,
                     )
 
-                    if container_entry_id:
-                        container_credentials_manager.deleteEntry(container_entry_id)
-
             if args.json:
                 self._log_json(
                     LOG_JSON_STATUS_SUCCESS,
@@ -734,20 +1645,255 @@ please report it by opening an issue on the repository :
             session_credentials_manager.closeDatabase()
             raise E
 
+    # Servers are specified as 'IP' or 'IP:PORT'
+    def _parse_server_list(self, value_list, default_port):
+        server_list = []
+
+        for value in value_list:
+            server_ip, _, server_port = value.partition(":")
+
+            try:
+                server = (server_ip, int(server_port) if server_port else default_port)
+
+            except ValueError:
+                raise ValueError(f"'{value}' is not a valid server IP or IP:PORT")
+
+            if server not in server_list:
+                server_list.append(server)
+
+        return server_list
+
+    # Nearest-rank percentile of a sorted list
+    def _get_percentile(self, sorted_value_list, percentile):
+        if not sorted_value_list:
+            return None
+
+        return sorted_value_list[
+            max((percentile * len(sorted_value_list) + 99) // 100 - 1, 0)
+        ]
+
+    def _stat_servers(self, args, server_list):
+        from .tools.credentials import SessionCredentialsManager
+        from .tools.access_token import AccessTokenManager
+
+        access_token_db_file_path = self.config_content.get("access_token_db_file_path")
+        session_credentials_db_file_path = self.config_content.get(
+            "session_credentials_db_file_path"
+        )
+
+        if not os.path.exists(access_token_db_file_path):
+            createFileRecursively(access_token_db_file_path)
+
+        if not os.path.exists(session_credentials_db_file_path):
+            createFileRecursively(session_credentials_db_file_path)
+
+        with SessionCredentialsManager(
+            session_credentials_db_file_path,
+            store=self._get_credentials_store(),
+            **self._get_retention_policy(),
+        ) as session_credentials_manager, AccessTokenManager(
+            access_token_db_file_path, store=self._get_credentials_store()
+        ) as access_token_manager:
+            if args.known:
+                for server in sorted(
+                    set(session_credentials_manager.listServers())
+                    | set(access_token_manager.listServers())
+                ):
+                    if server not in server_list:
+                        server_list.append(server)
+
+            # Loaded before the requests are sent, so that the RTT are not affected
+            if args.web:
+                from .web.client import WebClientInterface
+
+            else:
+                self._get_runtime_rsa_wrapper()
+
+            stat_job = {
+                "web": args.web,
+                "ssl": args.ssl,
+                "no_ssl_verification": args.no_ssl_verification,
+                "timeout": args.timeout
+                if args.timeout is not None
+                else DEFAULT_STAT_TIMEOUT,
+            }
+            manager_dict = {"access-tk": access_token_manager}
+
+            def _stat_server(server):
+                start_time = time.perf_counter()
+
+                try:
+                    stat_result = self._run_batch_stat(
+                        {**stat_job, "ip": server[0], "port": server[1]}, manager_dict
+                    )
+
+                except Exception as E:
+                    stat_result = (
+                        LOG_JSON_STATUS_ERROR,
+                        "An error occured",
+                        {"error": str(E)},
+                    )
+
+                return (stat_result, time.perf_counter() - start_time)
+
+            rtt_list = []
+            failed_server_list = []
+
+            def _on_server_stat(server, server_result):
+                (status, message, result), rtt = server_result
+                server_ip, server_port = server
+                server_port = self._get_server_port(server_port, args.web)
+
+                if status == LOG_JSON_STATUS_SUCCESS:
+                    rtt_list.append(rtt)
+
+                else:
+                    failed_server_list.append([server_ip, server_port])
+
+                if args.json:
+                    print(
+                        json.dumps(
+                            {
+                                "server_ip": server_ip,
+                                "server_port": server_port,
+                                "status": status,
+                                "message": message,
+                                "result": result,
+                                "rtt_ms": round(rtt * 1000, 1),
+                            }
+                        ),
+                        flush=True,
+                    )
+
+                    return
+
+                row = f"{server_ip + ':' + str(server_port):<22} {status:<6} {rtt * 1000:>9.1f}  "
+
+                if status == LOG_JSON_STATUS_SUCCESS:
+                    data = result.get("data")
+                    self._log_stdout(
+                        row
+                        + f"{str(data.get('version')):<10} {str(data.get('uptime')):>10} {str(data.get('available')):>10}"
+                    )
+
+                else:
+                    self._log_stdout(
+                        row + (result.get("error") or message), color=Colors.RED
+                    )
+
+                sys.stdout.flush()
+
+            self._log_stdout(
+                f"{'SERVER':<22} {'STATUS':<6} {'RTT (ms)':>9}  {'VERSION':<10} {'UPTIME':>10} {'AVAILABLE':>10}",
+                bypass=args.json,
+            )
+
+            if not args.web:
+                self._start_crypto_executor()
+
+            try:
+                self._run_per_server(
+                    server_list,
+                    lambda server: server,
+                    _stat_server,
+                    _on_server_stat,
+                    args.concurrency,
+                    1,
+                )
+
+            finally:
+                self._stop_crypto_executor()
+
+        rtt_list.sort()
+        rtt_summary = {
+            "min": rtt_list[0] if rtt_list else None,
+            **{
+                f"p{percentile}": self._get_percentile(rtt_list, percentile)
+                for percentile in STAT_SUMMARY_PERCENTILE_LIST
+            },
+            "max": rtt_list[-1] if rtt_list else None,
+        }
+        rtt_summary = {
+            key: round(rtt * 1000, 1) if rtt is not None else None
+            for key, rtt in rtt_summary.items()
+        }
+
+        if args.json:
+            self._log_json(
+                LOG_JSON_STATUS_ERROR
+                if failed_server_list
+                else LOG_JSON_STATUS_SUCCESS,
+                "Servers statistics summary",
+                result={
+                    "queried_servers": len(server_list),
+                    "failed_servers": len(failed_server_list),
+                    "failed_server_list": failed_server_list,
+                    "rtt_ms": rtt_summary,
+                },
+            )
+
+        else:
+            self._log_stdout(
+                f"\nQueried servers : {len(server_list)}, failed : {len(failed_server_list)}"
+            )
+
+            if rtt_list:
+                self._log_stdout(
+                    "RTT (ms) : "
+                    + ", ".join(f"{key} {rtt}" for key, rtt in rtt_summary.items())
+                )
+
+            if failed_server_list:
+                self._log_stdout(
+                    "Failed servers : "
+                    + ", ".join(
+                        f"{server_ip}:{server_port}"
+                        for server_ip, server_port in failed_server_list
+                    ),
+                    color=Colors.RED,
+                )
+
+        return -1 if failed_server_list else 0
+
     def stat(self):
         parser = argparse.ArgumentParser(
             formatter_class=argparse.RawDescriptionHelpFormatter,
             description="| Retrieve runtime statistics of a remote server",
-            usage=f"{sys.argv[0]} stat <ip> [OPT] ",
+            usage=f"{sys.argv[0]} stat [ip[:port] ...] [OPT] ",
         )
 
-        parser.add_argument("ip", help="specify the server IP", type=str)
         parser.add_argument(
-            "-p", "--port", help="specify the server listen port", type=int
+            "ip",
+            help="specify the server IPs, with an optional listen port (IP:PORT)",
+            nargs="*",
+            type=str,
         )
         parser.add_argument(
-            "-w", "--web", help="use the web version of the client", action="store_true"
-        )
+            "-p",
+            "--port",
+            help="specify the server listen port, for the IPs without one",
+            type=int,
+        )
+        parser.add_argument(
+            "--known",
+            help="query every server of the stored credentials and access tokens",
+            action="store_true",
+        )
+        parser.add_argument(
+            "-c",
+            "--concurrency",
+            help=f"specify the maximum amount of servers queried at the same time (default is {DEFAULT_STAT_CONCURRENCY})",
+            type=int,
+            default=DEFAULT_STAT_CONCURRENCY,
+        )
+        parser.add_argument(
+            "--timeout",
+            help=f"specify the request timeout in seconds (default is {DEFAULT_STAT_TIMEOUT} with several servers, none otherwise)",
+            type=float,
+        )
+        parser.add_argument(
+            "-w", "--web", help="use the web version of the client", action="store_true"
+        )
         parser.add_argument(
             "-s",
             "--ssl",
@@ -769,8 +1915,42 @@ please report it by opening an issue on the repository :
         )
         args = parser.parse_args(sys.argv[2:])
 
+        from .core.client import REQUEST_VERB_STAT
+        from .tools.access_token import AccessTokenManager
+
         self.json = args.json
 
+        try:
+            server_list = self._parse_server_list(args.ip, args.port)
+
+        except ValueError as E:
+            self._log_error(str(E))
+
+            return -1
+
+        if not (server_list or args.known):
+            self._log_error("Specify server IPs or --known")
+
+            return -1
+
+        # Several servers are queried concurrently, see '_stat_servers'
+        if args.known or len(server_list) > 1:
+            if args.check_server_rsa_fingerprint:
+                self._log_error(
+                    "The server RSA fingerprint can only be checked with a single server"
+                )
+
+                return -1
+
+            if args.concurrency <= 0:
+                self._log_error("The concurrency must be a non-zero positive integer")
+
+                return -1
+
+            return self._stat_servers(args, server_list)
+
+        args.ip, args.port = server_list[0]
+
         check_result = self._check_parameters_validity(args.ip, args.port)
         if check_result == ERROR_INVALID_IP:
             if args.json:
@@ -786,266 +1966,811 @@ please report it by opening an issue on the repository :
                     error=True,
                 )
 
-            return -1
+            return -1
+
+        if check_result == ERROR_INVALID_PORT:
+            if args.json:
+                self._log_json(
+                    LOG_JSON_STATUS_ERROR,
+                    f"'{args.port}' is not a non-zero integer less than 65535",
+                )
+
+            else:
+                self._log_stdout(
+                    f"'{args.port}' is not a non-zero integer less than 65535",
+                    color=Colors.RED,
+                    error=True,
+                )
+
+            return -1
+
+        access_token_db_file_path = self.config_content.get("access_token_db_file_path")
+
+        if not os.path.exists(access_token_db_file_path):
+            createFileRecursively(access_token_db_file_path)
+
+        with AccessTokenManager(
+            access_token_db_file_path, store=self._get_credentials_store()
+        ) as access_token_manager:
+            request_parameters = self._make_request_parameters(
+                access_token_manager, args.ip
+            )
+
+        response = self._send_request(
+            REQUEST_VERB_STAT,
+            args.ip,
+            self._get_server_port(args.port, args.web),
+            request_parameters,
+            web=args.web,
+            enable_ssl=args.ssl,
+            verify_ssl_certificate=not args.no_ssl_verification,
+            check_server_rsa_fingerprint=args.check_server_rsa_fingerprint,
+            timeout=args.timeout,
+        )
+
+        if not response:
+            return 0
+
+        is_response_valid, response_content, response_error_dict = response
+
+        if not is_response_valid:
+            if args.json:
+                self._log_json(
+                    LOG_JSON_STATUS_ERROR,
+                    "Received invalid response",
+                    result={"error_dict": response_error_dict},
+                )
+
+            else:
+                self._log_stdout(
+                    "Received invalid response", color=Colors.RED, error=True
+                )
+                self._log_stdout(
+                    f"  Error(s) : {json.dumps(response_error_dict, indent=4)}",
+                    error=True,
+                )
+
+            return -1
+
+        message = response_content.get("message")
+
+        if not response_content["success"]:
+            if args.json:
+                self._log_json(
+                    LOG_JSON_STATUS_ERROR,
+                    "Failed to stat server",
+                    result={"response": response_content},
+                )
+
+            else:
+                self._log_stdout("Failed to stat server", color=Colors.RED, error=True)
+                self._log_stdout(f"  Message : {message}", error=True)
+
+            return -1
+
+        version = response_content["data"].get("version")
+        uptime = response_content["data"].get("uptime")
+        available = response_content["data"].get("available")
+
+        if args.json:
+            self._log_json(
+                LOG_JSON_STATUS_SUCCESS,
+                "Server statistics",
+                result={
+                    "message": message,
+                    "data": response_content.get("data"),
+                },
+            )
+
+        else:
+            self._log_stdout("Server statistics :")
+            self._log_stdout(f"  Version : {version}")
+            self._log_stdout(f"  Uptime : {uptime}")
+            self._log_stdout(f"  Available containers : {available}")
+
+        return 0
+
+    def _get_ssh_command(
+        self, control_path, server_ip, container_username, container_listen_port
+    ):
+        return [
+            "ssh",
+            "-oStrictHostKeyChecking=no",
+            f"-oControlPath={control_path}",
+            "-p",
+            str(container_listen_port),
+            f"{container_username}@{server_ip}",
+        ]
+
+    def _is_ssh_master_running(self, ssh_command):
+        from subprocess import run, DEVNULL
+
+        return (
+            run(
+                [*ssh_command[:1], "-O", "check", *ssh_command[1:]],
+                stdin=DEVNULL,
+                stdout=DEVNULL,
+                stderr=DEVNULL,
+            ).returncode
+            == 0
+        )
+
+    # The password is passed to sshpass through a pipe, and the master goes in
+    # background once authenticated, kept 'persist' seconds after the last session
+    def _start_ssh_master(self, ssh_command, container_password, persist):
+        from subprocess import run, DEVNULL
+        from tempfile import TemporaryFile
+
+        password_read_fd, password_write_fd = os.pipe()
+
+        with open(password_write_fd, "w") as fd:
+            fd.write(container_password)
+
+        # The master keeps the inherited descriptors : Reading its errors from a
+        # pipe would wait for it to end
+        with TemporaryFile() as error_fd:
+            try:
+                result = run(
+                    [
+                        "/bin/sshpass",
+                        "-d",
+                        str(password_read_fd),
+                        *ssh_command[:1],
+                        "-fN",
+                        "-oControlMaster=yes",
+                        f"-oControlPersist={persist}",
+                        *ssh_command[1:],
+                    ],
+                    stdin=DEVNULL,
+                    stdout=DEVNULL,
+                    stderr=error_fd,
+                    pass_fds=(password_read_fd,),
+                )
+
+            finally:
+                os.close(password_read_fd)
+
+            error_fd.seek(0)
+
+            return (result.returncode == 0, error_fd.read().decode().strip())
+
+    def ssh_connect(self):
+        parser = argparse.ArgumentParser(
+            description="| Establish an SSH tunnel on a created container (not available on Windows)",
+            usage=f"{sys.argv[0]} ssh-connect <container_entry_id> [OPT] ",
+        )
+        parser.add_argument(
+            "id", help="specify the container credentials ID to use", type=int
+        )
+        parser.add_argument(
+            "--persist",
+            help=f"keep the SSH connection open for PERSIST seconds after the session ends (default {DEFAULT_SSH_CONTROL_PERSIST})",
+            type=int,
+            default=DEFAULT_SSH_CONTROL_PERSIST,
+        )
+        parser.add_argument(
+            "--close",
+            help="close the kept SSH connection of the container",
+            action="store_true",
+        )
+        self._add_wait_ready_argument(parser)
+        args = parser.parse_args(sys.argv[2:])
+
+        from subprocess import run, DEVNULL, PIPE
+        import shlex
+
+        from .tools.credentials import ContainerCredentialsManager
+
+        if os.name == "nt":
+            self._log_stdout(
+                "This feature is not available on Windows",
+                color=Colors.RED,
+                error=True,
+            )
+
+            return -1
+
+        if not args.close and not os.path.exists("/bin/sshpass"):
+            self._log_stdout(
+                "sshpass wasn't found on system, make sure it is installed before using this feature",
+                color=Colors.RED,
+                error=True,
+            )
+
+            return -1
+
+        container_credentials_db_file_path = self.config_content.get(
+            "container_credentials_db_file_path"
+        )
+
+        if not os.path.exists(container_credentials_db_file_path):
+            createFileRecursively(container_credentials_db_file_path)
+
+        with ContainerCredentialsManager(
+            container_credentials_db_file_path,
+            store=self._get_credentials_store(),
+            **self._get_retention_policy(),
+        ) as container_credentials_manager:
+            credentials = container_credentials_manager.getEntry(args.id)
+
+        if not credentials:
+            self._log_stdout(
+                f"Container credentials entry ID '{args.id}' does not exists",
+                color=Colors.RED,
+                error=True,
+            )
+
+            return -1
+
+        (
+            _,
+            creation_timestamp,
+            server_ip,
+            _,
+            container_username,
+            container_password,
+            container_listen_port,
+        ) = credentials
+
+        # Each entry gets its own master, the setup command and every
+        # session of the container are multiplexed over it
+        ssh_command = self._get_ssh_command(
+            os.path.join(
+                SSH_CONTROL_FOLDER_PATH,
+                f"container-{args.id}-{creation_timestamp}.sock",
+            ),
+            server_ip,
+            container_username,
+            container_listen_port,
+        )
+
+        if args.close:
+            if self._is_ssh_master_running(ssh_command):
+                run(
+                    [*ssh_command[:1], "-O", "exit", *ssh_command[1:]],
+                    stdin=DEVNULL,
+                    stdout=DEVNULL,
+                    stderr=DEVNULL,
+                )
+
+            self._log_stdout(
+                f"SSH connection of container credentials entry ID '{args.id}' is closed"
+            )
+
+            return 0
+
+        if not self._is_ssh_master_running(ssh_command):
+            if args.wait_ready is not None:
+                self._log_stdout("Waiting for the container SSH server ... ")
+
+                if not self._wait_container_ready(
+                    server_ip, container_listen_port, args.wait_ready
+                ):
+                    self._log_stdout(
+                        f"Container SSH server is not ready after {args.wait_ready} seconds",
+                        color=Colors.RED,
+                        error=True,
+                    )
+
+                    return -1
+
+            createFileRecursively(SSH_CONTROL_FOLDER_PATH, is_folder=True)
+            os.chmod(SSH_CONTROL_FOLDER_PATH, 0o700)
+
+            is_master_started, master_error = self._start_ssh_master(
+                ssh_command, container_password, args.persist
+            )
+
+            if not is_master_started:
+                self._log_stdout(
+                    f"Error while connecting to remote container : {master_error}",
+                    color=Colors.RED,
+                    error=True,
+                )
+
+                return -1
+
+            # Set the user password in a file, once per connection
+            setup_result = run(
+                [
+                    *ssh_command,
+                    f"echo {shlex.quote(container_password)} > PASSWD.txt",
+                ],
+                stdin=DEVNULL,
+                stdout=PIPE,
+                stderr=PIPE,
+            )
+
+            if setup_result.returncode != 0:
+                self._log_stdout(
+                    f"Error while connecting to remote container : {setup_result.stderr.decode().strip()}",
+                    color=Colors.RED,
+                    error=True,
+                )
+
+                return -1
+
+        self._log_stdout(
+            f"You can retrieve {container_username} password in the PASSWD.txt file, located in its home\n",
+        )
+
+        try:
+            run([*ssh_command[:1], "-t", *ssh_command[1:]])
+
+        except Exception:
+            pass
+
+        return 0
+
+    # Result tuple of an invalid server IP or port, None otherwise
+    def _check_job_parameters(self, ip, port=None):
+        check_result = self._check_parameters_validity(ip, port)
+
+        if check_result == ERROR_INVALID_IP:
+            return (LOG_JSON_STATUS_ERROR, f"'{ip}' is not a valid IPv4 IP format", {})
+
+        if check_result == ERROR_INVALID_PORT:
+            return (
+                LOG_JSON_STATUS_ERROR,
+                f"'{port}' is not a non-zero integer less than 65535",
+                {},
+            )
+
+    # Returns a result tuple if the request failed, and the response content
+    def _send_job_request(
+        self,
+        verb,
+        job,
+        server_ip,
+        server_port,
+        manager_dict,
+        failure_message,
+        parameters={},
+    ):
+        (
+            is_response_valid,
+            response_content,
+            response_error_dict,
+        ) = self._send_request(
+            verb,
+            server_ip,
+            server_port,
+            self._make_request_parameters(
+                manager_dict["access-tk"], server_ip, parameters
+            ),
+            web=bool(job.get("web")),
+            enable_ssl=bool(job.get("ssl")),
+            verify_ssl_certificate=not job.get("no_ssl_verification"),
+            timeout=job.get("timeout"),
+            crypto_executor=self.crypto_executor,
+        )
+
+        if not is_response_valid:
+            return (
+                (
+                    LOG_JSON_STATUS_ERROR,
+                    "Received invalid response",
+                    {"error_dict": response_error_dict},
+                ),
+                response_content,
+            )
+
+        if not response_content["success"]:
+            return (
+                (
+                    LOG_JSON_STATUS_ERROR,
+                    failure_message,
+                    {"response": response_content},
+                ),
+                response_content,
+            )
+
+        return (None, response_content)
+
+    def _run_batch_create(self, job, manager_dict):
+        from .core.client import REQUEST_VERB_CREATE
+
+        check_result = self._check_job_parameters(job["ip"], job.get("port"))
+
+        if check_result:
+            return check_result
+
+        server_port = self._get_server_port(job.get("port"), job.get("web"))
+
+        failure_result, response_content = self._send_job_request(
+            REQUEST_VERB_CREATE,
+            job,
+            job["ip"],
+            server_port,
+            manager_dict,
+            "Failed to create container",
+        )
+
+        if failure_result:
+            return failure_result
+
+        new_session_credentials_entry_id = None
+        new_container_credentials_entry_id = None
+
+        if not job.get("do_not_store"):
+            (
+                new_session_credentials_entry_id,
+                new_container_credentials_entry_id,
+            ) = self._store_created_credentials(
+                manager_dict["session"],
+                manager_dict["container"],
+                job["ip"],
+                server_port,
+                response_content["data"],
+            )
+
+        result = {
+            "message": response_content.get("message"),
+            "data": response_content.get("data"),
+            "session_entry_id": new_session_credentials_entry_id,
+            "container_entry_id": new_container_credentials_entry_id,
+            "ssh_ready": None,
+        }
+
+        # 'wait_ready' is a timeout in seconds, or true for the default one
+        if job.get("wait_ready"):
+            result["ssh_ready"] = self._wait_container_ready(
+                job["ip"],
+                response_content["data"].get("container_listen_port"),
+                DEFAULT_SSH_READY_TIMEOUT
+                if job["wait_ready"] is True
+                else float(job["wait_ready"]),
+            )
+
+            if not result["ssh_ready"]:
+                return (
+                    LOG_JSON_STATUS_ERROR,
+                    "Container SSH server is not ready",
+                    result,
+                )
+
+        return (LOG_JSON_STATUS_SUCCESS, "Container successfully created", result)
+
+    # Sends the DESTROY request of a session entry, the entry is not deleted
+    def _destroy_container(self, job, entry_content, manager_dict):
+        from .core.client import REQUEST_VERB_DESTROY
+
+        _, _, server_ip, server_port, container_uuid, client_token = entry_content
+
+        failure_result, response_content = self._send_job_request(
+            REQUEST_VERB_DESTROY,
+            job,
+            server_ip,
+            server_port,
+            manager_dict,
+            "Failed to destroy container",
+            parameters={"container_uuid": container_uuid, "client_token": client_token},
+        )
+
+        if failure_result:
+            return failure_result
+
+        return (
+            LOG_JSON_STATUS_SUCCESS,
+            "Container successfully destroyed",
+            {"message": response_content.get("message")},
+        )
+
+    def _run_batch_destroy(self, job, manager_dict):
+        session_entry_id = job["session_entry_id"]
+        entry_content = manager_dict["session"].getEntry(session_entry_id)
+
+        if not entry_content:
+            return (
+                LOG_JSON_STATUS_ERROR,
+                f"Session ID '{session_entry_id}' does not exists",
+                {},
+            )
+
+        destroy_result = self._destroy_container(job, entry_content, manager_dict)
+
+        if destroy_result[0] == LOG_JSON_STATUS_SUCCESS and not job.get("do_not_delete"):
+            self._delete_destroyed_credentials(
+                manager_dict["session"],
+                manager_dict["container"],
+                entry_content,
+            )
+
+        return destroy_result
+
+    def _run_batch_stat(self, job, manager_dict):
+        from .core.client import REQUEST_VERB_STAT
+
+        check_result = self._check_job_parameters(job["ip"], job.get("port"))
+
+        if check_result:
+            return check_result
 
-        if check_result == ERROR_INVALID_PORT:
-            if args.json:
-                self._log_json(
-                    LOG_JSON_STATUS_ERROR,
-                    f"'{args.port}' is not a non-zero integer less than 65535",
-                )
+        failure_result, response_content = self._send_job_request(
+            REQUEST_VERB_STAT,
+            job,
+            job["ip"],
+            self._get_server_port(job.get("port"), job.get("web")),
+            manager_dict,
+            "Failed to stat server",
+        )
 
-            else:
-                self._log_stdout(
-                    f"'{args.port}' is not a non-zero integer less than 65535",
-                    color=Colors.RED,
-                    error=True,
-                )
+        if failure_result:
+            return failure_result
 
-            return -1
+        return (
+            LOG_JSON_STATUS_SUCCESS,
+            "Server statistics",
+            {
+                "message": response_content.get("message"),
+                "data": response_content.get("data"),
+            },
+        )
 
-        self._load_rsa_keys()
-        access_token_db_file_path = self.config_content.get("access_token_db_file_path")
+    # The 'list', 'get' and 'delete' actions of the entries management commands
+    def _run_entry_job(self, job, manager, key_list):
+        action = job["action"]
+
+        if action == "list":
+            entry_iterator = manager.iterEntries(
+                server_ip=job.get("server_ip"),
+                server_port=job.get("server_port"),
+                created_after=job.get("since"),
+                created_before=job.get("until"),
+                descending_order=bool(job.get("desc")),
+            )
 
-        if not os.path.exists(access_token_db_file_path):
-            createFileRecursively(access_token_db_file_path)
+            if job.get("limit") is not None:
+                entry_iterator = islice(entry_iterator, max(job["limit"], 0))
 
-        request_parameters = {}
+            return (
+                LOG_JSON_STATUS_SUCCESS,
+                "Recorded entries ID",
+                {"entry_list": list(entry_iterator)},
+            )
 
-        with AccessTokenManager(access_token_db_file_path) as access_token_manager:
-            entry_id = access_token_manager.getEntryID(args.ip)
+        if action not in ["get", "delete"]:
+            return (LOG_JSON_STATUS_ERROR, f"Unknown action '{action}'", {})
 
-            if entry_id:
-                request_parameters.update(
-                    {"access_token": access_token_manager.getEntry(entry_id)[4]}
-                )
+        entry_id = job["entry_id"]
+        entry_content = manager.getEntry(entry_id)
 
-        if args.web:
-            client = WebClientInterface(
-                args.ip,
-                server_listen_port=args.port
-                if args.port
-                else DEFAULT_HTTP_SERVER_LISTEN_PORT,
-                enable_ssl=args.ssl if args.ssl else DEFAULT_ENABLE_SSL,
+        if not entry_content:
+            return (
+                LOG_JSON_STATUS_ERROR,
+                f"Entry ID '{entry_id}' does not exists",
+                {},
             )
 
-            (
-                is_response_valid,
-                response_content,
-                response_error_dict,
-            ) = client.sendRequest(
-                REQUEST_VERB_STAT,
-                parameters=request_parameters,
-                verify_ssl_certificate=not args.no_ssl_verification,
+        if action == "get":
+            return (
+                LOG_JSON_STATUS_SUCCESS,
+                "Entry ID content",
+                dict(zip(key_list, entry_content[1:])),
             )
 
-        else:
-            with ClientInterface(
-                args.ip,
-                server_listen_port=args.port
-                if args.port
-                else DEFAULT_SERVER_LISTEN_PORT,
-                rsa_wrapper=self.runtime_rsa_wrapper,
-            ) as client:
-                client.connectServer()
-
-                if args.check_server_rsa_fingerprint:
-                    server_rsa_fingerprint = hashlib.sha256(
-                        client.getRSAWrapper().getRemotePublicKey()
-                    ).hexdigest()
+        manager.deleteEntry(entry_id)
 
-                    self._log_stdout(
-                        f"Server RSA fingerprint : {self._format_rsa_fingerprint(server_rsa_fingerprint)}"
-                    )
+        return (LOG_JSON_STATUS_SUCCESS, "Entry ID was deleted", {})
 
-                    if input("Continue ? (y/n) : ") != "y":
-                        self._log_stdout("Aborting ...")
+    def _run_batch_session(self, job, manager_dict):
+        return self._run_entry_job(
+            job, manager_dict["session"], SESSION_CREDENTIALS_EXPORT_KEY_LIST
+        )
 
-                        client.closeConnection()
+    def _run_batch_container(self, job, manager_dict):
+        return self._run_entry_job(
+            job, manager_dict["container"], CONTAINER_CREDENTIALS_EXPORT_KEY_LIST
+        )
 
-                        return 0
+    def _run_batch_access_tk(self, job, manager_dict):
+        if job["action"] != "add":
+            return self._run_entry_job(
+                job, manager_dict["access-tk"], ACCESS_TOKEN_EXPORT_KEY_LIST
+            )
 
-                client.sendRequest(
-                    REQUEST_VERB_STAT,
-                    parameters=request_parameters,
-                )
+        server_ip = job["server_ip"]
+        check_result = self._check_job_parameters(server_ip, job.get("server_port"))
 
-                (
-                    is_response_valid,
-                    response_content,
-                    response_error_dict,
-                ) = client.recvResponse()
+        if check_result:
+            return check_result
 
-        if not is_response_valid:
-            if args.json:
-                self._log_json(
-                    LOG_JSON_STATUS_ERROR,
-                    "Received invalid response",
-                    result={"error_dict": response_error_dict},
-                )
+        if manager_dict["access-tk"].getEntryID(server_ip):
+            return (
+                LOG_JSON_STATUS_ERROR,
+                f"'{server_ip}' is already specified on database",
+                {},
+            )
 
-            else:
-                self._log_stdout(
-                    "Received invalid response", color=Colors.RED, error=True
-                )
-                self._log_stdout(
-                    f"  Error(s) : {json.dumps(response_error_dict, indent=4)}",
-                    error=True,
-                )
+        new_entry_id, _ = manager_dict["access-tk"].addEntry(
+            server_ip,
+            self._get_server_port(job.get("server_port"), False),
+            job["access_token"],
+        )
 
-            return -1
+        return (
+            LOG_JSON_STATUS_SUCCESS,
+            "New token entry created",
+            {"entry_id": new_entry_id},
+        )
 
-        message = response_content.get("message")
+    # Returns the job and the function running it
+    def _parse_batch_job(self, line):
+        job = json.loads(line)
 
-        if not response_content["success"]:
-            if args.json:
-                self._log_json(
-                    LOG_JSON_STATUS_ERROR,
-                    "Failed to stat server",
-                    result={"response": response_content},
-                )
+        if type(job) is not dict:
+            raise ValueError("A job must be a JSON object")
 
-            else:
-                self._log_stdout("Failed to stat server", color=Colors.RED, error=True)
-                self._log_stdout(f"  Message : {message}", error=True)
+        job_function = getattr(
+            self, "_run_batch_" + str(job["command"]).replace("-", "_"), None
+        )
 
-            return -1
+        if not job_function:
+            raise ValueError(f"Unknown command '{job['command']}'")
 
-        version = response_content["data"].get("version")
-        uptime = response_content["data"].get("uptime")
-        available = response_content["data"].get("available")
+        return (job, job_function)
 
-        if args.json:
-            self._log_json(
-                LOG_JSON_STATUS_SUCCESS,
-                "Server statistics",
-                result={
-                    "message": message,
-                    "data": response_content.get("data"),
-                },
+    # Jobs are identified by their 'id' key, or by their line number
+    def _run_batch_job(self, line_number, line, manager_dict):
+        try:
+            job, job_function = self._parse_batch_job(line)
+
+        except KeyError as E:
+            return {
+                "id": line_number,
+                "status": LOG_JSON_STATUS_ERROR,
+                "message": f"Invalid job : Missing {E} key",
+                "result": {},
+            }
+
+        except ValueError as E:
+            return {
+                "id": line_number,
+                "status": LOG_JSON_STATUS_ERROR,
+                "message": f"Invalid job : {E}",
+                "result": {},
+            }
+
+        try:
+            status, message, result = job_function(job, manager_dict)
+
+        except KeyError as E:
+            status, message, result = (
+                LOG_JSON_STATUS_ERROR,
+                f"Invalid job : Missing {E} key",
+                {},
             )
 
-        else:
-            self._log_stdout("Server statistics :")
-            self._log_stdout(f"  Version : {version}")
-            self._log_stdout(f"  Uptime : {uptime}")
-            self._log_stdout(f"  Available containers : {available}")
+        except Exception as E:
+            status, message, result = (
+                LOG_JSON_STATUS_ERROR,
+                "An error occured",
+                {"error": str(E)},
+            )
 
-        return 0
+        return {
+            "id": job.get("id", line_number),
+            "status": status,
+            "message": message,
+            "result": result,
+        }
 
-    def ssh_connect(self):
+    def batch(self):
         parser = argparse.ArgumentParser(
-            description="| Establish an SSH tunnel on a created container (not available on Windows)",
-            usage=f"{sys.argv[0]} ssh-connect <container_entry_id> ",
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+            description="| Run newline-delimited JSON jobs read from stdin",
+            usage=f"{sys.argv[0]} batch [OPT] < <jobs_file_path>",
+            epilog="Each job result is printed as a JSON line once the job is finished",
         )
         parser.add_argument(
-            "id", help="specify the container credentials ID to use", type=int
+            "-c",
+            "--concurrency",
+            help=f"specify the maximum amount of jobs run at the same time (default is {DEFAULT_BATCH_CONCURRENCY})",
+            type=int,
+            default=DEFAULT_BATCH_CONCURRENCY,
         )
         args = parser.parse_args(sys.argv[2:])
 
-        if os.name == "nt":
-            self._log_stdout(
-                "This feature is not available on Windows",
-                color=Colors.RED,
-                error=True,
-            )
+        from concurrent.futures import ThreadPoolExecutor
+        import threading
 
-            return -1
+        from .tools.credentials import (
+            SessionCredentialsManager,
+            ContainerCredentialsManager,
+        )
+        from .tools.access_token import AccessTokenManager
 
-        if not os.path.exists("/bin/sshpass"):
-            self._log_stdout(
-                "sshpass wasn't found on system, make sure it is installed before using this feature",
-                color=Colors.RED,
-                error=True,
+        self.json = True
+
+        if args.concurrency <= 0:
+            self._log_json(
+                LOG_JSON_STATUS_ERROR,
+                f"'{args.concurrency}' is not a non-zero positive integer",
             )
 
             return -1
 
+        access_token_db_file_path = self.config_content.get("access_token_db_file_path")
+        session_credentials_db_file_path = self.config_content.get(
+            "session_credentials_db_file_path"
+        )
         container_credentials_db_file_path = self.config_content.get(
             "container_credentials_db_file_path"
         )
 
-        if not os.path.exists(container_credentials_db_file_path):
-            createFileRecursively(container_credentials_db_file_path)
+        if not os.path.exists(access_token_db_file_path):
+            createFileRecursively(access_token_db_file_path)
 
-        with ContainerCredentialsManager(
-            container_credentials_db_file_path
-        ) as container_credentials_manager:
-            credentials = container_credentials_manager.getEntry(args.id)
+        if not os.path.exists(session_credentials_db_file_path):
+            createFileRecursively(session_credentials_db_file_path)
 
-            if not credentials:
-                container_credentials_manager.closeDatabase()
-                self._log_stdout(
-                    f"Container credentials entry ID '{args.id}' does not exists",
-                    color=Colors.RED,
-                    error=True,
-                )
+        if not os.path.exists(container_credentials_db_file_path):
+            createFileRecursively(container_credentials_db_file_path)
 
-                return -1
+        # The RSA keys are loaded by the first job that needs them
+        self.rsa_keys_lock = threading.Lock()
 
-            (
-                _,
-                _,
-                server_ip,
-                _,
-                container_username,
-                container_password,
-                container_listen_port,
-            ) = credentials
+        queued_jobs_semaphore = threading.BoundedSemaphore(
+            args.concurrency * BATCH_QUEUED_JOBS_FACTOR
+        )
+        output_lock = threading.Lock()
+        failed_job_id_list = []
 
-            tmp_file_path = (
-                f"/tmp/.{''.join(random.choices(string.ascii_lowercase, k=10))}"
-            )
+        def _on_job_done(job_future):
+            job_result = job_future.result()
 
-            with open(tmp_file_path, "w") as tmp_fd:
-                tmp_fd.write(container_password)
+            with output_lock:
+                if job_result["status"] != LOG_JSON_STATUS_SUCCESS:
+                    failed_job_id_list.append(job_result["id"])
 
-            # Connect to the remote container domain and set the user password in a file
-            cmd = Popen(
-                [
-                    "/bin/sshpass",
-                    "-f",
-                    tmp_file_path,
-                    "ssh",
-                    "-t",
-                    "-oStrictHostKeyChecking=no",
-                    f"{container_username}@{server_ip}",
-                    "-p",
-                    str(container_listen_port),
-                    "echo",
-                    container_password,
-                    ">",
-                    "PASSWD.txt",
-                ],
-                stdout=PIPE,
-                stderr=PIPE,
-            )
-            result_out, _ = cmd.communicate()
+                try:
+                    sys.stdout.write(json.dumps(job_result) + "\n")
+                    sys.stdout.flush()
 
-            if result_out.decode():
-                self._log_stdout(
-                    f"Error while connecting to remote container : {result_out}",
-                    color=Colors.RED,
-                    error=True,
-                )
+                # The output was closed by the reading process
+                except BrokenPipeError:
+                    sys.stdout = open(os.devnull, "w")
 
-                return -1
+            queued_jobs_semaphore.release()
 
-            self._log_stdout(
-                f"You can retrieve {container_username} password in the PASSWD.txt file, located in its home\n",
-            )
+        with SessionCredentialsManager(
+            session_credentials_db_file_path,
+            store=self._get_credentials_store(),
+            **self._get_retention_policy(),
+        ) as session_credentials_manager, ContainerCredentialsManager(
+            container_credentials_db_file_path,
+            store=self._get_credentials_store(),
+            **self._get_retention_policy(),
+        ) as container_credentials_manager, AccessTokenManager(
+            access_token_db_file_path, store=self._get_credentials_store()
+        ) as access_token_manager:
+            manager_dict = {
+                "session": session_credentials_manager,
+                "container": container_credentials_manager,
+                "access-tk": access_token_manager,
+            }
+
+            self._start_crypto_executor()
 
             try:
-                os.system(
-                    f"/bin/sshpass -f {tmp_file_path} ssh -t -oStrictHostKeyChecking=no {container_username}@{server_ip} -p {container_listen_port}"
-                )
+                with ThreadPoolExecutor(
+                    max_workers=args.concurrency,
+                    thread_name_prefix="anwdlclient-batch",
+                ) as executor:
+                    for line_number, line in enumerate(sys.stdin, start=1):
+                        if not line.strip():
+                            continue
 
-            except Exception:
-                pass
+                        queued_jobs_semaphore.acquire()
 
-            os.remove(tmp_file_path)
+                        executor.submit(
+                            self._run_batch_job, line_number, line, manager_dict
+                        ).add_done_callback(_on_job_done)
 
-        return 0
+            finally:
+                self._stop_crypto_executor()
+
+        return -1 if failed_job_id_list else 0
 
     def session(self):
         parser = argparse.ArgumentParser(
@@ -1069,11 +2794,15 @@ please report it by opening an issue on the repository :
             metavar="ENTRY_ID",
             type=int,
         )
+        self._add_listing_arguments(parser)
+        self._add_transfer_arguments(parser)
         parser.add_argument(
             "--json", help="print output in JSON format", action="store_true"
         )
         args = parser.parse_args(sys.argv[2:])
 
+        from .tools.credentials import SessionCredentialsManager
+
         self.json = args.json
 
         session_credentials_db_file_path = self.config_content.get(
@@ -1084,29 +2813,24 @@ please report it by opening an issue on the repository :
             createFileRecursively(session_credentials_db_file_path)
 
         with SessionCredentialsManager(
-            session_credentials_db_file_path
+            session_credentials_db_file_path,
+            store=self._get_credentials_store(),
+            **self._get_retention_policy(),
         ) as session_credentials_manager:
             if args.l:
-                if args.json:
-                    self._log_json(
-                        LOG_JSON_STATUS_SUCCESS,
-                        "Recorded entries ID",
-                        result={
-                            "entry_list": session_credentials_manager.listEntries()
-                        },
-                    )
+                self._log_entries(session_credentials_manager, args)
 
-                else:
-                    for (
-                        entry_id,
-                        creation_timestamp,
-                        server_ip,
-                    ) in session_credentials_manager.listEntries():
-                        self._log_stdout(f"- Entry ID {entry_id}")
-                        self._log_stdout(
-                            f"  Created : {datetime.fromtimestamp(creation_timestamp)}"
-                        )
-                        self._log_stdout(f"  Server IP : {server_ip}\n")
+            elif args.export_entries:
+                self._export_entries(
+                    session_credentials_manager, SESSION_CREDENTIALS_EXPORT_KEY_LIST
+                )
+
+            elif args.import_entries:
+                self._import_entries(
+                    session_credentials_manager,
+                    SESSION_CREDENTIALS_EXPORT_KEY_LIST,
+                    args,
+                )
 
             elif args.get_entry:
                 credentials = session_credentials_manager.getEntry(args.get_entry)
@@ -1202,11 +2926,15 @@ please report it by opening an issue on the repository :
             metavar="ENTRY_ID",
             type=int,
         )
+        self._add_listing_arguments(parser)
+        self._add_transfer_arguments(parser)
         parser.add_argument(
             "--json", help="print output in JSON format", action="store_true"
         )
         args = parser.parse_args(sys.argv[2:])
 
+        from .tools.credentials import ContainerCredentialsManager
+
         self.json = args.json
 
         container_credentials_db_file_path = self.config_content.get(
@@ -1217,29 +2945,25 @@ please report it by opening an issue on the repository :
             createFileRecursively(container_credentials_db_file_path)
 
         with ContainerCredentialsManager(
-            container_credentials_db_file_path
+            container_credentials_db_file_path,
+            store=self._get_credentials_store(),
+            **self._get_retention_policy(),
         ) as container_credentials_manager:
             if args.l:
-                if args.json:
-                    self._log_json(
-                        LOG_JSON_STATUS_SUCCESS,
-                        "Recorded entries ID",
-                        result={
-                            "entry_list": container_credentials_manager.listEntries()
-                        },
-                    )
+                self._log_entries(container_credentials_manager, args)
 
-                else:
-                    for (
-                        entry_id,
-                        creation_timestamp,
-                        server_ip,
-                    ) in container_credentials_manager.listEntries():
-                        self._log_stdout(f"- Entry ID {entry_id}")
-                        self._log_stdout(
-                            f"  Created : {datetime.fromtimestamp(creation_timestamp)}"
-                        )
-                        self._log_stdout(f"  Server IP : {server_ip}\n")
+            elif args.export_entries:
+                self._export_entries(
+                    container_credentials_manager, CONTAINER_CREDENTIALS_EXPORT_KEY_LIST
+                )
+
+            elif args.import_entries:
+                self._import_entries(
+                    container_credentials_manager,
+                    CONTAINER_CREDENTIALS_EXPORT_KEY_LIST,
+                    args,
+                    default_values={"container_uuid": None},
+                )
 
             elif args.get_entry:
                 credentials = container_credentials_manager.getEntry(args.get_entry)
@@ -1353,11 +3077,15 @@ please report it by opening an issue on the repository :
             dest="server_port",
             type=int,
         )
+        self._add_listing_arguments(parser, add_port_argument=False)
+        self._add_transfer_arguments(parser)
         parser.add_argument(
             "--json", help="print output in JSON format", action="store_true"
         )
         args = parser.parse_args(sys.argv[2:])
 
+        from .tools.access_token import AccessTokenManager
+
         self.json = args.json
 
         access_token_db_file_path = self.config_content.get("access_token_db_file_path")
@@ -1365,26 +3093,19 @@ please report it by opening an issue on the repository :
         if not os.path.exists(access_token_db_file_path):
             createFileRecursively(access_token_db_file_path)
 
-        with AccessTokenManager(access_token_db_file_path) as access_token_manager:
+        with AccessTokenManager(
+            access_token_db_file_path, store=self._get_credentials_store()
+        ) as access_token_manager:
             if args.l:
-                if args.json:
-                    self._log_json(
-                        LOG_JSON_STATUS_SUCCESS,
-                        "Recorded entries ID",
-                        result={"entry_list": access_token_manager.listEntries()},
-                    )
+                self._log_entries(access_token_manager, args)
 
-                else:
-                    for (
-                        entry_id,
-                        creation_timestamp,
-                        server_ip,
-                    ) in access_token_manager.listEntries():
-                        self._log_stdout(f"- Entry ID {entry_id}")
-                        self._log_stdout(
-                            f"  Created : {datetime.fromtimestamp(creation_timestamp)}"
-                        )
-                        self._log_stdout(f"  Server IP : {server_ip}\n")
+            elif args.export_entries:
+                self._export_entries(access_token_manager, ACCESS_TOKEN_EXPORT_KEY_LIST)
+
+            elif args.import_entries:
+                self._import_entries(
+                    access_token_manager, ACCESS_TOKEN_EXPORT_KEY_LIST, args
+                )
 
             elif args.server_ip:
                 check_result = self._check_parameters_validity(args.server_ip)
@@ -1420,6 +3141,8 @@ please report it by opening an issue on the repository :
 
                     return -1
 
+                from .core.client import DEFAULT_SERVER_LISTEN_PORT
+
                 new_access_token = (
                     getpass(prompt="Paste the new token : ")
                     if not args.json
@@ -1514,6 +3237,8 @@ please report it by opening an issue on the repository :
         return 0
 
     def regen_rsa(self):
+        from .core.crypto import RSAWrapper, DEFAULT_RSA_KEY_SIZE
+
         parser = argparse.ArgumentParser(
             description="| Regenerate RSA keys",
             usage=f"{sys.argv[0]} regen-rsa [OPT]",
@@ -1541,7 +3266,15 @@ please report it by opening an issue on the repository :
         with open(self.config_content.get("public_rsa_key_file_path"), "w") as fd:
             fd.write(new_rsa_wrapper.getPublicKey().decode())
 
-        fingerprint = hashlib.sha256(new_rsa_wrapper.getPublicKey()).hexdigest()
+        rsa_keys_cache_file_path = (
+            self.config_content.get("private_rsa_key_file_path")
+            + RSA_KEYS_CACHE_FILE_SUFFIX
+        )
+
+        if os.path.exists(rsa_keys_cache_file_path):
+            os.remove(rsa_keys_cache_file_path)
+
+        fingerprint = new_rsa_wrapper.getFingerprint()
 
         if args.json:
             self._log_json(
@@ -1555,3 +3288,111 @@ please report it by opening an issue on the repository :
             self._log_stdout(f"  Fingerprint : {fingerprint}")
 
         return 0
+
+    def purge(self):
+        parser = argparse.ArgumentParser(
+            description="| Purge expired credentials and compact the databases",
+            usage=f"{sys.argv[0]} purge [OPT]",
+        )
+        parser.add_argument(
+            "--max-age",
+            help="purge the credentials older than this, in seconds (default is the configuration file value)",
+            dest="max_age",
+            metavar="SECONDS",
+            type=int,
+        )
+        parser.add_argument(
+            "--max-rows",
+            help="only keep this amount of credentials per server (default is the configuration file value)",
+            dest="max_rows_per_server",
+            metavar="ROWS",
+            type=int,
+        )
+        parser.add_argument(
+            "--enable-incremental-vacuum",
+            help="rebuild the databases created without incremental vacuum support",
+            action="store_true",
+        )
+        parser.add_argument(
+            "--json", help="print output in JSON format", action="store_true"
+        )
+        args = parser.parse_args(sys.argv[2:])
+
+        from .tools.credentials import (
+            SessionCredentialsManager,
+            ContainerCredentialsManager,
+        )
+
+        self.json = args.json
+
+        retention_policy = self._get_retention_policy()
+
+        if args.max_age is not None:
+            retention_policy["max_age"] = args.max_age
+
+        if args.max_rows_per_server is not None:
+            retention_policy["max_rows_per_server"] = args.max_rows_per_server
+
+        session_credentials_db_file_path = self.config_content.get(
+            "session_credentials_db_file_path"
+        )
+        container_credentials_db_file_path = self.config_content.get(
+            "container_credentials_db_file_path"
+        )
+
+        if not os.path.exists(session_credentials_db_file_path):
+            createFileRecursively(session_credentials_db_file_path)
+
+        if not os.path.exists(container_credentials_db_file_path):
+            createFileRecursively(container_credentials_db_file_path)
+
+        with SessionCredentialsManager(
+            session_credentials_db_file_path,
+            store=self._get_credentials_store(),
+            **retention_policy,
+        ) as session_credentials_manager, ContainerCredentialsManager(
+            container_credentials_db_file_path,
+            store=self._get_credentials_store(),
+            **retention_policy,
+        ) as container_credentials_manager:
+            purged_session_entries_amount = session_credentials_manager.purgeEntries()
+            purged_container_entries_amount = (
+                container_credentials_manager.purgeEntries()
+            )
+            freed_pages_amount = 0
+
+            # The two managers may share the same store
+            for store in {
+                session_credentials_manager.getStore(),
+                container_credentials_manager.getStore(),
+            }:
+                if not store.isIncrementalVacuumEnabled():
+                    if not args.enable_incremental_vacuum:
+                        continue
+
+                    store.enableIncrementalVacuum()
+
+                freed_pages_amount += store.incrementalVacuum()
+
+        if args.json:
+            self._log_json(
+                LOG_JSON_STATUS_SUCCESS,
+                "Credentials purged",
+                result={
+                    "purged_session_entries": purged_session_entries_amount,
+                    "purged_container_entries": purged_container_entries_amount,
+                    "freed_pages": freed_pages_amount,
+                },
+            )
+
+        else:
+            self._log_stdout("Credentials purged", color=Colors.GREEN)
+            self._log_stdout(
+                f"  Purged session entries : {purged_session_entries_amount}"
+            )
+            self._log_stdout(
+                f"  Purged container entries : {purged_container_entries_amount}"
+            )
+            self._log_stdout(f"  Freed pages : {freed_pages_amount}")
+
+        return 0
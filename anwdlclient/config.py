@@ -3,36 +3,425 @@ Copyright 2023 The Anweddol project
 See the LICENSE file for licensing informations
 ---
 
-This module provides the 'anwdlclient' CLI with configuration 
+This module provides the 'anwdlclient' CLI with configuration
 file management features.
 
+YAML and Cerberus are only imported when the content is loaded.
+
+The validated content is stored in a snapshot file next to the
+configuration file, and reused while the configuration file is not
+modified, so that YAML and Cerberus are not imported at all. If the
+configuration file folder is not writable, the snapshot file is stored
+in the user cache folder instead.
+
+Long-running processes can watch the configuration file : It is
+reloaded when modified (detected with inotify on Linux, or with
+periodic stat calls otherwise), and the new content is swapped in
+and passed to the registered callbacks if it is valid.
+
 """
 
-import cerberus
-import yaml
+import threading
+import hashlib
+import struct
+import select
+import json
+import time
+import os
+
+# Default parameters
+DEFAULT_USE_SNAPSHOT = True
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_RELOAD_DELAY = 0.1
+DEFAULT_USE_INOTIFY = True
+
+# Constants definition
+CONFIG_SNAPSHOT_FILE_SUFFIX = ".cache"
+CONFIG_SNAPSHOT_CACHE_FOLDER_NAME = "anweddol"
+CONFIG_SNAPSHOT_MAGIC = b"ANWDLCS1"
+
+# Magic, configuration file mtime / size, configuration file and schema SHA256 digests
+CONFIG_SNAPSHOT_HEADER_FORMAT = "<8sqq32s32s"
+
+# See the Cerberus docs : https://docs.python-cerberus.org/en/stable/usage.html
+CONFIG_VALIDATOR_SCHEMA = {
+    "session_credentials_db_file_path": {"type": "string", "required": True},
+    "container_credentials_db_file_path": {"type": "string", "required": True},
+    "access_token_db_file_path": {"type": "string", "required": True},
+    "credentials_store_db_file_path": {"type": "string", "required": False},
+    "credentials_max_age": {"type": "integer", "required": False, "min": 0},
+    "credentials_max_rows_per_server": {
+        "type": "integer",
+        "required": False,
+        "min": 0,
+    },
+    "public_rsa_key_file_path": {"type": "string", "required": True},
+    "private_rsa_key_file_path": {"type": "string", "required": True},
+    "enable_onetime_rsa_keys": {"type": "boolean", "required": True},
+}
+
+# inotify(7) events of the configuration file folder, the file may be replaced
+INOTIFY_EVENT_HEADER_FORMAT = "iIII"
+INOTIFY_WATCH_MASK = (
+    0x00000002  # IN_MODIFY
+    | 0x00000008  # IN_CLOSE_WRITE
+    | 0x00000040  # IN_MOVED_FROM
+    | 0x00000080  # IN_MOVED_TO
+    | 0x00000100  # IN_CREATE
+    | 0x00000200  # IN_DELETE
+)
+
+# A snapshot made with another schema is not reused
+CONFIG_VALIDATOR_SCHEMA_DIGEST = hashlib.sha256(
+    json.dumps(CONFIG_VALIDATOR_SCHEMA, sort_keys=True).encode()
+).digest()
+
+
+# Snapshot file of the user cache folder, named after the configuration file path
+def _get_fallback_snapshot_file_path(config_file_path: str) -> str:
+    cache_folder_path = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+
+    return os.path.join(
+        cache_folder_path,
+        CONFIG_SNAPSHOT_CACHE_FOLDER_NAME,
+        hashlib.sha256(os.fsencode(os.path.abspath(config_file_path))).hexdigest()
+        + CONFIG_SNAPSHOT_FILE_SUFFIX,
+    )
 
 
 class ConfigurationFileManager:
-    def __init__(self, config_file_path):
+    def __init__(self, config_file_path, use_snapshot: bool = DEFAULT_USE_SNAPSHOT):
         self.config_file_path = config_file_path
+        self.snapshot_file_path = config_file_path + CONFIG_SNAPSHOT_FILE_SUFFIX
+        self.fallback_snapshot_file_path = _get_fallback_snapshot_file_path(
+            config_file_path
+        )
+        self.is_snapshot_writable = True
+        self.use_snapshot = use_snapshot
+
+        self.config_content = None
+        self.last_errors = None
+        self.last_callback_errors = None
+        self.change_callback_list = []
+        self.reload_lock = threading.Lock()
+        self.watch_thread = None
+        self.watch_stop_event = threading.Event()
+
+    def getSnapshotFilePath(self) -> str:
+        return self.snapshot_file_path
+
+    # Used when the configuration file folder is not writable
+    def getFallbackSnapshotFilePath(self) -> str:
+        return self.fallback_snapshot_file_path
+
+    # The last valid content loaded by 'reloadContent'
+    def getContent(self) -> None | dict:
+        return self.config_content
+
+    def getLastErrors(self) -> None | dict:
+        return self.last_errors
+
+    def isWatching(self) -> bool:
+        return self.watch_thread is not None and self.watch_thread.is_alive()
+
+    # Callbacks are called with the previous and the new content
+    def addChangeCallback(self, callback) -> None:
+        self.change_callback_list.append(callback)
+
+    def removeChangeCallback(self, callback) -> None:
+        self.change_callback_list.remove(callback)
+
+    # Errors raised by the change callbacks on the last content change, they
+    # are reported apart from the loading errors since the content was swapped
+    def getLastCallbackErrors(self) -> None | list:
+        return self.last_callback_errors
+
+    # A failing callback does not prevent the next ones from being called
+    def _run_change_callbacks(self, previous_content: dict, content: dict) -> None:
+        callback_error_list = []
+
+        for callback in list(self.change_callback_list):
+            try:
+                callback(previous_content, content)
+
+            except Exception as E:
+                callback_error_list.append(
+                    {
+                        "callback": getattr(callback, "__qualname__", repr(callback)),
+                        "error": str(E),
+                    }
+                )
+
+        self.last_callback_errors = callback_error_list if callback_error_list else None
+
+    def _load_snapshot(self, snapshot_header: bytes) -> None | dict:
+        for snapshot_file_path in (
+            self.snapshot_file_path,
+            self.fallback_snapshot_file_path,
+        ):
+            try:
+                with open(snapshot_file_path, "rb") as fd:
+                    snapshot_content = fd.read()
+
+                if snapshot_content.startswith(snapshot_header):
+                    return json.loads(snapshot_content[len(snapshot_header) :])
+
+            except (OSError, ValueError):
+                pass
+
+        return None
+
+    def _write_snapshot_file(self, snapshot_file_path: str, content: bytes) -> bool:
+        tmp_snapshot_file_path = f"{snapshot_file_path}.{os.getpid()}.tmp"
+
+        try:
+            with open(tmp_snapshot_file_path, "wb") as fd:
+                fd.write(content)
+
+            os.replace(tmp_snapshot_file_path, snapshot_file_path)
+
+            return True
+
+        except OSError:
+            try:
+                os.remove(tmp_snapshot_file_path)
+
+            except OSError:
+                pass
+
+            return False
+
+    # The snapshot is only an optimization, the content is still valid without it
+    def _store_snapshot(self, snapshot_header: bytes, config_content: dict) -> None:
+        if not self.is_snapshot_writable:
+            return
+
+        content = (
+            snapshot_header + json.dumps(config_content, separators=(",", ":")).encode()
+        )
+
+        if self._write_snapshot_file(self.snapshot_file_path, content):
+            return
+
+        try:
+            os.makedirs(
+                os.path.dirname(self.fallback_snapshot_file_path),
+                mode=0o700,
+                exist_ok=True,
+            )
+
+        except OSError:
+            pass
+
+        # Not retried on the next reloads if the fallback is not writable either
+        if not self._write_snapshot_file(self.fallback_snapshot_file_path, content):
+            self.is_snapshot_writable = False
 
-    # See the Cerberus docs : https://docs.python-cerberus.org/en/stable/usage.html
     def loadContent(self, auto_check: bool = True) -> None | dict:
-        with open(self.config_file_path, "r") as fd:
-            data = yaml.safe_load(fd)
-
-        validator_schema_dict = {
-            "session_credentials_db_file_path": {"type": "string", "required": True},
-            "container_credentials_db_file_path": {"type": "string", "required": True},
-            "access_token_db_file_path": {"type": "string", "required": True},
-            "public_rsa_key_file_path": {"type": "string", "required": True},
-            "private_rsa_key_file_path": {"type": "string", "required": True},
-            "enable_onetime_rsa_keys": {"type": "boolean", "required": True},
-        }
+        with open(self.config_file_path, "rb") as fd:
+            config_file_stat = os.fstat(fd.fileno())
+            raw_config_content = fd.read()
+
+        snapshot_header = struct.pack(
+            CONFIG_SNAPSHOT_HEADER_FORMAT,
+            CONFIG_SNAPSHOT_MAGIC,
+            config_file_stat.st_mtime_ns,
+            config_file_stat.st_size,
+            hashlib.sha256(raw_config_content).digest(),
+            CONFIG_VALIDATOR_SCHEMA_DIGEST,
+        )
+
+        if self.use_snapshot:
+            config_content = self._load_snapshot(snapshot_header)
+
+            if config_content is not None:
+                return (True, config_content)
+
+        import cerberus
+        import yaml
+
+        data = yaml.safe_load(raw_config_content)
 
         validator = cerberus.Validator(purge_unknown=True)
 
-        if not validator.validate(data, validator_schema_dict):
+        if not validator.validate(data, CONFIG_VALIDATOR_SCHEMA):
             return (False, validator.errors)
 
+        if self.use_snapshot:
+            self._store_snapshot(snapshot_header, validator.document)
+
         return (True, validator.document)
+
+    # The content is only swapped if it is valid, the previous one is kept otherwise
+    def reloadContent(self) -> tuple:
+        with self.reload_lock:
+            is_content_valid, content = self.loadContent()
+
+            if not is_content_valid:
+                self.last_errors = content
+                return (False, content)
+
+            self.last_errors = None
+            previous_content = self.config_content
+
+            if content == previous_content:
+                return (True, content)
+
+            self.config_content = content
+
+        self._run_change_callbacks(previous_content, content)
+
+        return (True, content)
+
+    def _get_file_stat_key(self) -> None | tuple:
+        try:
+            config_file_stat = os.stat(self.config_file_path)
+
+        except OSError:
+            return None
+
+        return (
+            config_file_stat.st_ino,
+            config_file_stat.st_mtime_ns,
+            config_file_stat.st_size,
+        )
+
+    # Returns the inotify file descriptor, or None if not available
+    def _open_inotify(self) -> None | int:
+        try:
+            import ctypes
+
+            # The libc symbols are already loaded in the interpreter process
+            libc = ctypes.CDLL(None, use_errno=True)
+            inotify_fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+
+        except (OSError, AttributeError):
+            return None
+
+        if inotify_fd < 0:
+            return None
+
+        if (
+            libc.inotify_add_watch(
+                inotify_fd,
+                os.fsencode(os.path.dirname(os.path.abspath(self.config_file_path))),
+                INOTIFY_WATCH_MASK,
+            )
+            < 0
+        ):
+            os.close(inotify_fd)
+            return None
+
+        return inotify_fd
+
+    def _read_inotify_events(self, inotify_fd: int) -> bool:
+        config_file_name = os.fsencode(os.path.basename(self.config_file_path))
+        is_config_file_modified = False
+
+        while True:
+            try:
+                event_buffer = os.read(inotify_fd, 4096)
+
+            except BlockingIOError:
+                return is_config_file_modified
+
+            offset = 0
+            header_size = struct.calcsize(INOTIFY_EVENT_HEADER_FORMAT)
+
+            while offset < len(event_buffer):
+                _, _, _, name_length = struct.unpack_from(
+                    INOTIFY_EVENT_HEADER_FORMAT, event_buffer, offset
+                )
+                event_file_name = event_buffer[
+                    offset + header_size : offset + header_size + name_length
+                ].rstrip(b"\0")
+                offset += header_size + name_length
+
+                if event_file_name == config_file_name:
+                    is_config_file_modified = True
+
+    def _watch(
+        self,
+        inotify_fd: None | int,
+        last_file_stat_key: None | tuple,
+        poll_interval: float,
+        reload_delay: float,
+    ) -> None:
+        try:
+            while not self.watch_stop_event.is_set():
+                if inotify_fd is not None:
+                    if not select.select([inotify_fd], [], [], poll_interval)[0]:
+                        continue
+
+                    if not self._read_inotify_events(inotify_fd):
+                        continue
+
+                    # Lets the writer finish, and merges the following events
+                    time.sleep(reload_delay)
+                    self._read_inotify_events(inotify_fd)
+
+                else:
+                    if self.watch_stop_event.wait(poll_interval):
+                        break
+
+                file_stat_key = self._get_file_stat_key()
+
+                if file_stat_key is None or file_stat_key == last_file_stat_key:
+                    continue
+
+                last_file_stat_key = file_stat_key
+
+                try:
+                    self.reloadContent()
+
+                # Keeps watching with the previous content. The callbacks errors
+                # are not caught here, see the 'getLastCallbackErrors' method
+                except Exception as E:
+                    self.last_errors = {"error": str(E)}
+
+        finally:
+            if inotify_fd is not None:
+                os.close(inotify_fd)
+
+    def startWatching(
+        self,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        reload_delay: float = DEFAULT_RELOAD_DELAY,
+        use_inotify: bool = DEFAULT_USE_INOTIFY,
+    ) -> tuple:
+        if self.isWatching():
+            raise RuntimeError("The configuration file is already watched")
+
+        # Modifications made from now on are not missed
+        inotify_fd = self._open_inotify() if use_inotify else None
+        file_stat_key = self._get_file_stat_key()
+
+        if self.config_content is None:
+            is_content_valid, content = self.reloadContent()
+
+            if not is_content_valid:
+                if inotify_fd is not None:
+                    os.close(inotify_fd)
+
+                return (False, content)
+
+        self.watch_stop_event.clear()
+        self.watch_thread = threading.Thread(
+            target=self._watch,
+            args=(inotify_fd, file_stat_key, poll_interval, reload_delay),
+            name="anwdlclient-config-watch",
+            daemon=True,
+        )
+        self.watch_thread.start()
+
+        return (True, self.config_content)
+
+    def stopWatching(self) -> None:
+        if not self.watch_thread:
+            return
+
+        self.watch_stop_event.set()
+        self.watch_thread.join()
+        self.watch_thread = None
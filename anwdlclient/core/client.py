@@ -14,7 +14,7 @@ import socket
 import json
 import os
 
-from .crypto import RSAWrapper, AESWrapper
+from .crypto import RSAWrapper, AESWrapper, CryptoExecutor
 from .sanitization import makeRequest, verifyResponseContent
 from .utilities import isSocketClosed
 
@@ -50,8 +50,15 @@ class ClientInterface:
         timeout: Union[None, int] = DEFAULT_CLIENT_TIMEOUT,
         rsa_wrapper: RSAWrapper = None,
         aes_wrapper: AESWrapper = None,
+        crypto_executor: CryptoExecutor = None,
     ):
-        self.rsa_wrapper = rsa_wrapper if rsa_wrapper else RSAWrapper()
+        self.rsa_wrapper = (
+            rsa_wrapper if rsa_wrapper else RSAWrapper(crypto_executor=crypto_executor)
+        )
+
+        # The executor also applies to a specified RSA wrapper
+        if rsa_wrapper and crypto_executor:
+            self.rsa_wrapper.setCryptoExecutor(crypto_executor)
         self.aes_wrapper = aes_wrapper if aes_wrapper else AESWrapper()
         self.socket = None
 
@@ -99,11 +106,13 @@ class ClientInterface:
             raise RuntimeError("Connection is already active")
 
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.socket.connect((self.server_ip, self.server_listen_port))
 
+        # The timeout also applies to the connection
         if self.timeout:
             self.socket.settimeout(self.timeout)
 
+        self.socket.connect((self.server_ip, self.server_listen_port))
+
         if receive_first:
             self.recvPublicRSAKey()
             self.sendPublicRSAKey()
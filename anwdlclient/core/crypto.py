@@ -9,16 +9,29 @@ There is 2 provided encryption algorithms :
  - RSA 4096 ;
  - AES 256 CBC ;
 
+It also provides identity keys for signing and fingerprinting purposes,
+which can either be RSA or Ed25519 keys.
+
+CPU-bound RSA operations can be offloaded to a dedicated thread or
+process pool with the CryptoExecutor class, so that they don't stall
+network I/O when several handshakes are made concurrently.
+
 """
 
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 import cryptography.hazmat.primitives.padding as symetric_padding
 from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.hazmat.primitives.asymmetric import rsa
 from cryptography.hazmat.primitives import serialization
 from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import hashes
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from collections import OrderedDict
 from typing import Union
+import functools
+import threading
+import hashlib
 import os
 
 
@@ -31,6 +44,216 @@ DEFAULT_PEM_FORMAT = True
 DEFAULT_GENERATE_KEY_PAIR = True
 DEFAULT_DERIVATE_PUBLIC_KEY = False
 
+DEFAULT_USE_PROCESSES = False
+DEFAULT_MAX_WORKERS = None
+DEFAULT_SHUTDOWN_WAIT = True
+
+
+# Constants definition
+IDENTITY_KEY_TYPE_RSA = "rsa"
+IDENTITY_KEY_TYPE_ED25519 = "ed25519"
+
+DEFAULT_IDENTITY_KEY_TYPE = IDENTITY_KEY_TYPE_ED25519
+
+# Number of serialized keys kept by a process based CryptoExecutor
+SERIALIZED_KEYS_CACHE_SIZE = 64
+
+
+def _get_oaep_padding() -> padding.OAEP:
+    return padding.OAEP(
+        mgf=padding.MGF1(algorithm=hashes.SHA256()),
+        algorithm=hashes.SHA256(),
+        label=None,
+    )
+
+
+# The functions below are executed by the CryptoExecutor workers.
+# They are defined at module level so that they can be pickled : With process
+# based executors, keys are passed as DER byte sequences, since key objects
+# can't be sent to another process. Loaded keys are cached in each worker.
+@functools.lru_cache(maxsize=SERIALIZED_KEYS_CACHE_SIZE)
+def _load_der_private_key(der_private_key: bytes) -> rsa.RSAPrivateKey:
+    return serialization.load_der_private_key(der_private_key, password=None)
+
+
+@functools.lru_cache(maxsize=SERIALIZED_KEYS_CACHE_SIZE)
+def _load_der_public_key(der_public_key: bytes) -> rsa.RSAPublicKey:
+    return serialization.load_der_public_key(der_public_key)
+
+
+def _offload_rsa_key_generation(
+    public_exponent: int, key_size: int, serialize: bool
+) -> Union[bytes, rsa.RSAPrivateKey]:
+    private_key = rsa.generate_private_key(
+        public_exponent=public_exponent, key_size=key_size
+    )
+
+    return (
+        private_key.private_bytes(
+            encoding=serialization.Encoding.DER,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+        if serialize
+        else private_key
+    )
+
+
+def _offload_rsa_encryption(
+    public_key: Union[bytes, rsa.RSAPublicKey], data: bytes
+) -> bytes:
+    if type(public_key) is bytes:
+        public_key = _load_der_public_key(public_key)
+
+    return public_key.encrypt(data, _get_oaep_padding())
+
+
+def _offload_rsa_decryption(
+    private_key: Union[bytes, rsa.RSAPrivateKey], cipher: bytes
+) -> bytes:
+    if type(private_key) is bytes:
+        private_key = _load_der_private_key(private_key)
+
+    return private_key.decrypt(cipher, _get_oaep_padding())
+
+
+class CryptoExecutor:
+    def __init__(
+        self,
+        use_processes: bool = DEFAULT_USE_PROCESSES,
+        max_workers: Union[None, int] = DEFAULT_MAX_WORKERS,
+    ):
+        self.use_processes = use_processes
+        self.max_workers = max_workers if max_workers else self._get_cpu_count()
+        self.executor = (
+            ProcessPoolExecutor(max_workers=self.max_workers)
+            if use_processes
+            else ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="anwdlcrypto"
+            )
+        )
+        self.serialized_keys = OrderedDict()
+        self.serialized_keys_lock = threading.Lock()
+        self.is_closed = False
+
+    def __del__(self):
+        if not self.isClosed():
+            self.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        if not self.isClosed():
+            self.shutdown()
+
+    # Only count the cores that the process is allowed to run on, if possible
+    def _get_cpu_count(self) -> int:
+        if hasattr(os, "sched_getaffinity"):
+            return len(os.sched_getaffinity(0))
+
+        return os.cpu_count() or 1
+
+    # Key objects are serialized once and kept in a bounded cache, with
+    # a reference on the key object itself so that its id can't be reused
+    def _serialize_key(
+        self, key: Union[rsa.RSAPrivateKey, rsa.RSAPublicKey]
+    ) -> bytes:
+        with self.serialized_keys_lock:
+            cached_entry = self.serialized_keys.get(id(key))
+
+            if cached_entry:
+                self.serialized_keys.move_to_end(id(key))
+                return cached_entry[1]
+
+        serialized_key = (
+            key.private_bytes(
+                encoding=serialization.Encoding.DER,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption(),
+            )
+            if isinstance(key, rsa.RSAPrivateKey)
+            else key.public_bytes(
+                encoding=serialization.Encoding.DER,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+        )
+
+        with self.serialized_keys_lock:
+            self.serialized_keys[id(key)] = (key, serialized_key)
+
+            if len(self.serialized_keys) > SERIALIZED_KEYS_CACHE_SIZE:
+                self.serialized_keys.popitem(last=False)
+
+        return serialized_key
+
+    def _submit(self, function, *args) -> Future:
+        if self.isClosed():
+            raise RuntimeError("Crypto executor is shut down")
+
+        return self.executor.submit(function, *args)
+
+    def isClosed(self) -> bool:
+        return self.is_closed
+
+    def isProcessBased(self) -> bool:
+        return self.use_processes
+
+    def getMaxWorkers(self) -> int:
+        return self.max_workers
+
+    # The returned future resolves to a private key object in both modes
+    def generateRSAPrivateKey(
+        self,
+        public_exponent: int = DEFAULT_RSA_EXPONENT,
+        key_size: int = DEFAULT_RSA_KEY_SIZE,
+    ) -> Future:
+        worker_future = self._submit(
+            _offload_rsa_key_generation, public_exponent, key_size, self.use_processes
+        )
+
+        if not self.use_processes:
+            return worker_future
+
+        result_future = Future()
+
+        def _on_key_generated(completed_future):
+            try:
+                result_future.set_result(
+                    serialization.load_der_private_key(
+                        completed_future.result(), password=None
+                    )
+                )
+
+            except Exception as E:
+                result_future.set_exception(E)
+
+        worker_future.add_done_callback(_on_key_generated)
+
+        return result_future
+
+    def encryptRSA(self, public_key: rsa.RSAPublicKey, data: bytes) -> Future:
+        return self._submit(
+            _offload_rsa_encryption,
+            self._serialize_key(public_key) if self.use_processes else public_key,
+            data,
+        )
+
+    def decryptRSA(self, private_key: rsa.RSAPrivateKey, cipher: bytes) -> Future:
+        return self._submit(
+            _offload_rsa_decryption,
+            self._serialize_key(private_key) if self.use_processes else private_key,
+            cipher,
+        )
+
+    def shutdown(self, wait: bool = DEFAULT_SHUTDOWN_WAIT) -> None:
+        self.executor.shutdown(wait=wait)
+
+        with self.serialized_keys_lock:
+            self.serialized_keys.clear()
+
+        self.is_closed = True
+
 
 class RSAWrapper:
     def __init__(
@@ -38,27 +261,76 @@ class RSAWrapper:
         public_exponent: int = DEFAULT_RSA_EXPONENT,
         key_size: int = DEFAULT_RSA_KEY_SIZE,
         generate_key_pair: bool = DEFAULT_GENERATE_KEY_PAIR,
+        crypto_executor: CryptoExecutor = None,
     ):
         self.remote_public_key = None
         self.private_key = None
         self.public_key = None
+        self.crypto_executor = crypto_executor
 
         if generate_key_pair:
             self.generateKeyPair(public_exponent, key_size)
 
+    def getCryptoExecutor(self) -> Union[None, CryptoExecutor]:
+        return self.crypto_executor
+
+    def setCryptoExecutor(self, crypto_executor: Union[None, CryptoExecutor]) -> None:
+        self.crypto_executor = crypto_executor
+
     def generateKeyPair(
         self,
         public_exponent: int = DEFAULT_RSA_EXPONENT,
         key_size: int = DEFAULT_RSA_KEY_SIZE,
     ) -> None:
-        self.private_key = rsa.generate_private_key(
-            public_exponent=public_exponent, key_size=key_size
+        self.private_key = (
+            self.crypto_executor.generateRSAPrivateKey(
+                public_exponent, key_size
+            ).result()
+            if self.crypto_executor
+            else rsa.generate_private_key(
+                public_exponent=public_exponent, key_size=key_size
+            )
         )
         self.public_key = self.private_key.public_key()
 
+    # Awaitable version of generateKeyPair : the key is generated on the crypto
+    # executor if set, on the event loop default executor otherwise
+    async def generateKeyPairAsync(
+        self,
+        public_exponent: int = DEFAULT_RSA_EXPONENT,
+        key_size: int = DEFAULT_RSA_KEY_SIZE,
+    ) -> None:
+        import asyncio
+
+        if self.crypto_executor:
+            self.private_key = await asyncio.wrap_future(
+                self.crypto_executor.generateRSAPrivateKey(public_exponent, key_size)
+            )
+
+        else:
+            self.private_key = await asyncio.get_running_loop().run_in_executor(
+                None,
+                functools.partial(
+                    rsa.generate_private_key,
+                    public_exponent=public_exponent,
+                    key_size=key_size,
+                ),
+            )
+
+        self.public_key = self.private_key.public_key()
+
+    def getKeyType(self) -> str:
+        return IDENTITY_KEY_TYPE_RSA
+
     def getKeySize(self) -> Union[None, int]:
         return self.public_key.key_size if self.public_key else None
 
+    # The fingerprint is the SHA256 digest of the PEM formatted public key
+    def getFingerprint(self) -> Union[None, str]:
+        return (
+            hashlib.sha256(self.getPublicKey()).hexdigest() if self.public_key else None
+        )
+
     def getPublicKey(
         self, pem_format: bool = DEFAULT_PEM_FORMAT
     ) -> Union[None, str, bytes]:
@@ -112,11 +384,7 @@ class RSAWrapper:
         self.private_key = (
             serialization.load_pem_private_key(private_key, password=None)
             if pem_format
-            else private_key.private_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PrivateFormat.PKCS8,
-                encryption_algorithm=serialization.NoEncryption(),
-            )
+            else private_key
         )
 
         if derivate_public_key:
@@ -144,24 +412,38 @@ class RSAWrapper:
                 raise ValueError("Local public key is not set")
 
         encoded_data = data.encode() if type(data) is str else data
+        encryption_key = (
+            self.remote_public_key if not use_local_public_key else self.public_key
+        )
 
-        return (
-            self.remote_public_key.encrypt(
-                encoded_data,
-                padding.OAEP(
-                    mgf=padding.MGF1(algorithm=hashes.SHA256()),
-                    algorithm=hashes.SHA256(),
-                    label=None,
-                ),
+        if self.crypto_executor:
+            return self.crypto_executor.encryptRSA(
+                encryption_key, encoded_data
+            ).result()
+
+        return encryption_key.encrypt(encoded_data, _get_oaep_padding())
+
+    async def encryptDataAsync(
+        self, data: Union[str, bytes], use_local_public_key: bool = False
+    ) -> bytes:
+        import asyncio
+
+        if not self.crypto_executor:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self.encryptData, data, use_local_public_key
             )
-            if not use_local_public_key
-            else self.public_key.encrypt(
-                encoded_data,
-                padding.OAEP(
-                    mgf=padding.MGF1(algorithm=hashes.SHA256()),
-                    algorithm=hashes.SHA256(),
-                    label=None,
-                ),
+
+        if not self.remote_public_key and not use_local_public_key:
+            raise ValueError("Remote public key is not set")
+
+        else:
+            if not self.public_key:
+                raise ValueError("Local public key is not set")
+
+        return await asyncio.wrap_future(
+            self.crypto_executor.encryptRSA(
+                self.remote_public_key if not use_local_public_key else self.public_key,
+                data.encode() if type(data) is str else data,
             )
         )
 
@@ -169,13 +451,29 @@ class RSAWrapper:
         if not self.private_key:
             raise ValueError("Local private key is not set")
 
-        decrypted_data = self.private_key.decrypt(
-            cipher,
-            padding.OAEP(
-                mgf=padding.MGF1(algorithm=hashes.SHA256()),
-                algorithm=hashes.SHA256(),
-                label=None,
-            ),
+        decrypted_data = (
+            self.crypto_executor.decryptRSA(self.private_key, cipher).result()
+            if self.crypto_executor
+            else self.private_key.decrypt(cipher, _get_oaep_padding())
+        )
+
+        return decrypted_data.decode() if decode else decrypted_data
+
+    async def decryptDataAsync(
+        self, cipher: bytes, decode: bool = True
+    ) -> Union[str, bytes]:
+        import asyncio
+
+        if not self.crypto_executor:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self.decryptData, cipher, decode
+            )
+
+        if not self.private_key:
+            raise ValueError("Local private key is not set")
+
+        decrypted_data = await asyncio.wrap_future(
+            self.crypto_executor.decryptRSA(self.private_key, cipher)
         )
 
         return decrypted_data.decode() if decode else decrypted_data
@@ -218,6 +516,127 @@ class RSAWrapper:
             return False
 
 
+# Ed25519 keys can only be used for signing : The RSAWrapper
+# is still needed for the key exchange during the handshake
+class Ed25519Wrapper:
+    def __init__(self, generate_key_pair: bool = DEFAULT_GENERATE_KEY_PAIR):
+        self.private_key = None
+        self.public_key = None
+
+        if generate_key_pair:
+            self.generateKeyPair()
+
+    def generateKeyPair(self) -> None:
+        self.private_key = ed25519.Ed25519PrivateKey.generate()
+        self.public_key = self.private_key.public_key()
+
+    def getKeyType(self) -> str:
+        return IDENTITY_KEY_TYPE_ED25519
+
+    # Ed25519 keys have a fixed size of 256 bits
+    def getKeySize(self) -> Union[None, int]:
+        return 256 if self.public_key else None
+
+    def getFingerprint(self) -> Union[None, str]:
+        return (
+            hashlib.sha256(self.getPublicKey()).hexdigest() if self.public_key else None
+        )
+
+    def getPublicKey(
+        self, pem_format: bool = DEFAULT_PEM_FORMAT
+    ) -> Union[None, str, bytes]:
+        return (
+            self.public_key.public_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+            if pem_format and self.public_key
+            else self.public_key
+        )
+
+    def getPrivateKey(
+        self, pem_format: bool = DEFAULT_PEM_FORMAT
+    ) -> Union[None, str, bytes]:
+        return (
+            self.private_key.private_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption(),
+            )
+            if pem_format and self.private_key
+            else self.private_key
+        )
+
+    def setPublicKey(
+        self, public_key: Union[str, bytes], pem_format: bool = DEFAULT_PEM_FORMAT
+    ) -> None:
+        loaded_public_key = (
+            serialization.load_pem_public_key(public_key) if pem_format else public_key
+        )
+
+        if not isinstance(loaded_public_key, ed25519.Ed25519PublicKey):
+            raise ValueError("Specified public key is not an Ed25519 key")
+
+        self.public_key = loaded_public_key
+
+    def setPrivateKey(
+        self,
+        private_key: Union[str, bytes],
+        pem_format: bool = DEFAULT_PEM_FORMAT,
+        derivate_public_key: bool = DEFAULT_DERIVATE_PUBLIC_KEY,
+    ) -> None:
+        loaded_private_key = (
+            serialization.load_pem_private_key(private_key, password=None)
+            if pem_format
+            else private_key
+        )
+
+        if not isinstance(loaded_private_key, ed25519.Ed25519PrivateKey):
+            raise ValueError("Specified private key is not an Ed25519 key")
+
+        self.private_key = loaded_private_key
+
+        if derivate_public_key:
+            self.public_key = self.private_key.public_key()
+
+    def signData(self, data: Union[str, bytes]) -> bytes:
+        if not self.private_key:
+            raise ValueError("Local private key is not set")
+
+        encoded_data = data.encode() if type(data) is str else data
+
+        return self.private_key.sign(encoded_data)
+
+    # `signature` is the signed data, `data` is the data itself
+    def verifyDataSignature(self, signature: bytes, data: Union[str, bytes]) -> bool:
+        if not self.public_key:
+            raise ValueError("Local public key is not set")
+
+        encoded_data = data.encode() if type(data) is str else data
+
+        try:
+            self.public_key.verify(signature, encoded_data)
+
+            return True
+
+        except InvalidSignature:
+            return False
+
+
+def createIdentityKeyWrapper(
+    key_type: str = DEFAULT_IDENTITY_KEY_TYPE,
+    generate_key_pair: bool = DEFAULT_GENERATE_KEY_PAIR,
+    key_size: int = DEFAULT_RSA_KEY_SIZE,
+) -> Union[RSAWrapper, Ed25519Wrapper]:
+    if key_type == IDENTITY_KEY_TYPE_ED25519:
+        return Ed25519Wrapper(generate_key_pair=generate_key_pair)
+
+    if key_type == IDENTITY_KEY_TYPE_RSA:
+        return RSAWrapper(key_size=key_size, generate_key_pair=generate_key_pair)
+
+    raise ValueError(f"Unknown identity key type : {key_type}")
+
+
 class AESWrapper:
     def __init__(self, key_size: int = DEFAULT_AES_KEY_SIZE):
         self.key = os.urandom(int(key_size / 8))
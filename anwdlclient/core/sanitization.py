@@ -3,160 +3,270 @@ Copyright 2023 The Anweddol project
 See the LICENSE file for licensing informations
 ---
 
-This module provides the Anweddol client with normalized 
+This module provides the Anweddol client with normalized
 request / response values and formats verification features.
 
-"""
+The verification schemes are compiled once into plain validation
+functions, which are used as a fast path : Cerberus is only used
+when a document is invalid, to report the detailed errors.
 
-import cerberus
+"""
 
+import re
 
-def verifyResponseContent(response_dict: dict) -> tuple:
-    validator = cerberus.Validator()
-    validator.allow_unknown = True
 
-    response_verification_scheme = {
-        "success": {
-            "type": "boolean",
-            "required": True,
-        },
-        "message": {
-            "type": "string",
-            "required": True,
+# Constants definition
+RESPONSE_VERIFICATION_SCHEME = {
+    "success": {
+        "type": "boolean",
+        "required": True,
+    },
+    "message": {
+        "type": "string",
+        "required": True,
+    },
+    "data": {
+        "type": "dict",
+        "required": True,
+        "schema": {
+            "container_uuid": {
+                "type": "string",
+                "regex": r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$",
+                "required": False,
+                "dependencies": [
+                    "client_token",
+                    "container_iso_sha256",
+                    "container_username",
+                    "container_password",
+                    "container_listen_port",
+                ],
+            },
+            "client_token": {
+                "type": "string",
+                "regex": r"^[0-9a-zA-Z-_]{255}$",
+                "required": False,
+                "dependencies": [
+                    "container_uuid",
+                    "container_iso_sha256",
+                    "container_username",
+                    "container_password",
+                    "container_listen_port",
+                ],
+            },
+            "container_iso_sha256": {
+                "type": "string",
+                "regex": r"^[a-f0-9]{64}$",
+                "required": False,
+                "dependencies": [
+                    "container_uuid",
+                    "client_token",
+                    "container_username",
+                    "container_password",
+                    "container_listen_port",
+                ],
+            },
+            "container_username": {
+                "type": "string",
+                "regex": r"^user_[0-9]{5}$",
+                "required": False,
+                "dependencies": [
+                    "container_uuid",
+                    "client_token",
+                    "container_iso_sha256",
+                    "container_password",
+                    "container_listen_port",
+                ],
+            },
+            "container_password": {
+                "type": "string",
+                "regex": r"^[a-zA-Z0-9]{1,}$",
+                "required": False,
+                "dependencies": [
+                    "container_uuid",
+                    "client_token",
+                    "container_iso_sha256",
+                    "container_username",
+                    "container_listen_port",
+                ],
+            },
+            "container_listen_port": {
+                "type": "integer",
+                "required": False,
+                "min": 1,
+                "max": 65535,
+                "dependencies": [
+                    "container_uuid",
+                    "client_token",
+                    "container_iso_sha256",
+                    "container_username",
+                    "container_password",
+                ],
+            },
+            "uptime": {
+                "type": "integer",
+                "required": False,
+                "dependencies": ["version"],
+                "min": 0,
+            },
+            "version": {
+                "type": "string",
+                "required": False,
+                "dependencies": ["uptime"],
+            },
         },
-        "data": {
-            "type": "dict",
-            "required": True,
-            "schema": {
-                "container_uuid": {
-                    "type": "string",
-                    "regex": r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$",
-                    "required": False,
-                    "dependencies": [
-                        "client_token",
-                        "container_iso_sha256",
-                        "container_username",
-                        "container_password",
-                        "container_listen_port",
-                    ],
-                },
-                "client_token": {
-                    "type": "string",
-                    "regex": r"^[0-9a-zA-Z-_]{255}$",
-                    "required": False,
-                    "dependencies": [
-                        "container_uuid",
-                        "container_iso_sha256",
-                        "container_username",
-                        "container_password",
-                        "container_listen_port",
-                    ],
-                },
-                "container_iso_sha256": {
-                    "type": "string",
-                    "regex": r"^[a-f0-9]{64}$",
-                    "required": False,
-                    "dependencies": [
-                        "container_uuid",
-                        "client_token",
-                        "container_username",
-                        "container_password",
-                        "container_listen_port",
-                    ],
-                },
-                "container_username": {
-                    "type": "string",
-                    "regex": r"^user_[0-9]{5}$",
-                    "required": False,
-                    "dependencies": [
-                        "container_uuid",
-                        "client_token",
-                        "container_iso_sha256",
-                        "container_password",
-                        "container_listen_port",
-                    ],
-                },
-                "container_password": {
-                    "type": "string",
-                    "regex": r"^[a-zA-Z0-9]{1,}$",
-                    "required": False,
-                    "dependencies": [
-                        "container_uuid",
-                        "client_token",
-                        "container_iso_sha256",
-                        "container_username",
-                        "container_listen_port",
-                    ],
-                },
-                "container_listen_port": {
-                    "type": "integer",
-                    "required": False,
-                    "min": 1,
-                    "max": 65535,
-                    "dependencies": [
-                        "container_uuid",
-                        "client_token",
-                        "container_iso_sha256",
-                        "container_username",
-                        "container_password",
-                    ],
-                },
-                "uptime": {
-                    "type": "integer",
-                    "required": False,
-                    "dependencies": ["version"],
-                    "min": 0,
-                },
-                "version": {
-                    "type": "string",
-                    "required": False,
-                    "dependencies": ["uptime"],
-                },
+    },
+}
+
+REQUEST_VERIFICATION_SCHEME = {
+    "verb": {
+        "type": "string",
+        "regex": r"^[A-Z]{1,}$",
+        "required": True,
+    },
+    "parameters": {
+        "type": "dict",
+        "required": True,
+        "schema": {
+            "container_uuid": {
+                "type": "string",
+                "regex": r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$",
+                "required": False,
+                "dependencies": ["client_token"],
+            },
+            "client_token": {
+                "type": "string",
+                "regex": r"^[0-9a-zA-Z-_]{255}$",
+                "required": False,
+                "dependencies": ["container_uuid"],
             },
         },
-    }
+    },
+}
 
-    return (
-        validator.validate(response_dict, response_verification_scheme),
-        validator.document if validator.document else None,
-        validator.errors if validator.errors else None,
+# Strict type checks : values that Cerberus may still accept
+# (like booleans for integers) are left to the Cerberus fallback
+TYPE_CHECKS = {
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: type(value) is int,
+    "boolean": lambda value: type(value) is bool,
+    "dict": lambda value: isinstance(value, dict),
+}
+
+
+def _compile_rules(rules: dict):
+    value_checks = []
+
+    for rule_name, rule_value in rules.items():
+        if rule_name in ("required", "dependencies"):
+            continue
+
+        if rule_name == "type":
+            value_checks.append(TYPE_CHECKS[rule_value])
+
+        # Cerberus appends a '$' to the pattern if needed, and uses `re.match`
+        elif rule_name == "regex":
+            compiled_regex = re.compile(
+                rule_value if rule_value.endswith("$") else rule_value + "$"
+            )
+            value_checks.append(
+                lambda value, compiled_regex=compiled_regex: isinstance(value, str)
+                and compiled_regex.match(value) is not None
+            )
+
+        elif rule_name == "min":
+            value_checks.append(
+                lambda value, minimum=rule_value: type(value) is int
+                and value >= minimum
+            )
+
+        elif rule_name == "max":
+            value_checks.append(
+                lambda value, maximum=rule_value: type(value) is int
+                and value <= maximum
+            )
+
+        elif rule_name == "schema":
+            value_checks.append(_compile_scheme(rule_value))
+
+        else:
+            raise ValueError(f"Unsupported verification rule : {rule_name}")
+
+    return tuple(value_checks)
+
+
+# Unknown keys are allowed, like with the Cerberus `allow_unknown` option
+def _compile_scheme(scheme: dict):
+    field_checks = tuple(
+        (
+            field_name,
+            rules.get("required", False),
+            _compile_rules(rules),
+            tuple(rules.get("dependencies", ())),
+        )
+        for field_name, rules in scheme.items()
     )
 
+    def _validate(document) -> bool:
+        if not isinstance(document, dict):
+            return False
 
-def makeRequest(verb: str, parameters: dict = {}) -> tuple:
-    request_dict = {"verb": verb, "parameters": parameters}
+        for field_name, is_required, value_checks, dependencies in field_checks:
+            if field_name not in document:
+                if is_required:
+                    return False
 
-    validator = cerberus.Validator()
-    validator.allow_unknown = True
+                continue
 
-    request_verification_scheme = {
-        "verb": {
-            "type": "string",
-            "regex": r"^[A-Z]{1,}$",
-            "required": True,
-        },
-        "parameters": {
-            "type": "dict",
-            "required": True,
-            "schema": {
-                "container_uuid": {
-                    "type": "string",
-                    "regex": r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$",
-                    "required": False,
-                    "dependencies": ["client_token"],
-                },
-                "client_token": {
-                    "type": "string",
-                    "regex": r"^[0-9a-zA-Z-_]{255}$",
-                    "required": False,
-                    "dependencies": ["container_uuid"],
-                },
-            },
-        },
+            value = document[field_name]
+
+            for value_check in value_checks:
+                if not value_check(value):
+                    return False
+
+            for dependency in dependencies:
+                if dependency not in document:
+                    return False
+
+        return True
+
+    return _validate
+
+
+# Cerberus returns a normalized copy of the document
+def _copy_document(document: dict) -> dict:
+    return {
+        key: dict(value) if isinstance(value, dict) else value
+        for key, value in document.items()
     }
 
+
+def _validate_with_cerberus(document, scheme: dict) -> tuple:
+    import cerberus
+
+    validator = cerberus.Validator(scheme, allow_unknown=True)
+
     return (
-        validator.validate(request_dict, request_verification_scheme),
+        validator.validate(document),
         validator.document if validator.document else None,
         validator.errors if validator.errors else None,
     )
+
+
+_is_response_valid = _compile_scheme(RESPONSE_VERIFICATION_SCHEME)
+_is_request_valid = _compile_scheme(REQUEST_VERIFICATION_SCHEME)
+
+
+def verifyResponseContent(response_dict: dict) -> tuple:
+    if _is_response_valid(response_dict):
+        return (True, _copy_document(response_dict), None)
+
+    return _validate_with_cerberus(response_dict, RESPONSE_VERIFICATION_SCHEME)
+
+
+def makeRequest(verb: str, parameters: dict = {}) -> tuple:
+    request_dict = {"verb": verb, "parameters": parameters}
+
+    if _is_request_valid(request_dict):
+        return (True, _copy_document(request_dict), None)
+
+    return _validate_with_cerberus(request_dict, REQUEST_VERIFICATION_SCHEME)
@@ -10,10 +10,23 @@ please considerate this function when implementing a new experimental feature
 
 """
 
+import selectors
 import socket
+import errno
+import time
 import re
 
 
+# Default parameters
+DEFAULT_SSH_READY_TIMEOUT = 60
+DEFAULT_SSH_READY_RETRY_DELAY = 0.1
+DEFAULT_SSH_READY_MAX_RETRY_DELAY = 1
+
+# Constants definition
+SSH_BANNER_PREFIX = b"SSH-"
+SSH_BANNER_MAX_LENGTH = 8192
+
+
 def isPortBindable(port):
     sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
@@ -42,3 +55,77 @@ def isValidIP(ip: str) -> bool:
 
     except Exception:
         return False
+
+
+# Waits for 'event' on the socket until the deadline, returns False if it passed
+def _wait_socket_event(sock: socket.socket, event: int, deadline: float) -> bool:
+    with selectors.DefaultSelector() as selector:
+        selector.register(sock, event)
+
+        return bool(selector.select(max(deadline - time.monotonic(), 0)))
+
+
+def _probe_ssh_banner(server_ip: str, port: int, deadline: float) -> bool:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.setblocking(False)
+
+        if sock.connect_ex((server_ip, port)) not in [
+            0,
+            errno.EINPROGRESS,
+            errno.EWOULDBLOCK,
+        ]:
+            return False
+
+        if not _wait_socket_event(sock, selectors.EVENT_WRITE, deadline):
+            return False
+
+        if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR):
+            return False
+
+        # The server can send other lines before its version line
+        banner = b""
+
+        while len(banner) < SSH_BANNER_MAX_LENGTH:
+            if not _wait_socket_event(sock, selectors.EVENT_READ, deadline):
+                return False
+
+            try:
+                received_data = sock.recv(1024)
+
+            except OSError:
+                return False
+
+            if not received_data:
+                return False
+
+            banner += received_data
+
+            if banner.startswith(SSH_BANNER_PREFIX) or (
+                b"\n" + SSH_BANNER_PREFIX in banner
+            ):
+                return True
+
+        return False
+
+
+# A port accepting connections is not enough, the SSH server must send its banner
+def waitSSHReady(
+    server_ip: str,
+    port: int,
+    timeout: float = DEFAULT_SSH_READY_TIMEOUT,
+    retry_delay: float = DEFAULT_SSH_READY_RETRY_DELAY,
+    max_retry_delay: float = DEFAULT_SSH_READY_MAX_RETRY_DELAY,
+) -> bool:
+    deadline = time.monotonic() + timeout
+
+    while True:
+        if _probe_ssh_banner(server_ip, port, deadline):
+            return True
+
+        remaining_time = deadline - time.monotonic()
+
+        if remaining_time <= 0:
+            return False
+
+        time.sleep(min(retry_delay, remaining_time))
+        retry_delay = min(retry_delay * 2, max_retry_delay)
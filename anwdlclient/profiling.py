@@ -0,0 +1,204 @@
+"""
+Copyright 2023 The Anweddol project
+See the LICENSE file for licensing informations
+---
+
+This module provides the 'anwdlclient' CLI with a profiling mode,
+measuring the wall-clock time spent in each stage of a command.
+
+Stages can be nested, and are aggregated by path : A stage run several
+times (or from several threads) is reported once, with its calls amount.
+
+"""
+
+from contextlib import contextmanager
+import functools
+import threading
+import time
+
+
+class StageProfiler:
+    def __init__(
+        self,
+        start_time: None | float = None,
+        cprofile_dump_path: None | str = None,
+        trace_memory: bool = False,
+    ):
+        self.start_time = start_time if start_time is not None else time.perf_counter()
+        self.end_time = None
+        self.cprofile_dump_path = cprofile_dump_path
+        self.trace_memory = trace_memory
+
+        # Stage path tuple -> [duration, calls], in the first call order
+        self.stage_dict = {}
+        self.stage_lock = threading.Lock()
+        self.thread_data = threading.local()
+        self.patched_attribute_dict = {}
+        self.cprofile = None
+        self.memory_peak = None
+
+    def start(self) -> None:
+        if self.trace_memory:
+            import tracemalloc
+
+            tracemalloc.start()
+
+        # cProfile only profiles the thread that started it
+        if self.cprofile_dump_path:
+            import cProfile
+
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+    def stop(self) -> None:
+        if self.end_time is not None:
+            return
+
+        self.end_time = time.perf_counter()
+
+        if self.cprofile:
+            self.cprofile.disable()
+            self.cprofile.dump_stats(self.cprofile_dump_path)
+
+        if self.trace_memory:
+            import tracemalloc
+
+            self.memory_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        self.restoreAttributes()
+
+    def isStopped(self) -> bool:
+        return self.end_time is not None
+
+    def _get_stage_stack(self) -> list:
+        if not hasattr(self.thread_data, "stage_stack"):
+            self.thread_data.stage_stack = []
+
+        return self.thread_data.stage_stack
+
+    def _add_stage_duration(self, stage_path: tuple, duration: float) -> None:
+        with self.stage_lock:
+            stage_entry = self.stage_dict.setdefault(stage_path, [0, 0])
+            stage_entry[0] += duration
+            stage_entry[1] += 1
+
+    def addStage(self, name: str, duration: float) -> None:
+        self._add_stage_duration((*self._get_stage_stack(), name), duration)
+
+    @contextmanager
+    def stage(self, name: str):
+        stage_stack = self._get_stage_stack()
+        stage_path = (*stage_stack, name)
+
+        # Registered on entry, so that parents are listed before their children
+        with self.stage_lock:
+            self.stage_dict.setdefault(stage_path, [0, 0])
+
+        stage_stack.append(name)
+        start_time = time.perf_counter()
+
+        try:
+            yield
+
+        finally:
+            self._add_stage_duration(stage_path, time.perf_counter() - start_time)
+            stage_stack.pop()
+
+    def wrapFunction(self, function, name: str):
+        @functools.wraps(function)
+        def _profiled_function(*args, **kwargs):
+            with self.stage(name):
+                return function(*args, **kwargs)
+
+        return _profiled_function
+
+    # Patched attributes of modules and classes are restored when the profiler
+    # is stopped. An attribute is only patched once
+    def patchAttribute(self, owner, attribute_name: str, name: str) -> None:
+        with self.stage_lock:
+            if (id(owner), attribute_name) in self.patched_attribute_dict:
+                return
+
+            self.patched_attribute_dict[(id(owner), attribute_name)] = (
+                owner,
+                attribute_name,
+                vars(owner).get(attribute_name),
+            )
+
+        setattr(
+            owner,
+            attribute_name,
+            self.wrapFunction(getattr(owner, attribute_name), name),
+        )
+
+    def restoreAttributes(self) -> None:
+        with self.stage_lock:
+            patched_attribute_list = list(self.patched_attribute_dict.values())
+            self.patched_attribute_dict.clear()
+
+        for owner, attribute_name, attribute in patched_attribute_list:
+            if attribute is None:
+                delattr(owner, attribute_name)
+
+            else:
+                setattr(owner, attribute_name, attribute)
+
+    def getReport(self) -> dict:
+        with self.stage_lock:
+            stage_item_list = list(self.stage_dict.items())
+
+        stage_list = []
+        stage_node_dict = {}
+
+        for stage_path, (duration, calls) in stage_item_list:
+            stage_node = {
+                "name": stage_path[-1],
+                "duration": duration,
+                "calls": calls,
+                "stages": [],
+            }
+            stage_node_dict[stage_path] = stage_node
+
+            parent_stage_node = stage_node_dict.get(stage_path[:-1])
+            (parent_stage_node["stages"] if parent_stage_node else stage_list).append(
+                stage_node
+            )
+
+        return {
+            "total": (
+                self.end_time if self.end_time is not None else time.perf_counter()
+            )
+            - self.start_time,
+            "stages": stage_list,
+            "memory_peak": self.memory_peak,
+            "cprofile_dump_path": self.cprofile_dump_path,
+        }
+
+    def _format_stage_list(self, stage_list: list, depth: int, line_list: list) -> None:
+        for stage_node in stage_list:
+            stage_name = "  " * depth + stage_node["name"]
+            line = f"  {stage_name:<32} {stage_node['duration'] * 1000:>10.1f} ms"
+
+            if stage_node["calls"] > 1:
+                line += f"  ({stage_node['calls']} calls)"
+
+            line_list.append(line)
+            self._format_stage_list(stage_node["stages"], depth + 1, line_list)
+
+    def formatReport(self) -> str:
+        report = self.getReport()
+        line_list = ["Profile (wall-clock time) :"]
+
+        self._format_stage_list(report["stages"], 0, line_list)
+        line_list.append(f"  {'total':<32} {report['total'] * 1000:>10.1f} ms")
+
+        if report["memory_peak"] is not None:
+            line_list.append(
+                f"  Memory peak : {report['memory_peak'] / (1024 * 1024):.1f} MiB"
+            )
+
+        if report["cprofile_dump_path"]:
+            line_list.append(f"  cProfile dump : {report['cprofile_dump_path']}")
+
+        return "\n".join(line_list)
@@ -6,25 +6,59 @@ See the LICENSE file for licensing informations
 This module provides additional features for access token 
 storage and management.
 
+Access token lookups go through an in-process LRU cache, which is
+invalidated every time the table is modified by the instance.
+
 """
 
+from collections import OrderedDict
 from typing import Union
+import threading
 import sqlite3
 import time
 
+from .store import (
+    CredentialsStore,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_DESCENDING_ORDER,
+    DEFAULT_IMPORT_CHUNK_SIZE,
+)
+
 # Default parameters
 DEFAULT_COMMIT = False
+DEFAULT_FULL_ENTRIES = False
+DEFAULT_ACCESS_TOKEN_CACHE_SIZE = 128
+
+# Constants definition
+BULK_QUERY_CHUNK_SIZE = 500
+ACCESS_TOKEN_EXPORT_COLUMN_LIST = [
+    "CreationTimestamp",
+    "ServerIP",
+    "ServerPort",
+    "AccessToken",
+]
 
 
 class AccessTokenManager:
-    def __init__(self, access_token_db_path: str):
-        self.database_connection = sqlite3.connect(
-            access_token_db_path, check_same_thread=False
-        )
-        self.database_cursor = self.database_connection.cursor()
+    def __init__(
+        self,
+        access_token_db_path: Union[None, str] = None,
+        store: Union[None, CredentialsStore] = None,
+        cache_size: int = DEFAULT_ACCESS_TOKEN_CACHE_SIZE,
+    ):
+        # Without a shared store, the manager uses its own database
+        self.is_store_owned = store is None
+        self.store = store if store else CredentialsStore(access_token_db_path)
         self.is_closed = False
 
-        self.database_cursor.execute(
+        # (server_ip, server_port) -> access token or None, least recently used first
+        self.access_token_cache = OrderedDict()
+        self.access_token_cache_size = cache_size
+        self.access_token_cache_lock = threading.Lock()
+        # Incremented on every clear, so that outdated lookups are not cached
+        self.access_token_cache_generation = 0
+
+        self.store.execute(
             """CREATE TABLE IF NOT EXISTS AnweddolClientAccessTokenTable (
 				EntryID INTEGER NOT NULL PRIMARY KEY, 
 				CreationTimestamp INTEGER NOT NULL,
@@ -33,6 +67,9 @@ class AccessTokenManager:
 				AccessToken TEXT NOT NULL
 			)"""
         )
+        self.store.execute(
+            "CREATE INDEX IF NOT EXISTS AccessTokenServerIndex ON AnweddolClientAccessTokenTable (ServerIP, ServerPort)"
+        )
 
     def __del__(self):
         if not self.isClosed():
@@ -48,23 +85,94 @@ class AccessTokenManager:
     def isClosed(self) -> bool:
         return self.is_closed
 
+    # Each thread has its own connection, see the 'CredentialsStore' class
     def getDatabaseConnection(self) -> sqlite3.Connection:
-        return self.database_connection
+        return self.store.getDatabaseConnection()
+
+    def getStore(self) -> CredentialsStore:
+        return self.store
 
     def getCursor(self) -> sqlite3.Cursor:
-        return self.database_cursor
+        return self.store.getDatabaseConnection().cursor()
+
+    # The most recent entry is returned if several ones match
+    def getEntryID(
+        self, server_ip: str, server_port: Union[None, int] = None
+    ) -> Union[None, int]:
+        if server_port is None:
+            query_cursor = self.store.execute(
+                "SELECT EntryID FROM AnweddolClientAccessTokenTable WHERE ServerIP=? ORDER BY EntryID DESC LIMIT 1",
+                (server_ip,),
+            )
+
+        else:
+            query_cursor = self.store.execute(
+                "SELECT EntryID FROM AnweddolClientAccessTokenTable WHERE ServerIP=? AND ServerPort=? ORDER BY EntryID DESC LIMIT 1",
+                (server_ip, server_port),
+            )
 
-    def getEntryID(self, server_ip: str) -> Union[None, int]:
-        query_cursor = self.database_cursor.execute(
-            "SELECT EntryID FROM AnweddolClientAccessTokenTable WHERE ServerIP=?",
-            (server_ip,),
-        )
         query_result = query_cursor.fetchone()
 
         return query_result[0] if query_result else None
 
+    def getAccessToken(
+        self, server_ip: str, server_port: Union[None, int] = None
+    ) -> Union[None, str]:
+        cache_key = (server_ip, server_port)
+
+        with self.access_token_cache_lock:
+            if cache_key in self.access_token_cache:
+                self.access_token_cache.move_to_end(cache_key)
+                return self.access_token_cache[cache_key]
+
+            cache_generation = self.access_token_cache_generation
+
+        if server_port is None:
+            query_cursor = self.store.execute(
+                "SELECT AccessToken FROM AnweddolClientAccessTokenTable WHERE ServerIP=? ORDER BY EntryID DESC LIMIT 1",
+                (server_ip,),
+            )
+
+        else:
+            query_cursor = self.store.execute(
+                "SELECT AccessToken FROM AnweddolClientAccessTokenTable WHERE ServerIP=? AND ServerPort=? ORDER BY EntryID DESC LIMIT 1",
+                (server_ip, server_port),
+            )
+
+        query_result = query_cursor.fetchone()
+        access_token = query_result[0] if query_result else None
+
+        if self.access_token_cache_size > 0:
+            with self.access_token_cache_lock:
+                # The cache was cleared during the query, the token can be outdated
+                if self.access_token_cache_generation != cache_generation:
+                    return access_token
+
+                self.access_token_cache[cache_key] = access_token
+                self.access_token_cache.move_to_end(cache_key)
+
+                while len(self.access_token_cache) > self.access_token_cache_size:
+                    self.access_token_cache.popitem(last=False)
+
+        return access_token
+
+    # Lookups without port depend on every entry of the server,
+    # so the whole cache is dropped on modification
+    def clearCache(self) -> None:
+        with self.access_token_cache_lock:
+            self.access_token_cache.clear()
+            self.access_token_cache_generation += 1
+
+    # Until the outermost transaction is committed, lookups on other connections
+    # read the previous entries, so the cache is cleared again when it ends
+    def _invalidate_cache(self) -> None:
+        self.clearCache()
+
+        if self.store.isInTransaction():
+            self.store.addTransactionEndCallback(self.clearCache)
+
     def getEntry(self, entry_id: int) -> tuple:
-        query_cursor = self.database_cursor.execute(
+        query_cursor = self.store.execute(
             "SELECT * FROM AnweddolClientAccessTokenTable WHERE EntryID=?", (entry_id,)
         )
 
@@ -73,51 +181,203 @@ class AccessTokenManager:
     def addEntry(self, server_ip: str, server_port: int, access_token: str) -> tuple:
         new_entry_creation_timestamp = int(time.time())
 
-        self.database_cursor.execute(
+        query_cursor = self.store.execute(
             """INSERT INTO AnweddolClientAccessTokenTable (
                 CreationTimestamp, 
                 ServerIP, 
                 ServerPort, 
                 AccessToken) VALUES (?, ?, ?, ?)""",
             (new_entry_creation_timestamp, server_ip, server_port, access_token),
+            commit=True,
         )
-        self.database_connection.commit()
+        self._invalidate_cache()
 
         return (
-            self.database_cursor.lastrowid,
+            query_cursor.lastrowid,
             new_entry_creation_timestamp,
         )
 
     def executeQuery(
         self, text_query: str, parameters: tuple = (), commit: bool = DEFAULT_COMMIT
     ) -> sqlite3.Cursor:
-        result = self.database_cursor.execute(text_query, parameters)
+        result = self.store.execute(text_query, parameters, commit=commit)
 
         if commit:
-            self.database_connection.commit()
+            self._invalidate_cache()
 
         return result
 
     def listEntries(self) -> list:
-        query_cursor = self.database_cursor.execute(
+        query_cursor = self.store.execute(
             "SELECT EntryID, CreationTimestamp, ServerIP FROM AnweddolClientAccessTokenTable",
         )
 
         return query_cursor.fetchall()
 
+    # Distinct (server_ip, server_port) tuples of the stored entries
+    def listServers(self) -> list:
+        query_cursor = self.store.execute(
+            "SELECT DISTINCT ServerIP, ServerPort FROM AnweddolClientAccessTokenTable ORDER BY ServerIP, ServerPort",
+        )
+
+        return query_cursor.fetchall()
+
+    # Yields the same values as 'listEntries', or complete rows if 'full_entries' is set
+    def iterEntries(
+        self,
+        server_ip: Union[None, str] = None,
+        server_port: Union[None, int] = None,
+        created_after: Union[None, int] = None,
+        created_before: Union[None, int] = None,
+        descending_order: bool = DEFAULT_DESCENDING_ORDER,
+        full_entries: bool = DEFAULT_FULL_ENTRIES,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ):
+        return self.store.iterTableEntries(
+            "AnweddolClientAccessTokenTable",
+            ["*"] if full_entries else ["EntryID", "CreationTimestamp", "ServerIP"],
+            server_ip=server_ip,
+            server_port=server_port,
+            created_after=created_after,
+            created_before=created_before,
+            descending_order=descending_order,
+            page_size=page_size,
+        )
+
     def deleteEntry(self, entry_id: int) -> None:
-        self.database_cursor.execute(
+        self.store.execute(
             "DELETE FROM AnweddolClientAccessTokenTable WHERE EntryID=?",
             (entry_id,),
+            commit=True,
         )
-        self.database_connection.commit()
+        self._invalidate_cache()
 
-    def closeDatabase(self) -> None:
-        try:
-            self.database_cursor.close()
-            self.database_connection.close()
+    # Entries are tuples of the 'addEntry' parameters
+    def addEntries(self, entry_list: list) -> tuple:
+        new_entries_creation_timestamp = int(time.time())
+
+        # The write lock is held, so the next entry IDs can be computed
+        with self.store.transaction():
+            last_entry_id = self.store.execute(
+                "SELECT MAX(EntryID) FROM AnweddolClientAccessTokenTable"
+            ).fetchone()[0]
+            new_entry_list = [
+                (
+                    (last_entry_id if last_entry_id else 0) + index + 1,
+                    new_entries_creation_timestamp,
+                    *entry,
+                )
+                for index, entry in enumerate(entry_list)
+            ]
+
+            query_cursor = self.store.executemany(
+                """INSERT INTO AnweddolClientAccessTokenTable (
+                    EntryID,
+                    CreationTimestamp,
+                    ServerIP,
+                    ServerPort,
+                    AccessToken) VALUES (?, ?, ?, ?, ?)""",
+                new_entry_list,
+            )
+            self._invalidate_cache()
+
+        return (
+            tuple(new_entry[0] for new_entry in new_entry_list),
+            new_entries_creation_timestamp,
+        )
+
+    def getEntries(self, entry_id_list: list) -> tuple:
+        entry_id_list = list(entry_id_list)
+        entry_list = []
+
+        for index in range(0, len(entry_id_list), BULK_QUERY_CHUNK_SIZE):
+            entry_id_chunk = entry_id_list[index : index + BULK_QUERY_CHUNK_SIZE]
+            query_cursor = self.store.execute(
+                f"SELECT * FROM AnweddolClientAccessTokenTable WHERE EntryID IN ({', '.join('?' * len(entry_id_chunk))})",
+                entry_id_chunk,
+            )
+            entry_list.extend(query_cursor.fetchall())
+
+        return tuple(sorted(set(entry_list)))
 
-        except sqlite3.ProgrammingError:
-            pass
+    # Entries are complete rows, as returned by 'getEntry'
+    def upsertEntries(self, entry_list: list) -> int:
+        with self.store.transaction():
+            query_cursor = self.store.executemany(
+                """INSERT INTO AnweddolClientAccessTokenTable (
+                    EntryID,
+                    CreationTimestamp,
+                    ServerIP,
+                    ServerPort,
+                    AccessToken) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(EntryID) DO UPDATE SET
+                    CreationTimestamp=excluded.CreationTimestamp,
+                    ServerIP=excluded.ServerIP,
+                    ServerPort=excluded.ServerPort,
+                    AccessToken=excluded.AccessToken""",
+                entry_list,
+            )
+            self._invalidate_cache()
+
+        return query_cursor.rowcount
+
+    def deleteEntries(self, entry_id_list: list) -> int:
+        with self.store.transaction():
+            query_cursor = self.store.executemany(
+                "DELETE FROM AnweddolClientAccessTokenTable WHERE EntryID=?",
+                ((entry_id,) for entry_id in entry_id_list),
+            )
+            self._invalidate_cache()
+
+        return query_cursor.rowcount
+
+    # Every port of the server is concerned if 'server_port' is not specified
+    def deleteEntriesByServer(
+        self, server_ip: str, server_port: Union[None, int] = None
+    ) -> int:
+        with self.store.transaction():
+            if server_port is None:
+                query_cursor = self.store.execute(
+                    "DELETE FROM AnweddolClientAccessTokenTable WHERE ServerIP=?",
+                    (server_ip,),
+                )
+
+            else:
+                query_cursor = self.store.execute(
+                    "DELETE FROM AnweddolClientAccessTokenTable WHERE ServerIP=? AND ServerPort=?",
+                    (server_ip, server_port),
+                )
+            self._invalidate_cache()
+
+        return query_cursor.rowcount
+
+    # Yields complete entries without their entry ID, see 'ACCESS_TOKEN_EXPORT_COLUMN_LIST'
+    def exportEntries(self, page_size: int = DEFAULT_PAGE_SIZE):
+        for entry in self.store.iterTableEntries(
+            "AnweddolClientAccessTokenTable",
+            ["EntryID", *ACCESS_TOKEN_EXPORT_COLUMN_LIST],
+            page_size=page_size,
+        ):
+            yield entry[1:]
+
+    # Entries are tuples as yielded by 'exportEntries', duplicates are updated
+    def importEntries(
+        self, entry_iterable, chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE
+    ) -> tuple:
+        import_result = self.store.importTableEntries(
+            "AnweddolClientAccessTokenTable",
+            ACCESS_TOKEN_EXPORT_COLUMN_LIST,
+            ["ServerIP", "ServerPort"],
+            entry_iterable,
+            update_duplicates=True,
+            chunk_size=chunk_size,
+        )
+        self._invalidate_cache()
+
+        return import_result
+
+    def closeDatabase(self) -> None:
+        if self.is_store_owned and not self.store.isClosed():
+            self.store.closeDatabase()
 
         self.is_closed = True
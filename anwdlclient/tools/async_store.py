@@ -0,0 +1,455 @@
+"""
+Copyright 2023 The Anweddol project
+See the LICENSE file for licensing informations
+---
+
+This module provides asynchronous versions of the credentials and
+access token managers, to be used from an asyncio event loop.
+
+Queries are run on dedicated executors instead of the event loop, and
+the writes queued at the same time are grouped into a single transaction
+(group commit), so that a single fsync is made for many writes.
+Each write is isolated in its own savepoint : A failing write does not
+affect the other ones of its group.
+
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Union
+import asyncio
+
+from .store import CredentialsStore, DEFAULT_PAGE_SIZE, DEFAULT_DESCENDING_ORDER
+from .credentials import (
+    SessionCredentialsManager,
+    ContainerCredentialsManager,
+    DEFAULT_COMMIT,
+    DEFAULT_FULL_ENTRIES,
+    DEFAULT_MAX_AGE,
+    DEFAULT_MAX_ROWS_PER_SERVER,
+    DEFAULT_PURGE_BATCH_SIZE,
+    DEFAULT_MAX_PURGE_BATCHES,
+)
+from .access_token import AccessTokenManager, DEFAULT_ACCESS_TOKEN_CACHE_SIZE
+
+# Default values
+DEFAULT_MAX_READ_WORKERS = 4
+DEFAULT_MAX_GROUP_SIZE = 256
+DEFAULT_GROUP_COMMIT_DELAY = 0
+
+
+class AsyncCredentialsStore:
+    def __init__(
+        self,
+        store_db_path: Union[None, str] = None,
+        store: Union[None, CredentialsStore] = None,
+        max_read_workers: int = DEFAULT_MAX_READ_WORKERS,
+        max_group_size: int = DEFAULT_MAX_GROUP_SIZE,
+        group_commit_delay: float = DEFAULT_GROUP_COMMIT_DELAY,
+    ):
+        if max_group_size <= 0:
+            raise ValueError(f"Invalid group size : {max_group_size}")
+
+        self.is_store_owned = store is None
+        self.store = store if store else CredentialsStore(store_db_path)
+        self.max_group_size = max_group_size
+        self.group_commit_delay = group_commit_delay
+        self.is_closed = False
+
+        # Writes are run on a single thread, reads are not blocked by them
+        self.read_executor = ThreadPoolExecutor(
+            max_workers=max_read_workers, thread_name_prefix="anwdlclient-read"
+        )
+        self.write_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="anwdlclient-write"
+        )
+
+        # (function, future) tuples waiting for the next group commit
+        self.pending_write_list = []
+        self.write_task = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, type, value, traceback):
+        if not self.isClosed():
+            await self.closeDatabase()
+
+    def isClosed(self) -> bool:
+        return self.is_closed
+
+    def getStore(self) -> CredentialsStore:
+        return self.store
+
+    async def runQuery(self, function, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(
+            self.read_executor, partial(function, *args, **kwargs)
+        )
+
+    async def runWrite(self, function, *args, **kwargs):
+        if self.isClosed():
+            raise RuntimeError("The store is closed")
+
+        loop = asyncio.get_running_loop()
+        write_future = loop.create_future()
+
+        self.pending_write_list.append(
+            (partial(function, *args, **kwargs), write_future)
+        )
+
+        if not self.write_task:
+            self.write_task = loop.create_task(self._flush_pending_writes())
+
+        return await write_future
+
+    # Runs on the write executor, returns (is_failed, result) tuples. The
+    # transaction end callbacks of the writes (such as the access token cache
+    # clearing) run once the whole group is committed
+    def _execute_write_group(self, write_list: list) -> list:
+        result_list = []
+
+        with self.store.transaction():
+            for index, (function, _) in enumerate(write_list):
+                self.store.execute(f"SAVEPOINT write_{index}")
+
+                try:
+                    result_list.append((False, function()))
+                    self.store.execute(f"RELEASE write_{index}")
+
+                except Exception as E:
+                    self.store.execute(f"ROLLBACK TO write_{index}")
+                    self.store.execute(f"RELEASE write_{index}")
+                    result_list.append((True, E))
+
+        return result_list
+
+    async def _flush_pending_writes(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        try:
+            while self.pending_write_list:
+                # Lets the other tasks queue their writes
+                await asyncio.sleep(self.group_commit_delay)
+
+                write_list = self.pending_write_list[: self.max_group_size]
+                del self.pending_write_list[: self.max_group_size]
+
+                try:
+                    result_list = await loop.run_in_executor(
+                        self.write_executor, self._execute_write_group, write_list
+                    )
+
+                # The whole group failed (locked database, failed commit, ...)
+                except Exception as E:
+                    result_list = [(True, E)] * len(write_list)
+
+                for (_, write_future), (is_failed, result) in zip(
+                    write_list, result_list
+                ):
+                    if write_future.done():
+                        continue
+
+                    if is_failed:
+                        write_future.set_exception(result)
+
+                    else:
+                        write_future.set_result(result)
+
+        finally:
+            self.write_task = None
+
+    # Yields the values of a blocking generator, read by pages. The generator
+    # holds a cursor of the connection of its thread, so it is run on its own
+    # thread instead of the read executor
+    async def iterate(self, generator, page_size: int = DEFAULT_PAGE_SIZE):
+        loop = asyncio.get_running_loop()
+        iteration_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="anwdlclient-iterate"
+        )
+
+        def read_page():
+            return [value for _, value in zip(range(page_size), generator)]
+
+        try:
+            while True:
+                value_list = await loop.run_in_executor(iteration_executor, read_page)
+
+                for value in value_list:
+                    yield value
+
+                if len(value_list) < page_size:
+                    return
+
+        finally:
+            await loop.run_in_executor(iteration_executor, generator.close)
+            iteration_executor.shutdown(wait=False)
+
+    # Waits for every queued write to be committed
+    async def flush(self) -> None:
+        while self.write_task:
+            await asyncio.shield(self.write_task)
+
+    def _shutdown(self) -> None:
+        self.read_executor.shutdown(wait=True)
+        self.write_executor.shutdown(wait=True)
+
+        if self.is_store_owned and not self.store.isClosed():
+            self.store.closeDatabase()
+
+    async def closeDatabase(self) -> None:
+        await self.flush()
+        self.is_closed = True
+
+        await asyncio.get_running_loop().run_in_executor(None, self._shutdown)
+
+
+# Wraps a blocking manager, every method has the same semantics as its blocking version
+class _AsyncManager:
+    def __init__(self, manager, store: AsyncCredentialsStore, is_store_owned: bool):
+        self.manager = manager
+        self.async_store = store
+        self.is_store_owned = is_store_owned
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, type, value, traceback):
+        if not self.isClosed():
+            await self.closeDatabase()
+
+    def isClosed(self) -> bool:
+        return self.manager.isClosed()
+
+    def getManager(self):
+        return self.manager
+
+    def getAsyncStore(self) -> AsyncCredentialsStore:
+        return self.async_store
+
+    async def getEntryID(
+        self, server_ip: str, server_port: Union[None, int] = None
+    ) -> Union[None, int]:
+        return await self.async_store.runQuery(
+            self.manager.getEntryID, server_ip, server_port
+        )
+
+    async def getEntry(self, entry_id: int) -> tuple:
+        return await self.async_store.runQuery(self.manager.getEntry, entry_id)
+
+    async def getEntries(self, entry_id_list: list) -> tuple:
+        return await self.async_store.runQuery(self.manager.getEntries, entry_id_list)
+
+    async def listEntries(self) -> list:
+        return await self.async_store.runQuery(self.manager.listEntries)
+
+    async def listServers(self) -> list:
+        return await self.async_store.runQuery(self.manager.listServers)
+
+    async def iterEntries(
+        self,
+        server_ip: Union[None, str] = None,
+        server_port: Union[None, int] = None,
+        created_after: Union[None, int] = None,
+        created_before: Union[None, int] = None,
+        descending_order: bool = DEFAULT_DESCENDING_ORDER,
+        full_entries: bool = DEFAULT_FULL_ENTRIES,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ):
+        async for entry in self.async_store.iterate(
+            self.manager.iterEntries(
+                server_ip=server_ip,
+                server_port=server_port,
+                created_after=created_after,
+                created_before=created_before,
+                descending_order=descending_order,
+                full_entries=full_entries,
+                page_size=page_size,
+            ),
+            page_size=page_size,
+        ):
+            yield entry
+
+    # Queries without commit are not grouped, since they are mostly reads
+    async def executeQuery(
+        self, text_query: str, parameters: tuple = (), commit: bool = DEFAULT_COMMIT
+    ) -> list:
+        def execute_query():
+            return self.manager.executeQuery(text_query, parameters).fetchall()
+
+        if commit:
+            return await self.async_store.runWrite(execute_query)
+
+        return await self.async_store.runQuery(execute_query)
+
+    async def deleteEntry(self, entry_id: int) -> None:
+        return await self.async_store.runWrite(self.manager.deleteEntry, entry_id)
+
+    async def addEntries(self, entry_list: list) -> tuple:
+        return await self.async_store.runWrite(self.manager.addEntries, entry_list)
+
+    async def upsertEntries(self, entry_list: list) -> int:
+        return await self.async_store.runWrite(self.manager.upsertEntries, entry_list)
+
+    async def deleteEntries(self, entry_id_list: list) -> int:
+        return await self.async_store.runWrite(
+            self.manager.deleteEntries, entry_id_list
+        )
+
+    async def deleteEntriesByServer(
+        self, server_ip: str, server_port: Union[None, int] = None
+    ) -> int:
+        return await self.async_store.runWrite(
+            self.manager.deleteEntriesByServer, server_ip, server_port
+        )
+
+    async def closeDatabase(self) -> None:
+        await self.async_store.flush()
+        self.manager.closeDatabase()
+
+        if self.is_store_owned and not self.async_store.isClosed():
+            await self.async_store.closeDatabase()
+
+
+class _AsyncCredentialsManager(_AsyncManager):
+    def getRetentionPolicy(self) -> tuple:
+        return self.manager.getRetentionPolicy()
+
+    def setRetentionPolicy(
+        self,
+        max_age: Union[None, int] = DEFAULT_MAX_AGE,
+        max_rows_per_server: Union[None, int] = DEFAULT_MAX_ROWS_PER_SERVER,
+    ) -> None:
+        self.manager.setRetentionPolicy(max_age, max_rows_per_server)
+
+    # Not grouped, since each batch is committed separately
+    async def purgeEntries(
+        self,
+        batch_size: int = DEFAULT_PURGE_BATCH_SIZE,
+        max_batches: Union[None, int] = DEFAULT_MAX_PURGE_BATCHES,
+    ) -> int:
+        await self.async_store.flush()
+
+        return await asyncio.get_running_loop().run_in_executor(
+            self.async_store.write_executor,
+            partial(self.manager.purgeEntries, batch_size, max_batches),
+        )
+
+
+class AsyncSessionCredentialsManager(_AsyncCredentialsManager):
+    def __init__(
+        self,
+        session_credentials_db_path: Union[None, str] = None,
+        store: Union[None, AsyncCredentialsStore] = None,
+        max_age: Union[None, int] = DEFAULT_MAX_AGE,
+        max_rows_per_server: Union[None, int] = DEFAULT_MAX_ROWS_PER_SERVER,
+    ):
+        async_store = (
+            store if store else AsyncCredentialsStore(session_credentials_db_path)
+        )
+
+        super().__init__(
+            SessionCredentialsManager(
+                store=async_store.getStore(),
+                max_age=max_age,
+                max_rows_per_server=max_rows_per_server,
+            ),
+            async_store,
+            store is None,
+        )
+
+    async def addEntry(
+        self, server_ip: str, server_port: int, container_uuid: str, client_token: str
+    ) -> tuple:
+        return await self.async_store.runWrite(
+            self.manager.addEntry, server_ip, server_port, container_uuid, client_token
+        )
+
+
+class AsyncContainerCredentialsManager(_AsyncCredentialsManager):
+    def __init__(
+        self,
+        container_credentials_db_path: Union[None, str] = None,
+        store: Union[None, AsyncCredentialsStore] = None,
+        max_age: Union[None, int] = DEFAULT_MAX_AGE,
+        max_rows_per_server: Union[None, int] = DEFAULT_MAX_ROWS_PER_SERVER,
+    ):
+        async_store = (
+            store if store else AsyncCredentialsStore(container_credentials_db_path)
+        )
+
+        super().__init__(
+            ContainerCredentialsManager(
+                store=async_store.getStore(),
+                max_age=max_age,
+                max_rows_per_server=max_rows_per_server,
+            ),
+            async_store,
+            store is None,
+        )
+
+    async def getEntryIDByContainerUUID(self, container_uuid: str) -> Union[None, int]:
+        return await self.async_store.runQuery(
+            self.manager.getEntryIDByContainerUUID, container_uuid
+        )
+
+    async def addEntry(
+        self,
+        server_ip: str,
+        server_port: int,
+        container_username: str,
+        container_password: str,
+        container_listen_port: int,
+        container_uuid: Union[None, str] = None,
+    ) -> tuple:
+        return await self.async_store.runWrite(
+            self.manager.addEntry,
+            server_ip,
+            server_port,
+            container_username,
+            container_password,
+            container_listen_port,
+            container_uuid=container_uuid,
+        )
+
+    async def deleteEntriesByContainerUUID(self, container_uuid_list: list) -> int:
+        return await self.async_store.runWrite(
+            self.manager.deleteEntriesByContainerUUID, container_uuid_list
+        )
+
+    async def deleteEntriesBySession(self, session_list: list) -> int:
+        return await self.async_store.runWrite(
+            self.manager.deleteEntriesBySession, session_list
+        )
+
+
+class AsyncAccessTokenManager(_AsyncManager):
+    def __init__(
+        self,
+        access_token_db_path: Union[None, str] = None,
+        store: Union[None, AsyncCredentialsStore] = None,
+        cache_size: int = DEFAULT_ACCESS_TOKEN_CACHE_SIZE,
+    ):
+        async_store = store if store else AsyncCredentialsStore(access_token_db_path)
+
+        super().__init__(
+            AccessTokenManager(store=async_store.getStore(), cache_size=cache_size),
+            async_store,
+            store is None,
+        )
+
+    async def getAccessToken(
+        self, server_ip: str, server_port: Union[None, int] = None
+    ) -> Union[None, str]:
+        return await self.async_store.runQuery(
+            self.manager.getAccessToken, server_ip, server_port
+        )
+
+    def clearCache(self) -> None:
+        self.manager.clearCache()
+
+    async def addEntry(
+        self, server_ip: str, server_port: int, access_token: str
+    ) -> tuple:
+        return await self.async_store.runWrite(
+            self.manager.addEntry, server_ip, server_port, access_token
+        )
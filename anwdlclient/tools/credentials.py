@@ -12,20 +12,71 @@ from typing import Union
 import sqlite3
 import time
 
+from .store import (
+    CredentialsStore,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_DESCENDING_ORDER,
+    DEFAULT_IMPORT_CHUNK_SIZE,
+    DEFAULT_PURGE_BATCH_SIZE,
+    DEFAULT_MAX_PURGE_BATCHES,
+    DEFAULT_PURGE_INTERVAL,
+)
+
 # Default parameters
 DEFAULT_COMMIT = False
+DEFAULT_FULL_ENTRIES = False
+DEFAULT_MAX_AGE = None
+DEFAULT_MAX_ROWS_PER_SERVER = None
+
+# Constants definition
+BULK_QUERY_CHUNK_SIZE = 500
+# The container UUID is not part of the container credentials entries
+CONTAINER_CREDENTIALS_COLUMN_LIST = [
+    "EntryID",
+    "CreationTimestamp",
+    "ServerIP",
+    "ServerPort",
+    "ContainerUsername",
+    "ContainerPassword",
+    "ContainerListenPort",
+]
+# Exported columns, the container UUID is included to keep the session link
+SESSION_CREDENTIALS_EXPORT_COLUMN_LIST = [
+    "CreationTimestamp",
+    "ServerIP",
+    "ServerPort",
+    "ContainerUUID",
+    "ClientToken",
+]
+CONTAINER_CREDENTIALS_EXPORT_COLUMN_LIST = [
+    "CreationTimestamp",
+    "ServerIP",
+    "ServerPort",
+    "ContainerUsername",
+    "ContainerPassword",
+    "ContainerListenPort",
+    "ContainerUUID",
+]
 
 
 # Since the two kinds of credentials are separated, there is one class for one database
 class SessionCredentialsManager:
-    def __init__(self, session_credentials_db_path: str):
-        self.database_connection = sqlite3.connect(
-            session_credentials_db_path, check_same_thread=False
-        )
-        self.database_cursor = self.database_connection.cursor()
+    def __init__(
+        self,
+        session_credentials_db_path: Union[None, str] = None,
+        store: Union[None, CredentialsStore] = None,
+        max_age: Union[None, int] = DEFAULT_MAX_AGE,
+        max_rows_per_server: Union[None, int] = DEFAULT_MAX_ROWS_PER_SERVER,
+    ):
+        self.max_age = max_age
+        self.max_rows_per_server = max_rows_per_server
+
+        # Without a shared store, the manager uses its own database
+        self.is_store_owned = store is None
+        self.store = store if store else CredentialsStore(session_credentials_db_path)
         self.is_closed = False
 
-        self.database_cursor.execute(
+        self.store.execute(
             """CREATE TABLE IF NOT EXISTS AnweddolClientSessionCredentialsTable (
                 EntryID INTEGER NOT NULL PRIMARY KEY,
                 CreationTimestamp INTEGER NOT NULL,
@@ -35,6 +86,9 @@ class SessionCredentialsManager:
                 ClientToken TEXT NOT NULL
             )"""
         )
+        self.store.execute(
+            "CREATE INDEX IF NOT EXISTS SessionCredentialsServerIndex ON AnweddolClientSessionCredentialsTable (ServerIP, ServerPort)"
+        )
 
     def __del__(self):
         self.closeDatabase()
@@ -49,23 +103,38 @@ class SessionCredentialsManager:
     def isClosed(self) -> bool:
         return self.is_closed
 
+    # Each thread has its own connection, see the 'CredentialsStore' class
     def getDatabaseConnection(self) -> sqlite3.Connection:
-        return self.database_connection
+        return self.store.getDatabaseConnection()
+
+    def getStore(self) -> CredentialsStore:
+        return self.store
 
     def getCursor(self) -> sqlite3.Cursor:
-        return self.database_cursor
+        return self.store.getDatabaseConnection().cursor()
+
+    # The most recent entry is returned if several ones match
+    def getEntryID(
+        self, server_ip: str, server_port: Union[None, int] = None
+    ) -> Union[None, int]:
+        if server_port is None:
+            query_cursor = self.store.execute(
+                "SELECT EntryID FROM AnweddolClientSessionCredentialsTable WHERE ServerIP=? ORDER BY EntryID DESC LIMIT 1",
+                (server_ip,),
+            )
+
+        else:
+            query_cursor = self.store.execute(
+                "SELECT EntryID FROM AnweddolClientSessionCredentialsTable WHERE ServerIP=? AND ServerPort=? ORDER BY EntryID DESC LIMIT 1",
+                (server_ip, server_port),
+            )
 
-    def getEntryID(self, server_ip: str) -> Union[None, int]:
-        query_cursor = self.database_cursor.execute(
-            "SELECT EntryID FROM AnweddolClientSessionCredentialsTable WHERE ServerIP=?",
-            (server_ip,),
-        )
         query_result = query_cursor.fetchone()
 
         return query_result[0] if query_result else None
 
     def getEntry(self, entry_id: int) -> tuple:
-        query_cursor = self.database_cursor.execute(
+        query_cursor = self.store.execute(
             "SELECT * FROM AnweddolClientSessionCredentialsTable WHERE EntryID=?",
             (entry_id,),
         )
@@ -77,7 +146,7 @@ class SessionCredentialsManager:
     ) -> tuple:
         new_entry_creation_timestamp = int(time.time())
 
-        self.database_cursor.execute(
+        query_cursor = self.store.execute(
             """INSERT INTO AnweddolClientSessionCredentialsTable (
                 CreationTimestamp, 
                 ServerIP, 
@@ -91,55 +160,249 @@ class SessionCredentialsManager:
                 container_uuid,
                 client_token,
             ),
+            commit=True,
         )
-        self.database_connection.commit()
 
-        return (self.database_cursor.lastrowid, new_entry_creation_timestamp)
+        new_entry_id = query_cursor.lastrowid
+
+        self._purge_expired_entries()
+
+        return (new_entry_id, new_entry_creation_timestamp)
 
     def executeQuery(
         self, text_query: str, parameters: tuple = (), commit: bool = DEFAULT_COMMIT
     ) -> sqlite3.Cursor:
-        result = self.database_cursor.execute(text_query, parameters)
-
-        if commit:
-            self.database_connection.commit()
+        result = self.store.execute(text_query, parameters, commit=commit)
 
         return result
 
     def listEntries(self) -> list:
-        query_cursor = self.database_cursor.execute(
+        query_cursor = self.store.execute(
             "SELECT EntryID, CreationTimestamp, ServerIP FROM AnweddolClientSessionCredentialsTable",
         )
 
         return query_cursor.fetchall()
 
+    # Distinct (server_ip, server_port) tuples of the stored entries
+    def listServers(self) -> list:
+        query_cursor = self.store.execute(
+            "SELECT DISTINCT ServerIP, ServerPort FROM AnweddolClientSessionCredentialsTable ORDER BY ServerIP, ServerPort",
+        )
+
+        return query_cursor.fetchall()
+
+    # Yields the same values as 'listEntries', or complete rows if 'full_entries' is set
+    def iterEntries(
+        self,
+        server_ip: Union[None, str] = None,
+        server_port: Union[None, int] = None,
+        created_after: Union[None, int] = None,
+        created_before: Union[None, int] = None,
+        descending_order: bool = DEFAULT_DESCENDING_ORDER,
+        full_entries: bool = DEFAULT_FULL_ENTRIES,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ):
+        return self.store.iterTableEntries(
+            "AnweddolClientSessionCredentialsTable",
+            ["*"] if full_entries else ["EntryID", "CreationTimestamp", "ServerIP"],
+            server_ip=server_ip,
+            server_port=server_port,
+            created_after=created_after,
+            created_before=created_before,
+            descending_order=descending_order,
+            page_size=page_size,
+        )
+
     def deleteEntry(self, entry_id: int) -> None:
-        self.database_cursor.execute(
+        self.store.execute(
             "DELETE FROM AnweddolClientSessionCredentialsTable WHERE EntryID=?",
             (entry_id,),
+            commit=True,
         )
-        self.database_connection.commit()
 
-    def closeDatabase(self) -> None:
-        try:
-            self.database_cursor.close()
-            self.database_connection.close()
+    # Entries are tuples of the 'addEntry' parameters
+    def addEntries(self, entry_list: list) -> tuple:
+        new_entries_creation_timestamp = int(time.time())
+
+        # The write lock is held, so the next entry IDs can be computed
+        with self.store.transaction():
+            last_entry_id = self.store.execute(
+                "SELECT MAX(EntryID) FROM AnweddolClientSessionCredentialsTable"
+            ).fetchone()[0]
+            new_entry_list = [
+                (
+                    (last_entry_id if last_entry_id else 0) + index + 1,
+                    new_entries_creation_timestamp,
+                    *entry,
+                )
+                for index, entry in enumerate(entry_list)
+            ]
+
+            query_cursor = self.store.executemany(
+                """INSERT INTO AnweddolClientSessionCredentialsTable (
+                    EntryID,
+                    CreationTimestamp,
+                    ServerIP,
+                    ServerPort,
+                    ContainerUUID,
+                    ClientToken) VALUES (?, ?, ?, ?, ?, ?)""",
+                new_entry_list,
+            )
+
+        self._purge_expired_entries()
+
+        return (
+            tuple(new_entry[0] for new_entry in new_entry_list),
+            new_entries_creation_timestamp,
+        )
+
+    def getEntries(self, entry_id_list: list) -> tuple:
+        entry_id_list = list(entry_id_list)
+        entry_list = []
+
+        for index in range(0, len(entry_id_list), BULK_QUERY_CHUNK_SIZE):
+            entry_id_chunk = entry_id_list[index : index + BULK_QUERY_CHUNK_SIZE]
+            query_cursor = self.store.execute(
+                f"SELECT * FROM AnweddolClientSessionCredentialsTable WHERE EntryID IN ({', '.join('?' * len(entry_id_chunk))})",
+                entry_id_chunk,
+            )
+            entry_list.extend(query_cursor.fetchall())
+
+        return tuple(sorted(set(entry_list)))
+
+    # Entries are complete rows, as returned by 'getEntry'
+    def upsertEntries(self, entry_list: list) -> int:
+        with self.store.transaction():
+            query_cursor = self.store.executemany(
+                """INSERT INTO AnweddolClientSessionCredentialsTable (
+                    EntryID,
+                    CreationTimestamp,
+                    ServerIP,
+                    ServerPort,
+                    ContainerUUID,
+                    ClientToken) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(EntryID) DO UPDATE SET
+                    CreationTimestamp=excluded.CreationTimestamp,
+                    ServerIP=excluded.ServerIP,
+                    ServerPort=excluded.ServerPort,
+                    ContainerUUID=excluded.ContainerUUID,
+                    ClientToken=excluded.ClientToken""",
+                entry_list,
+            )
+
+            return query_cursor.rowcount
+
+    def deleteEntries(self, entry_id_list: list) -> int:
+        with self.store.transaction():
+            query_cursor = self.store.executemany(
+                "DELETE FROM AnweddolClientSessionCredentialsTable WHERE EntryID=?",
+                ((entry_id,) for entry_id in entry_id_list),
+            )
+
+            return query_cursor.rowcount
+
+    # Every port of the server is concerned if 'server_port' is not specified
+    def deleteEntriesByServer(
+        self, server_ip: str, server_port: Union[None, int] = None
+    ) -> int:
+        with self.store.transaction():
+            if server_port is None:
+                query_cursor = self.store.execute(
+                    "DELETE FROM AnweddolClientSessionCredentialsTable WHERE ServerIP=?",
+                    (server_ip,),
+                )
+
+            else:
+                query_cursor = self.store.execute(
+                    "DELETE FROM AnweddolClientSessionCredentialsTable WHERE ServerIP=? AND ServerPort=?",
+                    (server_ip, server_port),
+                )
+
+            return query_cursor.rowcount
+
+    # Yields complete entries without their entry ID, see 'SESSION_CREDENTIALS_EXPORT_COLUMN_LIST'
+    def exportEntries(self, page_size: int = DEFAULT_PAGE_SIZE):
+        for entry in self.store.iterTableEntries(
+            "AnweddolClientSessionCredentialsTable",
+            ["EntryID", *SESSION_CREDENTIALS_EXPORT_COLUMN_LIST],
+            page_size=page_size,
+        ):
+            yield entry[1:]
+
+    # Entries are tuples as yielded by 'exportEntries', duplicates are skipped
+    def importEntries(
+        self, entry_iterable, chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE
+    ) -> tuple:
+        import_result = self.store.importTableEntries(
+            "AnweddolClientSessionCredentialsTable",
+            SESSION_CREDENTIALS_EXPORT_COLUMN_LIST,
+            ["ServerIP", "ServerPort", "ContainerUUID"],
+            entry_iterable,
+            update_duplicates=False,
+            chunk_size=chunk_size,
+        )
+        self._purge_expired_entries()
+
+        return import_result
+
+    def getRetentionPolicy(self) -> tuple:
+        return (self.max_age, self.max_rows_per_server)
+
+    def setRetentionPolicy(
+        self,
+        max_age: Union[None, int] = DEFAULT_MAX_AGE,
+        max_rows_per_server: Union[None, int] = DEFAULT_MAX_ROWS_PER_SERVER,
+    ) -> None:
+        self.max_age = max_age
+        self.max_rows_per_server = max_rows_per_server
+
+    # Purges every entry breaking the retention policy by default
+    def purgeEntries(
+        self,
+        batch_size: int = DEFAULT_PURGE_BATCH_SIZE,
+        max_batches: Union[None, int] = DEFAULT_MAX_PURGE_BATCHES,
+    ) -> int:
+        return self.store.purgeTableEntries(
+            "AnweddolClientSessionCredentialsTable",
+            max_age=self.max_age,
+            max_rows_per_server=self.max_rows_per_server,
+            batch_size=batch_size,
+            max_batches=max_batches,
+        )
+
+    # Purges every expired entry after writes, at most once per purge interval
+    def _purge_expired_entries(self) -> None:
+        self.store.purgeExpiredTableEntries(
+            "AnweddolClientSessionCredentialsTable",
+            max_age=self.max_age,
+            max_rows_per_server=self.max_rows_per_server,
+            purge_interval=DEFAULT_PURGE_INTERVAL,
+        )
 
-        except sqlite3.ProgrammingError:
-            pass
+    def closeDatabase(self) -> None:
+        if self.is_store_owned and not self.store.isClosed():
+            self.store.closeDatabase()
 
         self.is_closed = True
 
 
 class ContainerCredentialsManager:
-    def __init__(self, container_credentials_db_path: str):
-        self.database_connection = sqlite3.connect(
-            container_credentials_db_path, check_same_thread=False
-        )
-        self.database_cursor = self.database_connection.cursor()
+    def __init__(
+        self,
+        container_credentials_db_path: Union[None, str] = None,
+        store: Union[None, CredentialsStore] = None,
+        max_age: Union[None, int] = DEFAULT_MAX_AGE,
+        max_rows_per_server: Union[None, int] = DEFAULT_MAX_ROWS_PER_SERVER,
+    ):
+        self.max_age = max_age
+        self.max_rows_per_server = max_rows_per_server
+
+        # Without a shared store, the manager uses its own database
+        self.is_store_owned = store is None
+        self.store = store if store else CredentialsStore(container_credentials_db_path)
         self.is_closed = False
 
-        self.database_cursor.execute(
+        self.store.execute(
             """CREATE TABLE IF NOT EXISTS AnweddolClientContainerCredentialsTable (
                 EntryID INTEGER NOT NULL PRIMARY KEY,
                 CreationTimestamp INTEGER NOT NULL,
@@ -147,10 +410,37 @@ class ContainerCredentialsManager:
                 ServerPort INTEGER NOT NULL,
                 ContainerUsername TEXT NOT NULL,
                 ContainerPassword TEXT NOT NULL,
-                ContainerListenPort INTEGER NOT NULL
+                ContainerListenPort INTEGER NOT NULL,
+                ContainerUUID TEXT
             )"""
         )
 
+        # Databases created before the ContainerUUID column need to be migrated
+        column_name_list = [
+            column_info[1]
+            for column_info in self.store.execute(
+                "PRAGMA table_info(AnweddolClientContainerCredentialsTable)"
+            ).fetchall()
+        ]
+
+        if "ContainerUUID" not in column_name_list:
+            try:
+                self.store.execute(
+                    "ALTER TABLE AnweddolClientContainerCredentialsTable ADD COLUMN ContainerUUID TEXT"
+                )
+
+            # Another process may have migrated it in the meantime
+            except sqlite3.OperationalError as E:
+                if "duplicate column" not in str(E):
+                    raise E
+
+        self.store.execute(
+            "CREATE INDEX IF NOT EXISTS ContainerCredentialsUUIDIndex ON AnweddolClientContainerCredentialsTable (ContainerUUID)"
+        )
+        self.store.execute(
+            "CREATE INDEX IF NOT EXISTS ContainerCredentialsServerIndex ON AnweddolClientContainerCredentialsTable (ServerIP, ServerPort)"
+        )
+
     def __del__(self):
         self.closeDatabase()
 
@@ -164,24 +454,49 @@ class ContainerCredentialsManager:
     def isClosed(self) -> bool:
         return self.is_closed
 
+    # Each thread has its own connection, see the 'CredentialsStore' class
     def getDatabaseConnection(self) -> sqlite3.Connection:
-        return self.database_connection
+        return self.store.getDatabaseConnection()
+
+    def getStore(self) -> CredentialsStore:
+        return self.store
 
     def getCursor(self) -> sqlite3.Cursor:
-        return self.database_cursor
+        return self.store.getDatabaseConnection().cursor()
+
+    # The most recent entry is returned if several ones match
+    def getEntryID(
+        self, server_ip: str, server_port: Union[None, int] = None
+    ) -> Union[None, int]:
+        if server_port is None:
+            query_cursor = self.store.execute(
+                "SELECT EntryID FROM AnweddolClientContainerCredentialsTable WHERE ServerIP=? ORDER BY EntryID DESC LIMIT 1",
+                (server_ip,),
+            )
+
+        else:
+            query_cursor = self.store.execute(
+                "SELECT EntryID FROM AnweddolClientContainerCredentialsTable WHERE ServerIP=? AND ServerPort=? ORDER BY EntryID DESC LIMIT 1",
+                (server_ip, server_port),
+            )
+
+        query_result = query_cursor.fetchone()
+
+        return query_result[0] if query_result else None
 
-    def getEntryID(self, server_ip: str) -> Union[None, int]:
-        query_cursor = self.database_cursor.execute(
-            "SELECT EntryID FROM AnweddolClientContainerCredentialsTable WHERE ServerIP=?",
-            (server_ip,),
+    # Links a session credentials entry to its container credentials entry
+    def getEntryIDByContainerUUID(self, container_uuid: str) -> Union[None, int]:
+        query_cursor = self.store.execute(
+            "SELECT EntryID FROM AnweddolClientContainerCredentialsTable WHERE ContainerUUID=? ORDER BY EntryID DESC LIMIT 1",
+            (container_uuid,),
         )
         query_result = query_cursor.fetchone()
 
         return query_result[0] if query_result else None
 
     def getEntry(self, entry_id: int) -> tuple:
-        query_cursor = self.database_cursor.execute(
-            "SELECT * FROM AnweddolClientContainerCredentialsTable WHERE EntryID=?",
+        query_cursor = self.store.execute(
+            f"SELECT {', '.join(CONTAINER_CREDENTIALS_COLUMN_LIST)} FROM AnweddolClientContainerCredentialsTable WHERE EntryID=?",
             (entry_id,),
         )
 
@@ -194,17 +509,19 @@ class ContainerCredentialsManager:
         container_username: str,
         container_password: str,
         container_listen_port: int,
+        container_uuid: Union[None, str] = None,
     ) -> tuple:
         new_entry_creation_timestamp = int(time.time())
 
-        self.database_cursor.execute(
+        query_cursor = self.store.execute(
             """INSERT INTO AnweddolClientContainerCredentialsTable (
                 CreationTimestamp, 
                 ServerIP, 
                 ServerPort,
                 ContainerUsername, 
                 ContainerPassword, 
-                ContainerListenPort) VALUES (?, ?, ?, ?, ?, ?)""",
+                ContainerListenPort,
+                ContainerUUID) VALUES (?, ?, ?, ?, ?, ?, ?)""",
             (
                 new_entry_creation_timestamp,
                 server_ip,
@@ -212,42 +529,280 @@ class ContainerCredentialsManager:
                 container_username,
                 container_password,
                 container_listen_port,
+                container_uuid,
             ),
+            commit=True,
         )
-        self.database_connection.commit()
 
-        return (self.database_cursor.lastrowid, new_entry_creation_timestamp)
+        new_entry_id = query_cursor.lastrowid
+
+        self._purge_expired_entries()
+
+        return (new_entry_id, new_entry_creation_timestamp)
 
     def executeQuery(
         self, text_query: str, parameters: tuple = (), commit: bool = DEFAULT_COMMIT
     ) -> sqlite3.Cursor:
-        result = self.database_cursor.execute(text_query, parameters)
-
-        if commit:
-            self.database_connection.commit()
+        result = self.store.execute(text_query, parameters, commit=commit)
 
         return result
 
     def listEntries(self) -> list:
-        query_cursor = self.database_cursor.execute(
+        query_cursor = self.store.execute(
             "SELECT EntryID, CreationTimestamp, ServerIP FROM AnweddolClientContainerCredentialsTable",
         )
 
         return query_cursor.fetchall()
 
+    # Distinct (server_ip, server_port) tuples of the stored entries
+    def listServers(self) -> list:
+        query_cursor = self.store.execute(
+            "SELECT DISTINCT ServerIP, ServerPort FROM AnweddolClientContainerCredentialsTable ORDER BY ServerIP, ServerPort",
+        )
+
+        return query_cursor.fetchall()
+
+    # Yields the same values as 'listEntries', or complete rows if 'full_entries' is set
+    def iterEntries(
+        self,
+        server_ip: Union[None, str] = None,
+        server_port: Union[None, int] = None,
+        created_after: Union[None, int] = None,
+        created_before: Union[None, int] = None,
+        descending_order: bool = DEFAULT_DESCENDING_ORDER,
+        full_entries: bool = DEFAULT_FULL_ENTRIES,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ):
+        return self.store.iterTableEntries(
+            "AnweddolClientContainerCredentialsTable",
+            CONTAINER_CREDENTIALS_COLUMN_LIST
+            if full_entries
+            else ["EntryID", "CreationTimestamp", "ServerIP"],
+            server_ip=server_ip,
+            server_port=server_port,
+            created_after=created_after,
+            created_before=created_before,
+            descending_order=descending_order,
+            page_size=page_size,
+        )
+
     def deleteEntry(self, entry_id: int) -> None:
-        self.database_cursor.execute(
+        self.store.execute(
             "DELETE FROM AnweddolClientContainerCredentialsTable WHERE EntryID=?",
             (entry_id,),
+            commit=True,
         )
-        self.database_connection.commit()
 
-    def closeDatabase(self) -> None:
-        try:
-            self.database_cursor.close()
-            self.database_connection.close()
+    # Entries are tuples of the 'addEntry' parameters
+    def addEntries(self, entry_list: list) -> tuple:
+        new_entries_creation_timestamp = int(time.time())
+
+        # The write lock is held, so the next entry IDs can be computed
+        with self.store.transaction():
+            last_entry_id = self.store.execute(
+                "SELECT MAX(EntryID) FROM AnweddolClientContainerCredentialsTable"
+            ).fetchone()[0]
+            new_entry_list = [
+                (
+                    (last_entry_id if last_entry_id else 0) + index + 1,
+                    new_entries_creation_timestamp,
+                    *entry,
+                    # The container UUID is optional, like in 'addEntry'
+                    *((None,) if len(entry) == 5 else ()),
+                )
+                for index, entry in enumerate(entry_list)
+            ]
+
+            query_cursor = self.store.executemany(
+                """INSERT INTO AnweddolClientContainerCredentialsTable (
+                    EntryID,
+                    CreationTimestamp,
+                    ServerIP,
+                    ServerPort,
+                    ContainerUsername,
+                    ContainerPassword,
+                    ContainerListenPort,
+                    ContainerUUID) VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                new_entry_list,
+            )
+
+        self._purge_expired_entries()
+
+        return (
+            tuple(new_entry[0] for new_entry in new_entry_list),
+            new_entries_creation_timestamp,
+        )
+
+    def getEntries(self, entry_id_list: list) -> tuple:
+        entry_id_list = list(entry_id_list)
+        entry_list = []
+
+        for index in range(0, len(entry_id_list), BULK_QUERY_CHUNK_SIZE):
+            entry_id_chunk = entry_id_list[index : index + BULK_QUERY_CHUNK_SIZE]
+            query_cursor = self.store.execute(
+                f"SELECT {', '.join(CONTAINER_CREDENTIALS_COLUMN_LIST)} FROM AnweddolClientContainerCredentialsTable WHERE EntryID IN ({', '.join('?' * len(entry_id_chunk))})",
+                entry_id_chunk,
+            )
+            entry_list.extend(query_cursor.fetchall())
+
+        return tuple(sorted(set(entry_list)))
+
+    # Entries are complete rows, as returned by 'getEntry', optionally followed
+    # by the container UUID. Replaced entries without it keep their stored one
+    def upsertEntries(self, entry_list: list) -> int:
+        with self.store.transaction():
+            query_cursor = self.store.executemany(
+                """INSERT INTO AnweddolClientContainerCredentialsTable (
+                    EntryID,
+                    CreationTimestamp,
+                    ServerIP,
+                    ServerPort,
+                    ContainerUsername,
+                    ContainerPassword,
+                    ContainerListenPort,
+                    ContainerUUID) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(EntryID) DO UPDATE SET
+                    CreationTimestamp=excluded.CreationTimestamp,
+                    ServerIP=excluded.ServerIP,
+                    ServerPort=excluded.ServerPort,
+                    ContainerUsername=excluded.ContainerUsername,
+                    ContainerPassword=excluded.ContainerPassword,
+                    ContainerListenPort=excluded.ContainerListenPort,
+                    ContainerUUID=COALESCE(excluded.ContainerUUID, ContainerUUID)""",
+                (
+                    (*entry, *((None,) if len(entry) == 7 else ()))
+                    for entry in entry_list
+                ),
+            )
+
+            return query_cursor.rowcount
+
+    def deleteEntries(self, entry_id_list: list) -> int:
+        with self.store.transaction():
+            query_cursor = self.store.executemany(
+                "DELETE FROM AnweddolClientContainerCredentialsTable WHERE EntryID=?",
+                ((entry_id,) for entry_id in entry_id_list),
+            )
+
+            return query_cursor.rowcount
+
+    # Every port of the server is concerned if 'server_port' is not specified
+    def deleteEntriesByServer(
+        self, server_ip: str, server_port: Union[None, int] = None
+    ) -> int:
+        with self.store.transaction():
+            if server_port is None:
+                query_cursor = self.store.execute(
+                    "DELETE FROM AnweddolClientContainerCredentialsTable WHERE ServerIP=?",
+                    (server_ip,),
+                )
+
+            else:
+                query_cursor = self.store.execute(
+                    "DELETE FROM AnweddolClientContainerCredentialsTable WHERE ServerIP=? AND ServerPort=?",
+                    (server_ip, server_port),
+                )
+
+            return query_cursor.rowcount
+
+    # Deletes the entries linked to session credentials entries, see 'getEntryIDByContainerUUID'
+    def deleteEntriesByContainerUUID(self, container_uuid_list: list) -> int:
+        with self.store.transaction():
+            query_cursor = self.store.executemany(
+                "DELETE FROM AnweddolClientContainerCredentialsTable WHERE ContainerUUID=?",
+                ((container_uuid,) for container_uuid in container_uuid_list),
+            )
+
+            return query_cursor.rowcount
+
+    # Sessions are (container_uuid, server_ip, server_port) tuples. Entries
+    # created before the container UUID column are not linked to their session :
+    # The most recent one of the server is deleted instead, as before the migration
+    def deleteEntriesBySession(self, session_list: list) -> int:
+        deleted_entries_amount = 0
+
+        with self.store.transaction():
+            for container_uuid, server_ip, server_port in session_list:
+                query_cursor = self.store.execute(
+                    "DELETE FROM AnweddolClientContainerCredentialsTable WHERE ContainerUUID=?",
+                    (container_uuid,),
+                )
+
+                if not query_cursor.rowcount:
+                    query_cursor = self.store.execute(
+                        """DELETE FROM AnweddolClientContainerCredentialsTable WHERE EntryID=(
+                            SELECT EntryID FROM AnweddolClientContainerCredentialsTable
+                            WHERE ContainerUUID IS NULL AND ServerIP=? AND ServerPort=?
+                            ORDER BY EntryID DESC LIMIT 1
+                        )""",
+                        (server_ip, server_port),
+                    )
+
+                deleted_entries_amount += query_cursor.rowcount
+
+        return deleted_entries_amount
+
+    # Yields complete entries without their entry ID, see 'CONTAINER_CREDENTIALS_EXPORT_COLUMN_LIST'
+    def exportEntries(self, page_size: int = DEFAULT_PAGE_SIZE):
+        for entry in self.store.iterTableEntries(
+            "AnweddolClientContainerCredentialsTable",
+            ["EntryID", *CONTAINER_CREDENTIALS_EXPORT_COLUMN_LIST],
+            page_size=page_size,
+        ):
+            yield entry[1:]
+
+    # Entries are tuples as yielded by 'exportEntries', duplicates are skipped
+    def importEntries(
+        self, entry_iterable, chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE
+    ) -> tuple:
+        import_result = self.store.importTableEntries(
+            "AnweddolClientContainerCredentialsTable",
+            CONTAINER_CREDENTIALS_EXPORT_COLUMN_LIST,
+            ["ServerIP", "ServerPort", "ContainerUUID", "ContainerUsername"],
+            entry_iterable,
+            update_duplicates=False,
+            chunk_size=chunk_size,
+        )
+        self._purge_expired_entries()
+
+        return import_result
 
-        except sqlite3.ProgrammingError:
-            pass
+    def getRetentionPolicy(self) -> tuple:
+        return (self.max_age, self.max_rows_per_server)
+
+    def setRetentionPolicy(
+        self,
+        max_age: Union[None, int] = DEFAULT_MAX_AGE,
+        max_rows_per_server: Union[None, int] = DEFAULT_MAX_ROWS_PER_SERVER,
+    ) -> None:
+        self.max_age = max_age
+        self.max_rows_per_server = max_rows_per_server
+
+    # Purges every entry breaking the retention policy by default
+    def purgeEntries(
+        self,
+        batch_size: int = DEFAULT_PURGE_BATCH_SIZE,
+        max_batches: Union[None, int] = DEFAULT_MAX_PURGE_BATCHES,
+    ) -> int:
+        return self.store.purgeTableEntries(
+            "AnweddolClientContainerCredentialsTable",
+            max_age=self.max_age,
+            max_rows_per_server=self.max_rows_per_server,
+            batch_size=batch_size,
+            max_batches=max_batches,
+        )
+
+    # Purges every expired entry after writes, at most once per purge interval
+    def _purge_expired_entries(self) -> None:
+        self.store.purgeExpiredTableEntries(
+            "AnweddolClientContainerCredentialsTable",
+            max_age=self.max_age,
+            max_rows_per_server=self.max_rows_per_server,
+            purge_interval=DEFAULT_PURGE_INTERVAL,
+        )
+
+    def closeDatabase(self) -> None:
+        if self.is_store_owned and not self.store.isClosed():
+            self.store.closeDatabase()
 
         self.is_closed = True
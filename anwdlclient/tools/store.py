@@ -0,0 +1,559 @@
+"""
+Copyright 2023 The Anweddol project
+See the LICENSE file for licensing informations
+---
+
+This module provides a single SQLite store that can be shared by
+the credentials and access token managers.
+
+The database is opened in WAL mode, so that readers do not block
+the writer, and the writes of several managers can be grouped into
+a single transaction (and a single fsync).
+
+Expired entries can be purged in small batches, and new databases
+use incremental vacuuming so that the freed space can be returned.
+
+Each thread gets its own connection, taken from a small pool of idle
+connections, so that the store can be used from worker threads.
+In-memory databases only exist on their connection, so it is shared
+by every thread and locked instead.
+
+"""
+
+from contextlib import contextmanager, nullcontext
+from itertools import islice
+from typing import Union
+import threading
+import weakref
+import sqlite3
+import time
+
+# Default parameters
+DEFAULT_SYNCHRONOUS_MODE = "NORMAL"
+DEFAULT_MMAP_SIZE = 64 * 1024 * 1024
+DEFAULT_BUSY_TIMEOUT = 10
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_DESCENDING_ORDER = False
+DEFAULT_PURGE_BATCH_SIZE = 500
+DEFAULT_MAX_PURGE_BATCHES = None
+DEFAULT_PURGE_INTERVAL = 60
+DEFAULT_VACUUM_PAGES = None
+DEFAULT_CONNECTION_POOL_SIZE = 4
+DEFAULT_IMPORT_CHUNK_SIZE = 1000
+DEFAULT_UPDATE_DUPLICATES = False
+
+# Constants definition
+MEMORY_DATABASE_PATH = ":memory:"
+METADATA_TABLE_NAME = "AnweddolClientStoreMetadataTable"
+
+
+class CredentialsStore:
+    def __init__(
+        self,
+        store_db_path: str,
+        synchronous_mode: str = DEFAULT_SYNCHRONOUS_MODE,
+        mmap_size: int = DEFAULT_MMAP_SIZE,
+        busy_timeout: int = DEFAULT_BUSY_TIMEOUT,
+        connection_pool_size: int = DEFAULT_CONNECTION_POOL_SIZE,
+    ):
+        if synchronous_mode.upper() not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+            raise ValueError(f"Invalid synchronous mode : {synchronous_mode}")
+
+        self.store_db_path = store_db_path
+        self.synchronous_mode = synchronous_mode
+        self.mmap_size = mmap_size
+        self.busy_timeout = busy_timeout
+        self.connection_pool_size = connection_pool_size
+        self.is_closed = False
+
+        # Per-thread connection and transaction depth
+        self.thread_data = threading.local()
+        self.connection_list = []
+        self.idle_connection_list = []
+        self.connection_list_lock = threading.Lock()
+
+        self.shared_database_connection = None
+        self.shared_connection_lock = threading.RLock()
+
+        if store_db_path == MEMORY_DATABASE_PATH:
+            self.shared_database_connection = self._open_connection()
+
+        else:
+            # Opens the connection of the current thread, and the database with it
+            self.getDatabaseConnection()
+
+        # Values shared by every process using the database
+        self.execute(
+            f"""CREATE TABLE IF NOT EXISTS {METADATA_TABLE_NAME} (
+                Name TEXT NOT NULL PRIMARY KEY,
+                Value INTEGER NOT NULL
+            )"""
+        )
+
+    def __del__(self):
+        if not self.isClosed():
+            self.closeDatabase()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        if not self.isClosed():
+            self.closeDatabase()
+
+    def isClosed(self) -> bool:
+        return self.is_closed
+
+    def isConnectionShared(self) -> bool:
+        return self.shared_database_connection is not None
+
+    def isInTransaction(self) -> bool:
+        return getattr(self.thread_data, "transaction_depth", 0) > 0
+
+    def _open_connection(self) -> sqlite3.Connection:
+        # The busy timeout makes concurrent writers wait for the lock
+        database_connection = sqlite3.connect(
+            self.store_db_path, timeout=self.busy_timeout, check_same_thread=False
+        )
+
+        # The auto-vacuum mode can only be set before the first table is created
+        # (and before enabling WAL mode), see 'enableIncrementalVacuum' otherwise
+        if not database_connection.execute(
+            "SELECT COUNT(*) FROM sqlite_master"
+        ).fetchone()[0]:
+            database_connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+
+        # WAL mode is persistent, but it is not supported on every file system
+        database_connection.execute("PRAGMA journal_mode=WAL")
+        database_connection.execute(f"PRAGMA synchronous={self.synchronous_mode}")
+        database_connection.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        database_connection.execute("PRAGMA temp_store=MEMORY")
+
+        with self.connection_list_lock:
+            self.connection_list.append(database_connection)
+
+        return database_connection
+
+    # Called when the thread owning the connection is garbage collected
+    def _release_connection(self, database_connection: sqlite3.Connection) -> None:
+        with self.connection_list_lock:
+            if self.is_closed:
+                return
+
+            if (
+                not database_connection.in_transaction
+                and len(self.idle_connection_list) < self.connection_pool_size
+            ):
+                self.idle_connection_list.append(database_connection)
+                return
+
+            self.connection_list.remove(database_connection)
+
+        database_connection.close()
+
+    def getDatabaseConnection(self) -> sqlite3.Connection:
+        if self.isConnectionShared():
+            return self.shared_database_connection
+
+        database_connection = getattr(self.thread_data, "database_connection", None)
+
+        if database_connection is None:
+            with self.connection_list_lock:
+                database_connection = (
+                    self.idle_connection_list.pop()
+                    if self.idle_connection_list
+                    else None
+                )
+
+            if database_connection is None:
+                database_connection = self._open_connection()
+
+            self.thread_data.database_connection = database_connection
+
+            # The connection goes back to the pool when the thread ends
+            weakref.finalize(
+                threading.current_thread(),
+                self._release_connection,
+                database_connection,
+            ).atexit = False
+
+        return database_connection
+
+    # Serializes the use of the connection if it is shared between threads
+    def _lock_connection(self):
+        return (
+            self.shared_connection_lock if self.isConnectionShared() else nullcontext()
+        )
+
+    def getJournalMode(self) -> str:
+        with self._lock_connection():
+            return (
+                self.getDatabaseConnection()
+                .execute("PRAGMA journal_mode")
+                .fetchone()[0]
+            )
+
+    def execute(
+        self, text_query: str, parameters: tuple = (), commit: bool = False
+    ) -> sqlite3.Cursor:
+        with self._lock_connection():
+            query_cursor = self.getDatabaseConnection().execute(text_query, parameters)
+
+            if commit:
+                self.commit()
+
+        return query_cursor
+
+    def executemany(
+        self, text_query: str, parameters_list, commit: bool = False
+    ) -> sqlite3.Cursor:
+        with self._lock_connection():
+            query_cursor = self.getDatabaseConnection().executemany(
+                text_query, parameters_list
+            )
+
+            if commit:
+                self.commit()
+
+        return query_cursor
+
+    # Writes are committed when the outermost transaction ends
+    def commit(self) -> None:
+        with self._lock_connection():
+            if not self.isInTransaction():
+                self.getDatabaseConnection().commit()
+
+    @contextmanager
+    def transaction(self):
+        with self._lock_connection():
+            database_connection = self.getDatabaseConnection()
+
+            if not self.isInTransaction():
+                # Takes the write lock right away, instead of upgrading
+                # a read lock later, which can fail with 'database is locked'
+                if database_connection.in_transaction:
+                    database_connection.commit()
+
+                database_connection.execute("BEGIN IMMEDIATE")
+                self.thread_data.transaction_depth = 0
+                self.thread_data.transaction_end_callback_list = []
+
+            self.thread_data.transaction_depth += 1
+
+            try:
+                yield self
+
+            except BaseException as E:
+                self.thread_data.transaction_depth -= 1
+
+                if not self.isInTransaction():
+                    try:
+                        database_connection.rollback()
+
+                    finally:
+                        self._run_transaction_end_callbacks()
+
+                raise E
+
+            self.thread_data.transaction_depth -= 1
+
+            if not self.isInTransaction():
+                try:
+                    database_connection.commit()
+
+                finally:
+                    self._run_transaction_end_callbacks()
+
+    # The callback is run once the outermost transaction of the thread ends,
+    # committed or rolled back, or right away outside of a transaction
+    def addTransactionEndCallback(self, callback) -> None:
+        if not self.isInTransaction():
+            callback()
+            return
+
+        self.thread_data.transaction_end_callback_list.append(callback)
+
+    def _run_transaction_end_callbacks(self) -> None:
+        callback_list = self.thread_data.transaction_end_callback_list
+        self.thread_data.transaction_end_callback_list = []
+
+        for callback in callback_list:
+            callback()
+
+    # Keyset pagination : each page starts after the last yielded entry ID,
+    # so that no read transaction is held between two pages
+    def iterTableEntries(
+        self,
+        table_name: str,
+        column_list: list,
+        server_ip: Union[None, str] = None,
+        server_port: Union[None, int] = None,
+        created_after: Union[None, int] = None,
+        created_before: Union[None, int] = None,
+        descending_order: bool = DEFAULT_DESCENDING_ORDER,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ):
+        if page_size <= 0:
+            raise ValueError(f"Invalid page size : {page_size}")
+
+        query_condition_list = []
+        query_parameter_list = []
+
+        for condition, parameter in [
+            ("ServerIP=?", server_ip),
+            ("ServerPort=?", server_port),
+            ("CreationTimestamp>=?", created_after),
+            ("CreationTimestamp<?", created_before),
+        ]:
+            if parameter is not None:
+                query_condition_list.append(condition)
+                query_parameter_list.append(parameter)
+
+        query_cursor = self.getDatabaseConnection().cursor()
+        last_entry_id = None
+
+        try:
+            while True:
+                page_condition_list = list(query_condition_list)
+                page_parameter_list = list(query_parameter_list)
+
+                if last_entry_id is not None:
+                    page_condition_list.append(
+                        "EntryID<?" if descending_order else "EntryID>?"
+                    )
+                    page_parameter_list.append(last_entry_id)
+
+                with self._lock_connection():
+                    query_cursor.execute(
+                        f"SELECT {', '.join(column_list)} FROM {table_name}"
+                        + (
+                            f" WHERE {' AND '.join(page_condition_list)}"
+                            if page_condition_list
+                            else ""
+                        )
+                        + f" ORDER BY EntryID {'DESC' if descending_order else 'ASC'} LIMIT ?",
+                        (*page_parameter_list, page_size),
+                    )
+                    entry_list = query_cursor.fetchmany(page_size)
+
+                yield from entry_list
+
+                if len(entry_list) < page_size:
+                    return
+
+                last_entry_id = entry_list[-1][0]
+
+        finally:
+            query_cursor.close()
+
+    # Entries matching an existing one on the key columns are duplicates :
+    # They update it if 'update_duplicates' is set, or are skipped otherwise
+    def importTableEntries(
+        self,
+        table_name: str,
+        column_list: list,
+        key_column_list: list,
+        entry_iterable,
+        update_duplicates: bool = DEFAULT_UPDATE_DUPLICATES,
+        chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE,
+    ) -> tuple:
+        if chunk_size <= 0:
+            raise ValueError(f"Invalid chunk size : {chunk_size}")
+
+        key_index_list = [column_list.index(column) for column in key_column_list]
+        select_query = (
+            f"SELECT EntryID FROM {table_name} WHERE "
+            + " AND ".join(f"{column} IS ?" for column in key_column_list)
+            + " ORDER BY EntryID DESC LIMIT 1"
+        )
+        insert_query = (
+            f"INSERT INTO {table_name} ({', '.join(column_list)}) "
+            f"VALUES ({', '.join('?' * len(column_list))})"
+        )
+        update_query = (
+            f"UPDATE {table_name} SET "
+            + ", ".join(f"{column}=?" for column in column_list)
+            + " WHERE EntryID=?"
+        )
+
+        entry_iterator = iter(entry_iterable)
+        imported_entries_amount = 0
+        duplicate_entries_amount = 0
+
+        while True:
+            # The chunk is read before taking the write lock
+            entry_chunk = list(islice(entry_iterator, chunk_size))
+
+            with self.transaction():
+                for entry in entry_chunk:
+                    query_result = self.execute(
+                        select_query, [entry[index] for index in key_index_list]
+                    ).fetchone()
+
+                    if not query_result:
+                        self.execute(insert_query, entry)
+                        imported_entries_amount += 1
+                        continue
+
+                    if update_duplicates:
+                        self.execute(update_query, (*entry, query_result[0]))
+
+                    duplicate_entries_amount += 1
+
+            if len(entry_chunk) < chunk_size:
+                return (imported_entries_amount, duplicate_entries_amount)
+
+    # Each batch is deleted in its own transaction, so that the write
+    # lock is only held for a short time
+    def purgeTableEntries(
+        self,
+        table_name: str,
+        max_age: Union[None, int] = None,
+        max_rows_per_server: Union[None, int] = None,
+        batch_size: int = DEFAULT_PURGE_BATCH_SIZE,
+        max_batches: Union[None, int] = DEFAULT_MAX_PURGE_BATCHES,
+    ) -> int:
+        if batch_size <= 0:
+            raise ValueError(f"Invalid batch size : {batch_size}")
+
+        purge_query_list = []
+
+        if max_age is not None:
+            purge_query_list.append(
+                (
+                    f"""DELETE FROM {table_name} WHERE EntryID IN (
+                        SELECT EntryID FROM {table_name}
+                        WHERE CreationTimestamp<? LIMIT ?
+                    )""",
+                    (int(time.time()) - max_age,),
+                )
+            )
+
+        # Only the most recent entries of each server are kept
+        if max_rows_per_server is not None:
+            purge_query_list.append(
+                (
+                    f"""DELETE FROM {table_name} WHERE EntryID IN (
+                        SELECT EntryID FROM (
+                            SELECT EntryID, ROW_NUMBER() OVER (
+                                PARTITION BY ServerIP, ServerPort ORDER BY EntryID DESC
+                            ) AS EntryRank FROM {table_name}
+                        ) WHERE EntryRank>? LIMIT ?
+                    )""",
+                    (max_rows_per_server,),
+                )
+            )
+
+        purged_entries_amount = 0
+        batches_amount = 0
+
+        for purge_query, purge_parameters in purge_query_list:
+            while max_batches is None or batches_amount < max_batches:
+                with self.transaction():
+                    deleted_entries_amount = self.execute(
+                        purge_query, (*purge_parameters, batch_size)
+                    ).rowcount
+
+                purged_entries_amount += deleted_entries_amount
+                batches_amount += 1
+
+                if deleted_entries_amount < batch_size:
+                    break
+
+        return purged_entries_amount
+
+    def getLastPurgeTimestamp(self, table_name: str) -> Union[None, int]:
+        query_result = self.execute(
+            f"SELECT Value FROM {METADATA_TABLE_NAME} WHERE Name=?",
+            (f"LastPurgeTimestamp:{table_name}",),
+        ).fetchone()
+
+        return query_result[0] if query_result else None
+
+    # The last purge time is stored in the database, so that the purges are
+    # spaced out across every process using it. The purge is claimed under
+    # the write lock, so that only one of them runs it
+    def purgeExpiredTableEntries(
+        self,
+        table_name: str,
+        max_age: Union[None, int] = None,
+        max_rows_per_server: Union[None, int] = None,
+        purge_interval: int = DEFAULT_PURGE_INTERVAL,
+        batch_size: int = DEFAULT_PURGE_BATCH_SIZE,
+    ) -> int:
+        if max_age is None and max_rows_per_server is None:
+            return 0
+
+        purge_timestamp = int(time.time())
+
+        with self.transaction():
+            last_purge_timestamp = self.getLastPurgeTimestamp(table_name)
+
+            if (
+                last_purge_timestamp is not None
+                and 0 <= purge_timestamp - last_purge_timestamp < purge_interval
+            ):
+                return 0
+
+            self.execute(
+                f"INSERT OR REPLACE INTO {METADATA_TABLE_NAME} (Name, Value) "
+                "VALUES (?, ?)",
+                (f"LastPurgeTimestamp:{table_name}", purge_timestamp),
+            )
+
+        return self.purgeTableEntries(
+            table_name,
+            max_age=max_age,
+            max_rows_per_server=max_rows_per_server,
+            batch_size=batch_size,
+            max_batches=None,
+        )
+
+    def isIncrementalVacuumEnabled(self) -> bool:
+        return self.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+    # Rebuilds the whole database, this can take some time on large ones
+    def enableIncrementalVacuum(self) -> None:
+        if self.isInTransaction():
+            raise RuntimeError("Cannot enable incremental vacuum during a transaction")
+
+        with self._lock_connection():
+            database_connection = self.getDatabaseConnection()
+
+            database_connection.commit()
+            database_connection.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            database_connection.execute("VACUUM")
+
+    def getFreePageCount(self) -> int:
+        return self.execute("PRAGMA freelist_count").fetchone()[0]
+
+    # Returns the amount of freed pages, every free page is freed by default
+    def incrementalVacuum(self, pages: Union[None, int] = DEFAULT_VACUUM_PAGES) -> int:
+        if self.isInTransaction():
+            raise RuntimeError("Cannot vacuum the database during a transaction")
+
+        with self._lock_connection():
+            free_page_count = self.getFreePageCount()
+
+            # Each step of the pragma frees one page, 'executescript' runs it to the end
+            self.getDatabaseConnection().executescript(
+                "PRAGMA incremental_vacuum"
+                + (f"({int(pages)})" if pages is not None else "")
+            )
+
+            return free_page_count - self.getFreePageCount()
+
+    # Closes the connections of every thread
+    def closeDatabase(self) -> None:
+        with self.connection_list_lock:
+            connection_list = self.connection_list
+            self.connection_list = []
+            self.idle_connection_list = []
+            self.is_closed = True
+
+        for database_connection in connection_list:
+            try:
+                database_connection.close()
+
+            except sqlite3.ProgrammingError:
+                pass
@@ -11,9 +11,19 @@ please considerate this function when implementing a new experimental feature
 
 """
 
+import hashlib
+import struct
 import os
 
 
+# Constants definition
+RSA_KEYS_CACHE_MAGIC = b"ANWDLKC1"
+
+# Magic, private and public key files mtime / size, DER keys lengths
+RSA_KEYS_CACHE_HEADER_FORMAT = "<8sqqqqII"
+RSA_KEYS_CACHE_DIGEST_SIZE = 32
+
+
 class Colors:
     GREEN = "\033[92m"
     RED = "\033[91m"
@@ -32,3 +42,111 @@ def createFileRecursively(path, is_folder=False):
 
     with open(path, "w") as fd:
         fd.close()
+
+
+def _get_file_stat_key(path):
+    file_stat = os.stat(path)
+
+    return (file_stat.st_mtime_ns, file_stat.st_size)
+
+
+# The cache contains both keys in DER format, and is considered valid
+# only if the PEM files were not modified since it was written
+def loadRSAKeysCache(cache_file_path, private_key_file_path, public_key_file_path):
+    try:
+        with open(cache_file_path, "rb") as fd:
+            cache_content = fd.read()
+
+        header_size = struct.calcsize(RSA_KEYS_CACHE_HEADER_FORMAT)
+        (
+            magic,
+            private_key_mtime,
+            private_key_size,
+            public_key_mtime,
+            public_key_size,
+            der_private_key_length,
+            der_public_key_length,
+        ) = struct.unpack_from(RSA_KEYS_CACHE_HEADER_FORMAT, cache_content)
+
+        if magic != RSA_KEYS_CACHE_MAGIC:
+            return None
+
+        if (private_key_mtime, private_key_size) != _get_file_stat_key(
+            private_key_file_path
+        ) or (public_key_mtime, public_key_size) != _get_file_stat_key(
+            public_key_file_path
+        ):
+            return None
+
+        der_keys_end = header_size + der_private_key_length + der_public_key_length
+        der_keys = cache_content[header_size:der_keys_end]
+
+        if (
+            len(der_keys) != der_private_key_length + der_public_key_length
+            or hashlib.sha256(der_keys).digest()
+            != cache_content[
+                der_keys_end : der_keys_end + RSA_KEYS_CACHE_DIGEST_SIZE
+            ]
+        ):
+            return None
+
+    except (OSError, struct.error):
+        return None
+
+    from cryptography.hazmat.primitives import serialization
+
+    # The keys were already validated when the PEM files were first loaded
+    try:
+        private_key = serialization.load_der_private_key(
+            der_keys[:der_private_key_length],
+            password=None,
+            unsafe_skip_rsa_key_validation=True,
+        )
+
+    except TypeError:
+        private_key = serialization.load_der_private_key(
+            der_keys[:der_private_key_length], password=None
+        )
+
+    public_key = serialization.load_der_public_key(der_keys[der_private_key_length:])
+
+    return (private_key, public_key)
+
+
+def storeRSAKeysCache(
+    cache_file_path, private_key_file_path, public_key_file_path, rsa_wrapper
+):
+    from cryptography.hazmat.primitives import serialization
+
+    der_private_key = rsa_wrapper.getPrivateKey(pem_format=False).private_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    der_public_key = rsa_wrapper.getPublicKey(pem_format=False).public_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+
+    cache_content = (
+        struct.pack(
+            RSA_KEYS_CACHE_HEADER_FORMAT,
+            RSA_KEYS_CACHE_MAGIC,
+            *_get_file_stat_key(private_key_file_path),
+            *_get_file_stat_key(public_key_file_path),
+            len(der_private_key),
+            len(der_public_key),
+        )
+        + der_private_key
+        + der_public_key
+        + hashlib.sha256(der_private_key + der_public_key).digest()
+    )
+
+    # The cache contains the private key : it must only be readable by its owner
+    tmp_cache_file_path = f"{cache_file_path}.tmp"
+    fd = os.open(tmp_cache_file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+
+    with os.fdopen(fd, "wb") as cache_fd:
+        cache_fd.write(cache_content)
+
+    os.replace(tmp_cache_file_path, cache_file_path)
@@ -0,0 +1,342 @@
+"""
+Copyright 2023 The Anweddol project
+See the LICENSE file for licensing informations
+---
+
+This module contains an asynchronous version of the HTTP client.
+It sends the same requests as the 'WebClientInterface' class, on the
+"http(s)://<server:port>/<verb>" URLs, from an asyncio event loop.
+
+Connections are kept alive and reused between requests, and the amount
+of concurrent requests is limited, so that a single process can drive a
+large amount of concurrent operations without a thread per request.
+
+It only relies on the standard library asyncio streams, with a minimal
+HTTP/1.1 implementation supporting what the Anweddol REST API needs.
+In HTTPS mode, it uses the same SSL contexts as the 'WebClientInterface'
+class, with certificate pinning and TLS session resumption.
+
+"""
+
+from collections import deque
+from typing import Union
+import asyncio
+import json
+import ssl
+
+from ..core.sanitization import makeRequest, verifyResponseContent
+from .client import (
+    ResumableSSLContext,
+    DEFAULT_HTTP_SERVER_LISTEN_PORT,
+    DEFAULT_ENABLE_SSL,
+    DEFAULT_VERIFY_SSL_CERTIFICATE,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_PINNED_CERTIFICATE_SHA256,
+    DEFAULT_CA_BUNDLE_FILE_PATH,
+)
+
+# Default values
+DEFAULT_MAX_CONCURRENT_REQUESTS = 100
+DEFAULT_REQUEST_TIMEOUT = None
+
+# Constants definition
+HTTP_MAX_LINE_LENGTH = 65536
+# Responses never having a body, whatever their headers, see RFC 9112 section 6.3
+HTTP_NO_BODY_STATUS_CODE_LIST = [204, 304]
+
+
+# Raised when a connection failed before any response byte was received :
+# The request can be sent again on a new connection
+class _StaleConnectionError(ConnectionResetError):
+    pass
+
+
+class AsyncWebClientInterface:
+    def __init__(
+        self,
+        server_ip: str,
+        server_listen_port: int = DEFAULT_HTTP_SERVER_LISTEN_PORT,
+        enable_ssl: bool = DEFAULT_ENABLE_SSL,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        timeout: Union[None, int] = DEFAULT_REQUEST_TIMEOUT,
+        pinned_certificate_sha256: Union[None, str] = DEFAULT_PINNED_CERTIFICATE_SHA256,
+        ca_bundle_file_path: Union[None, str] = DEFAULT_CA_BUNDLE_FILE_PATH,
+    ):
+        self.server_ip = server_ip
+        self.server_listen_port = server_listen_port
+        self.enable_ssl = enable_ssl
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.pinned_certificate_sha256 = pinned_certificate_sha256
+        self.ca_bundle_file_path = ca_bundle_file_path
+
+        self.request_semaphore = asyncio.Semaphore(max_concurrent_requests)
+        # Idle connections, indexed by the certificate verification setting
+        self.idle_connections = {True: deque(), False: deque()}
+        self.ssl_contexts = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, type, value, traceback):
+        await self.closeConnections()
+
+    def getSSLContext(
+        self, verify_ssl_certificate: bool = DEFAULT_VERIFY_SSL_CERTIFICATE
+    ) -> ResumableSSLContext:
+        ssl_context = self.ssl_contexts.get(verify_ssl_certificate)
+
+        if not ssl_context:
+            ssl_context = ResumableSSLContext(
+                verify_ssl_certificate,
+                pinned_certificate_sha256=self.pinned_certificate_sha256,
+                ca_bundle_file_path=self.ca_bundle_file_path,
+            )
+            self.ssl_contexts[verify_ssl_certificate] = ssl_context
+
+        return ssl_context
+
+    async def _open_connection(self, verify_ssl_certificate: bool) -> tuple:
+        if not self.enable_ssl:
+            return await asyncio.open_connection(
+                self.server_ip, self.server_listen_port, limit=HTTP_MAX_LINE_LENGTH
+            )
+
+        ssl_context = self.getSSLContext(verify_ssl_certificate)
+        reader, writer = await asyncio.open_connection(
+            self.server_ip,
+            self.server_listen_port,
+            ssl=ssl_context,
+            server_hostname=self.server_ip,
+            limit=HTTP_MAX_LINE_LENGTH,
+        )
+
+        try:
+            ssl_context.verifyPinnedCertificate(
+                writer.get_extra_info("ssl_object").getpeercert(binary_form=True)
+            )
+
+        except ssl.SSLError as E:
+            writer.close()
+            raise E
+
+        return (reader, writer)
+
+    # TLS 1.3 session tickets are received after the handshake
+    def _store_tls_session(self, connection: tuple, verify_ssl_certificate: bool):
+        ssl_object = connection[1].get_extra_info("ssl_object")
+
+        if ssl_object and ssl_object.session is not None:
+            self.getSSLContext(verify_ssl_certificate).storeTLSSession(
+                self.server_ip, ssl_object.session
+            )
+
+    # Returns the connection and whether if it was reused or not
+    async def _acquire_connection(self, verify_ssl_certificate: bool) -> tuple:
+        idle_connections = self.idle_connections[verify_ssl_certificate]
+
+        while idle_connections:
+            reader, writer = idle_connections.pop()
+
+            if not writer.is_closing() and not reader.at_eof():
+                return ((reader, writer), True)
+
+            writer.close()
+
+        return (await self._open_connection(verify_ssl_certificate), False)
+
+    def _release_connection(
+        self, connection: tuple, verify_ssl_certificate: bool, keep_alive: bool
+    ) -> None:
+        idle_connections = self.idle_connections[verify_ssl_certificate]
+
+        if keep_alive and len(idle_connections) < self.pool_size:
+            idle_connections.append(connection)
+            return
+
+        connection[1].close()
+
+    async def _read_headers(
+        self, reader: asyncio.StreamReader, status_line: bytes
+    ) -> tuple:
+        http_version, status_code = status_line.decode("latin-1").split(" ", 2)[:2]
+        headers = {}
+
+        while True:
+            header_line = await reader.readline()
+
+            if header_line in (b"\r\n", b"\n"):
+                break
+
+            if not header_line:
+                raise ConnectionResetError("Connection closed by the server")
+
+            header_name, _, header_value = header_line.decode("latin-1").partition(
+                ":"
+            )
+            headers[header_name.strip().lower()] = header_value.strip()
+
+        return (http_version, int(status_code), headers)
+
+    async def _read_body(
+        self, reader: asyncio.StreamReader, status_code: int, headers: dict
+    ) -> tuple:
+        if status_code < 200 or status_code in HTTP_NO_BODY_STATUS_CODE_LIST:
+            return (b"", True)
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            body = bytearray()
+
+            while True:
+                chunk_size = int((await reader.readline()).split(b";")[0], 16)
+
+                if chunk_size == 0:
+                    # Skip the potential trailer headers
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+
+                    return (bytes(body), True)
+
+                body += await reader.readexactly(chunk_size)
+                await reader.readexactly(2)
+
+        if "content-length" in headers:
+            return (await reader.readexactly(int(headers["content-length"])), True)
+
+        # Without any length indication, the body ends with the connection
+        return (await reader.read(), False)
+
+    async def _exchange(
+        self, connection: tuple, verb: str, encoded_parameters: bytes
+    ) -> tuple:
+        reader, writer = connection
+
+        try:
+            writer.write(
+                (
+                    f"POST /{verb.lower()} HTTP/1.1\r\n"
+                    f"Host: {self.server_ip}:{self.server_listen_port}\r\n"
+                    "Content-Type: application/json\r\n"
+                    "Accept: application/json\r\n"
+                    f"Content-Length: {len(encoded_parameters)}\r\n"
+                    "Connection: keep-alive\r\n\r\n"
+                ).encode("latin-1")
+                + encoded_parameters
+            )
+            await writer.drain()
+
+            status_line = await reader.readline()
+
+        except ConnectionError as E:
+            raise _StaleConnectionError(str(E)) from E
+
+        if not status_line:
+            raise _StaleConnectionError("Connection closed by the server")
+
+        # Once the status line is received, the request may have been processed :
+        # Any failure from now on is raised to the caller
+        http_version, status_code, headers = await self._read_headers(
+            reader, status_line
+        )
+
+        # Interim responses (such as '100 Continue') precede the final one
+        while status_code < 200:
+            status_line = await reader.readline()
+
+            if not status_line:
+                raise ConnectionResetError("Connection closed by the server")
+
+            http_version, status_code, headers = await self._read_headers(
+                reader, status_line
+            )
+
+        body, is_body_delimited = await self._read_body(reader, status_code, headers)
+
+        connection_header = headers.get("connection", "").lower()
+        keep_alive = is_body_delimited and (
+            connection_header == "keep-alive"
+            if http_version == "HTTP/1.0"
+            else connection_header != "close"
+        )
+
+        return (status_code, body, keep_alive)
+
+    async def _send(
+        self, verb: str, encoded_parameters: bytes, verify_ssl_certificate: bool
+    ) -> tuple:
+        connection, is_reused = await self._acquire_connection(verify_ssl_certificate)
+
+        try:
+            status_code, body, keep_alive = await self._exchange(
+                connection, verb, encoded_parameters
+            )
+
+        except _StaleConnectionError as E:
+            connection[1].close()
+
+            # The server may have closed the idle connection in the meantime
+            if not is_reused:
+                raise E
+
+            connection = await self._open_connection(verify_ssl_certificate)
+
+            try:
+                status_code, body, keep_alive = await self._exchange(
+                    connection, verb, encoded_parameters
+                )
+
+            except BaseException as E:
+                connection[1].close()
+                raise E
+
+        except BaseException as E:
+            connection[1].close()
+            raise E
+
+        if self.enable_ssl:
+            self._store_tls_session(connection, verify_ssl_certificate)
+
+        self._release_connection(connection, verify_ssl_certificate, keep_alive)
+
+        return (status_code, body)
+
+    async def sendRequest(
+        self,
+        verb: str,
+        parameters: dict = {},
+        verify_ssl_certificate: bool = DEFAULT_VERIFY_SSL_CERTIFICATE,
+    ) -> tuple:
+        is_request_valid, request_content, request_errors = makeRequest(
+            verb, parameters=parameters
+        )
+
+        if not is_request_valid:
+            raise ValueError(f"Error in specified values : {request_errors}")
+
+        encoded_parameters = json.dumps(
+            request_content.get("parameters"), separators=(",", ":")
+        ).encode()
+
+        async with self.request_semaphore:
+            status_code, body = await asyncio.wait_for(
+                self._send(verb, encoded_parameters, verify_ssl_certificate),
+                self.timeout,
+            )
+
+        if status_code >= 300:
+            raise RuntimeError(f"Status code {status_code} from remote URL")
+
+        return verifyResponseContent(json.loads(body))
+
+    async def closeConnections(self) -> None:
+        for idle_connections in self.idle_connections.values():
+            while idle_connections:
+                _, writer = idle_connections.pop()
+                writer.close()
+
+                try:
+                    await writer.wait_closed()
+
+                except (ConnectionError, ssl.SSLError):
+                    pass
@@ -11,10 +11,25 @@ The request / response scheme stays the same, except that they are exprimed
 in the form of an URL : "http://<server:port>/<verb>".
 The server responds by a JSON response containing a normalized response dictionary.
 
+Requests are sent through keep-alive HTTP sessions with a connection pool,
+which are shared by default between every instance targeting the same server.
+
+In HTTPS mode, the SSL contexts are created once per session : the CA bundle
+is only loaded once, the server certificate can be pinned, and TLS sessions
+are cached so that new connections can resume them instead of performing
+a full handshake.
+
 """
 
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_CA_BUNDLE_PATH
+from typing import Union
+import threading
 import requests
+import hashlib
 import json
+import ssl
+import os
 
 from ..core.sanitization import makeRequest, verifyResponseContent
 
@@ -23,6 +38,259 @@ DEFAULT_HTTP_SERVER_LISTEN_PORT = 8080
 DEFAULT_HTTPS_SERVER_LISTEN_PORT = 4443
 DEFAULT_ENABLE_SSL = False
 DEFAULT_VERIFY_SSL_CERTIFICATE = True
+DEFAULT_POOL_SIZE = 10
+DEFAULT_SHARE_SESSION = True
+DEFAULT_PINNED_CERTIFICATE_SHA256 = None
+DEFAULT_CA_BUNDLE_FILE_PATH = None
+DEFAULT_REQUEST_TIMEOUT = None
+
+
+# Shared sessions, indexed by server base URL, pool size and SSL settings
+shared_sessions = {}
+shared_sessions_lock = threading.Lock()
+
+
+# Stores the TLS session once data was received, since TLS 1.3
+# session tickets are only sent by the server after the handshake
+class _SessionCachingSSLSocket(ssl.SSLSocket):
+    is_tls_session_stored = False
+
+    def _store_tls_session(self) -> None:
+        if self.session is not None:
+            self.context.storeTLSSession(self.server_hostname, self.session)
+            self.is_tls_session_stored = True
+
+    def recv_into(self, buffer, nbytes=None, flags=0):
+        received_bytes = super().recv_into(buffer, nbytes, flags)
+
+        if not self.is_tls_session_stored:
+            self._store_tls_session()
+
+        return received_bytes
+
+    def close(self):
+        try:
+            self._store_tls_session()
+
+        except (OSError, ValueError):
+            pass
+
+        super().close()
+
+
+class ResumableSSLContext(ssl.SSLContext):
+    sslsocket_class = _SessionCachingSSLSocket
+
+    def __new__(cls, *args, **kwargs):
+        return super().__new__(cls, ssl.PROTOCOL_TLS_CLIENT)
+
+    def __init__(
+        self,
+        verify_ssl_certificate: bool = DEFAULT_VERIFY_SSL_CERTIFICATE,
+        pinned_certificate_sha256: Union[None, str] = DEFAULT_PINNED_CERTIFICATE_SHA256,
+        ca_bundle_file_path: Union[None, str] = DEFAULT_CA_BUNDLE_FILE_PATH,
+    ):
+        self.pinned_certificate_sha256 = (
+            pinned_certificate_sha256.replace(":", "").replace(" ", "").lower()
+            if pinned_certificate_sha256
+            else None
+        )
+        self.tls_sessions = {}
+        self.tls_sessions_lock = threading.Lock()
+
+        # The hardened defaults of the urllib3 contexts, except 'OP_NO_TICKET'
+        # which would prevent TLS 1.2 sessions from being resumed
+        self.minimum_version = ssl.TLSVersion.TLSv1_2
+        self.options |= ssl.OP_NO_COMPRESSION
+        self.post_handshake_auth = True
+
+        if verify_ssl_certificate:
+            if not ca_bundle_file_path:
+                ca_bundle_file_path = DEFAULT_CA_BUNDLE_PATH
+
+            if os.path.isdir(ca_bundle_file_path):
+                self.load_verify_locations(capath=ca_bundle_file_path)
+
+            else:
+                self.load_verify_locations(cafile=ca_bundle_file_path)
+
+        else:
+            self.check_hostname = False
+            self.verify_mode = ssl.CERT_NONE
+
+    def getTLSSession(self, server_hostname: str) -> Union[None, ssl.SSLSession]:
+        with self.tls_sessions_lock:
+            return self.tls_sessions.get(server_hostname)
+
+    def storeTLSSession(self, server_hostname: str, session: ssl.SSLSession) -> None:
+        with self.tls_sessions_lock:
+            self.tls_sessions[server_hostname] = session
+
+    # `certificate` is the DER encoded server certificate
+    def verifyPinnedCertificate(self, certificate: bytes) -> None:
+        if not self.pinned_certificate_sha256:
+            return
+
+        if (
+            not certificate
+            or hashlib.sha256(certificate).hexdigest()
+            != self.pinned_certificate_sha256
+        ):
+            raise ssl.SSLCertVerificationError(
+                "Server certificate does not match the pinned certificate"
+            )
+
+    def wrap_socket(
+        self,
+        sock,
+        server_side=False,
+        do_handshake_on_connect=True,
+        suppress_ragged_eofs=True,
+        server_hostname=None,
+        session=None,
+    ):
+        ssl_socket = super().wrap_socket(
+            sock,
+            server_side=server_side,
+            do_handshake_on_connect=do_handshake_on_connect,
+            suppress_ragged_eofs=suppress_ragged_eofs,
+            server_hostname=server_hostname,
+            session=session if session else self.getTLSSession(server_hostname),
+        )
+
+        if do_handshake_on_connect:
+            try:
+                self.verifyPinnedCertificate(ssl_socket.getpeercert(binary_form=True))
+
+            except ssl.SSLError as E:
+                ssl_socket.close()
+                raise E
+
+        return ssl_socket
+
+    # Used by asyncio : the pinned certificate is verified by the caller
+    def wrap_bio(
+        self,
+        incoming,
+        outgoing,
+        server_side=False,
+        server_hostname=None,
+        session=None,
+    ):
+        return super().wrap_bio(
+            incoming,
+            outgoing,
+            server_side=server_side,
+            server_hostname=server_hostname,
+            session=session if session else self.getTLSSession(server_hostname),
+        )
+
+
+# Makes the connection pools use the adapter SSL contexts, instead
+# of loading the CA bundle again on each new connection
+class _ResumableSSLHTTPAdapter(HTTPAdapter):
+    def __init__(
+        self,
+        pinned_certificate_sha256: Union[None, str] = DEFAULT_PINNED_CERTIFICATE_SHA256,
+        ca_bundle_file_path: Union[None, str] = DEFAULT_CA_BUNDLE_FILE_PATH,
+        **kwargs,
+    ):
+        self.pinned_certificate_sha256 = pinned_certificate_sha256
+        self.ca_bundle_file_path = ca_bundle_file_path
+        self.ssl_contexts = {}
+        self.ssl_contexts_lock = threading.Lock()
+
+        super().__init__(**kwargs)
+
+    # `verify` is either a boolean or a CA bundle path, like with requests :
+    # the latter is set by requests from the environment (REQUESTS_CA_BUNDLE)
+    def getSSLContext(self, verify: Union[bool, str]) -> ResumableSSLContext:
+        ca_bundle_file_path = self.ca_bundle_file_path
+
+        if not ca_bundle_file_path and isinstance(verify, str):
+            ca_bundle_file_path = verify
+
+        ssl_context_key = (bool(verify), ca_bundle_file_path)
+
+        with self.ssl_contexts_lock:
+            ssl_context = self.ssl_contexts.get(ssl_context_key)
+
+            if not ssl_context:
+                ssl_context = ResumableSSLContext(
+                    bool(verify),
+                    pinned_certificate_sha256=self.pinned_certificate_sha256,
+                    ca_bundle_file_path=ca_bundle_file_path,
+                )
+                self.ssl_contexts[ssl_context_key] = ssl_context
+
+            return ssl_context
+
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(
+            request, verify, cert
+        )
+
+        if host_params.get("scheme") == "https":
+            pool_kwargs.pop("ca_certs", None)
+            pool_kwargs.pop("ca_cert_dir", None)
+            pool_kwargs["ssl_context"] = self.getSSLContext(verify)
+
+        return (host_params, pool_kwargs)
+
+    def cert_verify(self, conn, url, verify, cert):
+        super().cert_verify(conn, url, verify, cert)
+
+        # The CA bundle is already loaded in the SSL context
+        if url.lower().startswith("https"):
+            conn.ca_certs = None
+            conn.ca_cert_dir = None
+
+
+def _create_session(
+    base_url: str,
+    pool_size: int,
+    pinned_certificate_sha256: Union[None, str] = DEFAULT_PINNED_CERTIFICATE_SHA256,
+    ca_bundle_file_path: Union[None, str] = DEFAULT_CA_BUNDLE_FILE_PATH,
+) -> requests.Session:
+    session = requests.Session()
+    session.mount(
+        base_url,
+        _ResumableSSLHTTPAdapter(
+            pinned_certificate_sha256=pinned_certificate_sha256,
+            ca_bundle_file_path=ca_bundle_file_path,
+            pool_connections=1,
+            pool_maxsize=pool_size,
+        ),
+    )
+    session.headers.update({"Content-Type": "application/json"})
+
+    return session
+
+
+def _get_shared_session(
+    base_url: str,
+    pool_size: int,
+    pinned_certificate_sha256: Union[None, str] = DEFAULT_PINNED_CERTIFICATE_SHA256,
+    ca_bundle_file_path: Union[None, str] = DEFAULT_CA_BUNDLE_FILE_PATH,
+) -> requests.Session:
+    session_key = (base_url, pool_size, pinned_certificate_sha256, ca_bundle_file_path)
+
+    with shared_sessions_lock:
+        session = shared_sessions.get(session_key)
+
+        if not session:
+            session = _create_session(*session_key)
+            shared_sessions[session_key] = session
+
+        return session
+
+
+def closeSharedSessions() -> None:
+    with shared_sessions_lock:
+        for session in shared_sessions.values():
+            session.close()
+
+        shared_sessions.clear()
 
 
 class WebClientInterface:
@@ -31,10 +299,53 @@ class WebClientInterface:
         server_ip: str,
         server_listen_port: int = DEFAULT_HTTP_SERVER_LISTEN_PORT,
         enable_ssl: bool = DEFAULT_ENABLE_SSL,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        share_session: bool = DEFAULT_SHARE_SESSION,
+        pinned_certificate_sha256: Union[None, str] = DEFAULT_PINNED_CERTIFICATE_SHA256,
+        ca_bundle_file_path: Union[None, str] = DEFAULT_CA_BUNDLE_FILE_PATH,
+        timeout: Union[None, float] = DEFAULT_REQUEST_TIMEOUT,
     ):
         self.server_ip = server_ip
         self.enable_ssl = enable_ssl
         self.server_listen_port = server_listen_port
+        self.pool_size = pool_size
+        self.share_session = share_session
+        self.timeout = timeout
+
+        self.base_url = f"http{'s' if enable_ssl else ''}://{server_ip}:{server_listen_port}/"
+        self.session = (
+            _get_shared_session(
+                self.base_url, pool_size, pinned_certificate_sha256, ca_bundle_file_path
+            )
+            if share_session
+            else _create_session(
+                self.base_url, pool_size, pinned_certificate_sha256, ca_bundle_file_path
+            )
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.closeSession()
+
+    def getSession(self) -> requests.Session:
+        return self.session
+
+    def getSSLContext(
+        self, verify_ssl_certificate: bool = DEFAULT_VERIFY_SSL_CERTIFICATE
+    ) -> ResumableSSLContext:
+        # Resolves the CA bundle path from the environment, like requests does
+        verify = self.session.merge_environment_settings(
+            self.base_url, {}, None, verify_ssl_certificate, None
+        )["verify"]
+
+        return self.session.get_adapter(self.base_url).getSSLContext(verify)
+
+    # Shared sessions are kept open, see the `closeSharedSessions` function
+    def closeSession(self) -> None:
+        if not self.share_session:
+            self.session.close()
 
     def sendRequest(
         self,
@@ -49,11 +360,13 @@ class WebClientInterface:
         if not is_request_valid:
             raise ValueError(f"Error in specified values : {request_errors}")
 
-        req = requests.post(
-            f"http{'s' if self.enable_ssl else ''}://{self.server_ip}:{self.server_listen_port}/{verb.lower()}",
-            data=json.dumps(request_content.get("parameters")),
-            headers={"Content-Type": "application/json"},
+        req = self.session.post(
+            self.base_url + verb.lower(),
+            data=json.dumps(
+                request_content.get("parameters"), separators=(",", ":")
+            ).encode(),
             verify=verify_ssl_certificate,
+            timeout=self.timeout,
         )
 
         if req.status_code >= 300:
@@ -0,0 +1,115 @@
+"""
+Copyright 2023 The Anweddol project
+See the LICENSE file for licensing informations
+---
+
+This script measures the cold startup latency of the 'anwdlclient' CLI
+subcommands, by spawning a new interpreter for each run.
+
+Only read-only subcommands are benchmarked by default, it needs an
+installed configuration file. Usage :
+
+    $ python benchmarks/cli_startup.py [-n RUNS] [--importtime]
+
+"""
+
+import subprocess
+import statistics
+import argparse
+import time
+import sys
+import os
+
+# Default parameters
+DEFAULT_RUNS = 10
+
+# Constants definition
+CLI_ENTRY_POINT_CODE = (
+    "from anwdlclient.cli import MainAnweddolClientCLI; MainAnweddolClientCLI()"
+)
+BENCHMARKED_COMMANDS = [
+    ["session", "-l", "--json"],
+    ["container", "-l", "--json"],
+    ["access-tk", "-l", "--json"],
+    ["session", "-p", "1", "--json"],
+    ["create", "--help"],
+    ["stat", "--help"],
+]
+HEAVY_MODULES = ["cryptography", "requests", "cerberus", "yaml"]
+
+
+def measureCommand(command, runs, code=CLI_ENTRY_POINT_CODE):
+    durations = []
+
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", code, *command],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        durations.append((time.perf_counter() - start_time) * 1000)
+
+    return durations
+
+
+# Lists the heavy top-level modules imported by a subcommand
+def getImportedHeavyModules(command):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CLI_ENTRY_POINT_CODE, *command],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    imported_modules = set()
+
+    for line in result.stderr.decode().splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        module_name = line.split("|")[-1].strip()
+
+        if module_name in HEAVY_MODULES:
+            imported_modules.add(module_name)
+
+    return sorted(imported_modules)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="| Measure the 'anwdlclient' CLI cold startup latency"
+    )
+    parser.add_argument(
+        "-n",
+        help=f"specify the runs amount per subcommand (default is {DEFAULT_RUNS})",
+        dest="runs",
+        type=int,
+        default=DEFAULT_RUNS,
+    )
+    parser.add_argument(
+        "--importtime",
+        help="display the heavy modules imported by each subcommand",
+        action="store_true",
+    )
+    args = parser.parse_args()
+
+    interpreter_durations = measureCommand([], args.runs, code="pass")
+    print(
+        f"{'(interpreter only)':<28} median {statistics.median(interpreter_durations):8.1f} ms"
+    )
+
+    for command in BENCHMARKED_COMMANDS:
+        durations = measureCommand(command, args.runs)
+        line = (
+            f"{' '.join(command):<28} median {statistics.median(durations):8.1f} ms"
+            f"   min {min(durations):8.1f} ms   max {max(durations):8.1f} ms"
+        )
+
+        if args.importtime:
+            line += f"   heavy imports : {', '.join(getImportedHeavyModules(command)) or 'none'}"
+
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
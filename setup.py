@@ -52,6 +52,16 @@ session_credentials_db_file_path: {}
 container_credentials_db_file_path: {}
 access_token_db_file_path: {}
 
+# Shared credentials store path : if set, the credentials and
+# access tokens are stored in this single database instead
+#credentials_store_db_file_path: 
+
+# Credentials retention policy : purge the session and container
+# credentials older than this (in seconds), or keep only this
+# amount of credentials per server. Disabled by default
+#credentials_max_age: 
+#credentials_max_rows_per_server: 
+
 # RSA keys root path
 public_rsa_key_file_path: {}
 private_rsa_key_file_path: {}
@@ -96,7 +106,7 @@ setup(
         "anwdlclient.tools",
         "anwdlclient.web",
     ],
-    install_requires=["cryptography", "cerberus", "pyyaml", "requests"],
+    install_requires=["cryptography", "cerberus", "pyyaml", "requests>=2.32"],
     include_package_data=True,
     entry_points={
         "console_scripts": [
@@ -0,0 +1,185 @@
+"""
+Copyright 2023 The Anweddol project
+See the LICENSE file for licensing informations
+---
+
+Tests of the access token lookups cache, against in-memory and
+temporary databases.
+
+"""
+
+import threading
+import tempfile
+import asyncio
+import unittest
+import os
+
+from anwdlclient.tools.async_store import AsyncAccessTokenManager
+from anwdlclient.tools.access_token import AccessTokenManager
+from anwdlclient.tools.store import CredentialsStore, MEMORY_DATABASE_PATH
+
+
+class TestAccessTokenCache(unittest.TestCase):
+    def setUp(self):
+        self.store = CredentialsStore(MEMORY_DATABASE_PATH)
+        self.access_token_manager = AccessTokenManager(store=self.store)
+
+    def tearDown(self):
+        self.access_token_manager.closeDatabase()
+        self.store.closeDatabase()
+
+    def test_lookups_are_cached_per_port(self):
+        self.access_token_manager.addEntry("127.0.0.1", 6150, "native-token")
+        self.access_token_manager.addEntry("127.0.0.1", 8080, "web-token")
+
+        self.assertEqual(
+            self.access_token_manager.getAccessToken("127.0.0.1", 6150), "native-token"
+        )
+        self.assertEqual(
+            self.access_token_manager.getAccessToken("127.0.0.1", 8080), "web-token"
+        )
+        self.assertEqual(
+            self.access_token_manager.getAccessToken("127.0.0.1"), "web-token"
+        )
+
+    def test_lookup_racing_a_clear_is_not_cached(self):
+        self.access_token_manager.addEntry("127.0.0.1", 6150, "old-token")
+        store_execute = self.store.execute
+
+        # The entry is updated by another thread while the lookup queries it
+        def execute(text_query, parameters=(), commit=False):
+            query_cursor = store_execute(text_query, parameters, commit=commit)
+
+            if text_query.startswith("SELECT AccessToken"):
+                self.store.execute = store_execute
+                self.access_token_manager.executeQuery(
+                    "UPDATE AnweddolClientAccessTokenTable SET AccessToken=?",
+                    ("new-token",),
+                    commit=True,
+                )
+
+            return query_cursor
+
+        self.store.execute = execute
+
+        self.assertEqual(
+            self.access_token_manager.getAccessToken("127.0.0.1", 6150), "old-token"
+        )
+        self.assertEqual(
+            self.access_token_manager.getAccessToken("127.0.0.1", 6150), "new-token"
+        )
+
+
+class TestAccessTokenCacheTransaction(unittest.TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.store = CredentialsStore(
+            os.path.join(self.temporary_directory.name, "access_token.db")
+        )
+        self.access_token_manager = AccessTokenManager(store=self.store)
+        self.access_token_manager.addEntry("127.0.0.1", 6150, "old-token")
+
+    def tearDown(self):
+        self.access_token_manager.closeDatabase()
+        self.store.closeDatabase()
+        self.temporary_directory.cleanup()
+
+    # The lookup is made by another thread, which reads the committed entries
+    def _get_access_token_from_thread(self):
+        access_token_list = []
+        lookup_thread = threading.Thread(
+            target=lambda: access_token_list.append(
+                self.access_token_manager.getAccessToken("127.0.0.1", 6150)
+            )
+        )
+        lookup_thread.start()
+        lookup_thread.join()
+
+        return access_token_list[0]
+
+    def _assert_cache_is_cleared_on_commit(self, write_function, access_token):
+        with self.store.transaction():
+            write_function()
+            self.assertEqual(self._get_access_token_from_thread(), "old-token")
+
+        self.assertEqual(
+            self.access_token_manager.getAccessToken("127.0.0.1", 6150), access_token
+        )
+
+    def test_add_entry_in_transaction(self):
+        self._assert_cache_is_cleared_on_commit(
+            lambda: self.access_token_manager.addEntry("127.0.0.1", 6150, "new-token"),
+            "new-token",
+        )
+
+    def test_delete_entry_in_transaction(self):
+        self._assert_cache_is_cleared_on_commit(
+            lambda: self.access_token_manager.deleteEntry(
+                self.access_token_manager.getEntryID("127.0.0.1", 6150)
+            ),
+            None,
+        )
+
+    def test_execute_query_in_transaction(self):
+        self._assert_cache_is_cleared_on_commit(
+            lambda: self.access_token_manager.executeQuery(
+                "UPDATE AnweddolClientAccessTokenTable SET AccessToken=?",
+                ("new-token",),
+                commit=True,
+            ),
+            "new-token",
+        )
+
+    def test_rolled_back_entry_is_not_cached(self):
+        with self.assertRaises(RuntimeError):
+            with self.store.transaction():
+                self.access_token_manager.addEntry("127.0.0.1", 6150, "new-token")
+                self.access_token_manager.getAccessToken("127.0.0.1", 6150)
+
+                raise RuntimeError("Rollback")
+
+        self.assertEqual(
+            self.access_token_manager.getAccessToken("127.0.0.1", 6150), "old-token"
+        )
+
+
+class TestAsyncAccessTokenCache(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.async_access_token_manager = AsyncAccessTokenManager(
+            os.path.join(self.temporary_directory.name, "access_token.db")
+        )
+
+        await self.async_access_token_manager.addEntry(
+            "127.0.0.1", 6150, "old-token"
+        )
+
+    async def asyncTearDown(self):
+        await self.async_access_token_manager.closeDatabase()
+        self.temporary_directory.cleanup()
+
+    async def test_cache_is_cleared_after_group_commit(self):
+        access_token_manager = self.async_access_token_manager.getManager()
+
+        # Made from another thread while the group is not committed yet
+        def get_access_token_from_thread():
+            lookup_thread = threading.Thread(
+                target=access_token_manager.getAccessToken, args=("127.0.0.1", 6150)
+            )
+            lookup_thread.start()
+            lookup_thread.join()
+
+        async_store = self.async_access_token_manager.getAsyncStore()
+        await asyncio.gather(
+            self.async_access_token_manager.addEntry("127.0.0.1", 6150, "new-token"),
+            async_store.runWrite(get_access_token_from_thread),
+        )
+
+        self.assertEqual(
+            await self.async_access_token_manager.getAccessToken("127.0.0.1", 6150),
+            "new-token",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
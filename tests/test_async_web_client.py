@@ -0,0 +1,147 @@
+"""
+Copyright 2023 The Anweddol project
+See the LICENSE file for licensing informations
+---
+
+Tests of the asynchronous web client HTTP/1.1 handling : connection
+reuse, resends and response body delimitation, against a local server
+answering with scripted responses.
+
+"""
+
+import asyncio
+import unittest
+import json
+
+from anwdlclient.web.async_client import AsyncWebClientInterface
+
+RESPONSE_BODY = json.dumps({"success": True, "message": "OK", "data": {}}).encode()
+RESPONSE = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/json\r\n"
+    + f"Content-Length: {len(RESPONSE_BODY)}\r\n\r\n".encode()
+    + RESPONSE_BODY
+)
+
+
+class _ScriptedHTTPServer:
+    def __init__(self, response_list):
+        # Each response is written as is, then the connection is closed if it is
+        # followed by 'None' in a tuple. A 'None' response closes it right away
+        self.response_list = list(response_list)
+        self.connections_amount = 0
+        self.requests_amount = 0
+        self.server = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(
+            self._handle_connection, "127.0.0.1", 0
+        )
+
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle_connection(self, reader, writer):
+        self.connections_amount += 1
+
+        try:
+            while True:
+                header_bytes = await reader.readuntil(b"\r\n\r\n")
+                content_length = int(
+                    header_bytes.lower().split(b"content-length:")[1].split(b"\r\n")[0]
+                )
+                await reader.readexactly(content_length)
+                self.requests_amount += 1
+
+                response = self.response_list.pop(0)
+
+                if response is None:
+                    break
+
+                writer.write(response[0] if type(response) is tuple else response)
+                await writer.drain()
+
+                if type(response) is tuple:
+                    break
+
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+        writer.close()
+
+
+class TestAsyncWebClientConnections(unittest.IsolatedAsyncioTestCase):
+    async def _start_server(self, response_list):
+        self.server = _ScriptedHTTPServer(response_list)
+        self.client = AsyncWebClientInterface(
+            "127.0.0.1", server_listen_port=await self.server.start(), timeout=5
+        )
+
+    async def asyncTearDown(self):
+        await self.client.closeConnections()
+        await self.server.stop()
+
+    async def test_connection_is_reused(self):
+        await self._start_server([RESPONSE, RESPONSE])
+
+        for _ in range(2):
+            self.assertTrue((await self.client.sendRequest("STAT"))[0])
+
+        self.assertEqual(self.server.connections_amount, 1)
+
+    # The server closed the idle connection before receiving the request
+    async def test_request_is_resent_on_a_stale_connection(self):
+        await self._start_server([RESPONSE, None, RESPONSE])
+
+        for _ in range(2):
+            self.assertTrue((await self.client.sendRequest("STAT"))[0])
+
+        self.assertEqual(self.server.connections_amount, 2)
+
+    # The request may have been processed once a response byte was received
+    async def test_request_is_not_resent_after_a_partial_response(self):
+        for partial_response in (RESPONSE[:20], RESPONSE[:-5]):
+            with self.subTest(partial_response=partial_response):
+                await self._start_server(
+                    [RESPONSE, (partial_response, None), RESPONSE]
+                )
+
+                await self.client.sendRequest("STAT")
+
+                with self.assertRaises(
+                    (ConnectionResetError, asyncio.IncompleteReadError)
+                ):
+                    await self.client.sendRequest("STAT")
+
+                self.assertEqual(self.server.requests_amount, 2)
+
+                await self.asyncTearDown()
+
+    async def test_interim_response_is_skipped(self):
+        await self._start_server([b"HTTP/1.1 100 Continue\r\n\r\n" + RESPONSE])
+
+        self.assertTrue((await self.client.sendRequest("STAT"))[0])
+
+    # Without a length indication, these responses would be read until the
+    # connection is closed by the server
+    async def test_responses_without_body(self):
+        for status_line in (b"HTTP/1.1 204 No Content", b"HTTP/1.1 304 Not Modified"):
+            with self.subTest(status_line=status_line):
+                await self._start_server([status_line + b"\r\n\r\n", RESPONSE])
+
+                status_code, body = await asyncio.wait_for(
+                    self.client._send("STAT", b"{}", True), 5
+                )
+
+                self.assertEqual(body, b"")
+                self.assertTrue((await self.client.sendRequest("STAT"))[0])
+                self.assertEqual(self.server.connections_amount, 1)
+
+                await self.asyncTearDown()
+
+
+if __name__ == "__main__":
+    unittest.main()
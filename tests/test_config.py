@@ -0,0 +1,163 @@
+"""
+Copyright 2023 The Anweddol project
+See the LICENSE file for licensing informations
+---
+
+Tests of the configuration file manager : snapshot files, content
+reloading and change callbacks, against temporary configuration files.
+
+"""
+
+from unittest import mock
+import tempfile
+import unittest
+import time
+import sys
+import os
+
+from anwdlclient.config import ConfigurationFileManager
+
+CONFIG_FILE_CONTENT = """session_credentials_db_file_path: session.db
+container_credentials_db_file_path: container.db
+access_token_db_file_path: access_token.db
+public_rsa_key_file_path: public.pem
+private_rsa_key_file_path: private.pem
+enable_onetime_rsa_keys: {}
+"""
+
+
+class TestConfigurationSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.config_file_path = os.path.join(
+            self.temporary_directory.name, "config.yaml"
+        )
+
+        with open(self.config_file_path, "w") as fd:
+            fd.write(CONFIG_FILE_CONTENT.format("false"))
+
+        # Nothing can be created under a regular file, even by root
+        self.unwritable_folder_path = os.path.join(self.config_file_path, "folder")
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def _create_config_manager(self, cache_folder_path):
+        with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": cache_folder_path}):
+            config_manager = ConfigurationFileManager(self.config_file_path)
+
+        config_manager.snapshot_file_path = os.path.join(
+            self.unwritable_folder_path, "config.yaml.cache"
+        )
+
+        return config_manager
+
+    def test_fallback_snapshot_is_used_if_the_folder_is_not_writable(self):
+        cache_folder_path = os.path.join(self.temporary_directory.name, "cache")
+
+        self.assertTrue(self._create_config_manager(cache_folder_path).loadContent()[0])
+        self.assertTrue(
+            os.path.isfile(
+                self._create_config_manager(
+                    cache_folder_path
+                ).getFallbackSnapshotFilePath()
+            )
+        )
+
+        # The content is not parsed again
+        with mock.patch.dict(sys.modules, {"yaml": None, "cerberus": None}):
+            is_content_valid, content = self._create_config_manager(
+                cache_folder_path
+            ).loadContent()
+
+        self.assertTrue(is_content_valid)
+        self.assertFalse(content["enable_onetime_rsa_keys"])
+
+    def test_unwritable_snapshot_is_not_retried(self):
+        config_manager = self._create_config_manager(self.unwritable_folder_path)
+
+        self.assertTrue(config_manager.loadContent()[0])
+
+        with mock.patch.object(
+            config_manager, "_write_snapshot_file"
+        ) as write_snapshot_file:
+            self.assertTrue(config_manager.loadContent()[0])
+
+        write_snapshot_file.assert_not_called()
+
+
+class TestConfigurationFileWatch(unittest.TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.config_file_path = os.path.join(
+            self.temporary_directory.name, "config.yaml"
+        )
+        self._write_config_file(False)
+
+        self.config_manager = ConfigurationFileManager(self.config_file_path)
+
+    def tearDown(self):
+        self.config_manager.stopWatching()
+        self.temporary_directory.cleanup()
+
+    def _write_config_file(self, enable_onetime_rsa_keys):
+        with open(self.config_file_path, "w") as fd:
+            fd.write(CONFIG_FILE_CONTENT.format(str(enable_onetime_rsa_keys).lower()))
+
+    def _wait_for(self, condition):
+        deadline = time.monotonic() + 5
+
+        while not condition():
+            if time.monotonic() > deadline:
+                self.fail("Timed out waiting for the configuration reload")
+
+            time.sleep(0.01)
+
+    # The content was swapped, so the callback error is not a loading error
+    def test_callback_errors_are_reported_apart(self):
+        callback_content_list = []
+
+        def failing_callback(previous_content, content):
+            raise RuntimeError("Callback failure")
+
+        self.assertTrue(
+            self.config_manager.startWatching(poll_interval=0.01, use_inotify=False)[0]
+        )
+        self.config_manager.addChangeCallback(failing_callback)
+        self.config_manager.addChangeCallback(
+            lambda previous_content, content: callback_content_list.append(content)
+        )
+
+        # The modification time may not change on coarse-grained filesystems
+        time.sleep(0.05)
+        self._write_config_file(True)
+        self._wait_for(lambda: callback_content_list)
+
+        self.assertTrue(self.config_manager.getContent()["enable_onetime_rsa_keys"])
+        self.assertIsNone(self.config_manager.getLastErrors())
+        self.assertEqual(
+            [
+                callback_error["error"]
+                for callback_error in self.config_manager.getLastCallbackErrors()
+            ],
+            ["Callback failure"],
+        )
+
+    def test_loading_errors_keep_the_previous_content(self):
+        self.assertTrue(
+            self.config_manager.startWatching(poll_interval=0.01, use_inotify=False)[0]
+        )
+
+        time.sleep(0.05)
+
+        with open(self.config_file_path, "w") as fd:
+            fd.write("enable_onetime_rsa_keys: true\n")
+
+        self._wait_for(lambda: self.config_manager.getLastErrors())
+
+        self.assertFalse(self.config_manager.getContent()["enable_onetime_rsa_keys"])
+        self.assertIsNone(self.config_manager.getLastCallbackErrors())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,290 @@
+"""
+Copyright 2023 The Anweddol project
+See the LICENSE file for licensing informations
+---
+
+Tests of the credentials managers, against temporary databases.
+
+"""
+
+import threading
+import tempfile
+import unittest
+import time
+import os
+
+from anwdlclient.tools.async_store import AsyncSessionCredentialsManager
+from anwdlclient.tools.credentials import (
+    SessionCredentialsManager,
+    ContainerCredentialsManager,
+)
+from anwdlclient.tools.store import DEFAULT_PURGE_BATCH_SIZE
+
+SESSION_CREDENTIALS_TABLE_NAME = "AnweddolClientSessionCredentialsTable"
+
+
+class TestExpiredEntriesPurge(unittest.TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temporary_directory.name, "session.db")
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def _count_entries(self, session_credentials_manager):
+        return session_credentials_manager.getStore().execute(
+            f"SELECT COUNT(*) FROM {SESSION_CREDENTIALS_TABLE_NAME}"
+        ).fetchone()[0]
+
+    def _list_entry_ids(self, session_credentials_manager):
+        return [entry[0] for entry in session_credentials_manager.listEntries()]
+
+    # (EntryID, CreationTimestamp, ServerIP, ServerPort) of each stored entry
+    def _upsert_entries(self, session_credentials_manager, entry_list):
+        session_credentials_manager.upsertEntries(
+            [(*entry, f"uuid-{entry[0]}", "token") for entry in entry_list]
+        )
+
+    def test_max_rows_per_server_keeps_the_most_recent_entries(self):
+        with SessionCredentialsManager(self.db_path) as session_credentials_manager:
+            now = int(time.time())
+            self._upsert_entries(
+                session_credentials_manager,
+                [
+                    (1, now, "10.0.0.1", 6150),
+                    (2, now, "10.0.0.1", 6151),
+                    (3, now, "10.0.0.2", 6150),
+                    (4, now, "10.0.0.1", 6150),
+                    (5, now, "10.0.0.1", 6150),
+                    (6, now, "10.0.0.1", 6151),
+                ],
+            )
+
+            session_credentials_manager.setRetentionPolicy(max_rows_per_server=2)
+
+            self.assertEqual(session_credentials_manager.purgeEntries(), 1)
+            self.assertEqual(
+                self._list_entry_ids(session_credentials_manager), [2, 3, 4, 5, 6]
+            )
+
+    def test_max_age_deletes_older_entries(self):
+        with SessionCredentialsManager(self.db_path) as session_credentials_manager:
+            now = int(time.time())
+            self._upsert_entries(
+                session_credentials_manager,
+                [
+                    (1, now - 3600, "10.0.0.1", 6150),
+                    (2, now, "10.0.0.1", 6150),
+                    (3, now - 7200, "10.0.0.2", 6150),
+                ],
+            )
+
+            session_credentials_manager.setRetentionPolicy(max_age=60)
+
+            self.assertEqual(session_credentials_manager.purgeEntries(), 2)
+            self.assertEqual(self._list_entry_ids(session_credentials_manager), [2])
+
+    def test_both_limits_apply(self):
+        with SessionCredentialsManager(self.db_path) as session_credentials_manager:
+            now = int(time.time())
+            self._upsert_entries(
+                session_credentials_manager,
+                [
+                    (1, now - 3600, "10.0.0.1", 6150),
+                    (2, now, "10.0.0.1", 6150),
+                    (3, now, "10.0.0.1", 6150),
+                    (4, now - 3600, "10.0.0.2", 6150),
+                ],
+            )
+
+            session_credentials_manager.setRetentionPolicy(
+                max_age=60, max_rows_per_server=1
+            )
+
+            self.assertEqual(session_credentials_manager.purgeEntries(), 3)
+            self.assertEqual(self._list_entry_ids(session_credentials_manager), [3])
+
+    def test_max_batches_limits_the_purge(self):
+        with SessionCredentialsManager(
+            self.db_path, max_rows_per_server=0
+        ) as session_credentials_manager:
+            self._upsert_entries(
+                session_credentials_manager,
+                [(index, 0, "10.0.0.1", 6150) for index in range(1, 11)],
+            )
+
+            self.assertEqual(
+                session_credentials_manager.purgeEntries(batch_size=3, max_batches=2),
+                6,
+            )
+            self.assertEqual(self._count_entries(session_credentials_manager), 4)
+
+    def test_purge_deletes_every_batch(self):
+        with SessionCredentialsManager(self.db_path) as session_credentials_manager:
+            session_credentials_manager.addEntries(
+                [
+                    ("127.0.0.1", 6150, f"uuid-{index}", "token")
+                    for index in range(DEFAULT_PURGE_BATCH_SIZE * 2 + 1)
+                ]
+            )
+
+            session_credentials_manager.setRetentionPolicy(max_rows_per_server=10)
+            session_credentials_manager.addEntry("127.0.0.1", 6150, "uuid", "token")
+
+            self.assertEqual(self._count_entries(session_credentials_manager), 10)
+
+    def test_purge_interval_is_shared_between_managers(self):
+        with SessionCredentialsManager(
+            self.db_path, max_rows_per_server=1
+        ) as first_session_credentials_manager, SessionCredentialsManager(
+            self.db_path, max_rows_per_server=1
+        ) as second_session_credentials_manager:
+            first_session_credentials_manager.addEntry(
+                "127.0.0.1", 6150, "uuid-1", "token"
+            )
+            self.assertIsNotNone(
+                second_session_credentials_manager.getStore().getLastPurgeTimestamp(
+                    SESSION_CREDENTIALS_TABLE_NAME
+                )
+            )
+
+            # The second manager has never purged, but the purge interval
+            # started with the purge of the first one
+            second_session_credentials_manager.addEntry(
+                "127.0.0.1", 6150, "uuid-2", "token"
+            )
+            self.assertEqual(self._count_entries(first_session_credentials_manager), 2)
+
+
+class TestContainerCredentialsUpsert(unittest.TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.container_credentials_manager = ContainerCredentialsManager(
+            os.path.join(self.temporary_directory.name, "container.db")
+        )
+
+    def tearDown(self):
+        self.container_credentials_manager.closeDatabase()
+        self.temporary_directory.cleanup()
+
+    def test_upserted_entry_is_found_by_container_uuid(self):
+        self.container_credentials_manager.upsertEntries(
+            [(1, 0, "127.0.0.1", 6150, "user", "password", 22, "uuid-1")]
+        )
+
+        self.assertEqual(
+            self.container_credentials_manager.getEntryIDByContainerUUID("uuid-1"), 1
+        )
+
+    def test_upsert_without_container_uuid_keeps_it(self):
+        self.container_credentials_manager.upsertEntries(
+            [(1, 0, "127.0.0.1", 6150, "user", "password", 22, "uuid-1")]
+        )
+        self.container_credentials_manager.upsertEntries(
+            [(1, 0, "127.0.0.1", 6150, "user", "new-password", 22)]
+        )
+
+        self.assertEqual(
+            self.container_credentials_manager.getEntryIDByContainerUUID("uuid-1"), 1
+        )
+        self.assertEqual(
+            self.container_credentials_manager.getEntry(1)[5], "new-password"
+        )
+
+
+class TestContainerCredentialsDeletionBySession(unittest.TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.container_credentials_manager = ContainerCredentialsManager(
+            os.path.join(self.temporary_directory.name, "container.db")
+        )
+
+    def tearDown(self):
+        self.container_credentials_manager.closeDatabase()
+        self.temporary_directory.cleanup()
+
+    def test_linked_entry_is_deleted(self):
+        legacy_entry_id, _ = self.container_credentials_manager.addEntry(
+            "127.0.0.1", 6150, "user", "password", 22
+        )
+        self.container_credentials_manager.addEntry(
+            "127.0.0.1", 6150, "user", "password", 22, container_uuid="uuid-1"
+        )
+
+        self.assertEqual(
+            self.container_credentials_manager.deleteEntriesBySession(
+                [("uuid-1", "127.0.0.1", 6150)]
+            ),
+            1,
+        )
+        self.assertEqual(
+            [entry[0] for entry in self.container_credentials_manager.listEntries()],
+            [legacy_entry_id],
+        )
+
+    # Entries created before the container UUID column have a NULL UUID
+    def test_legacy_entry_of_the_server_is_deleted(self):
+        self.container_credentials_manager.addEntry(
+            "127.0.0.1", 6150, "user", "password", 22
+        )
+        self.container_credentials_manager.addEntry(
+            "127.0.0.1", 6151, "user", "password", 22
+        )
+        linked_entry_id, _ = self.container_credentials_manager.addEntry(
+            "127.0.0.1", 6150, "user", "password", 22, container_uuid="uuid-2"
+        )
+
+        self.assertEqual(
+            self.container_credentials_manager.deleteEntriesBySession(
+                [("uuid-1", "127.0.0.1", 6150)]
+            ),
+            1,
+        )
+        self.assertEqual(
+            [
+                (entry[0], entry[3])
+                for entry in self.container_credentials_manager.iterEntries(
+                    full_entries=True
+                )
+            ],
+            [(2, 6151), (linked_entry_id, 6150)],
+        )
+
+
+class TestAsyncEntriesIteration(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.async_session_credentials_manager = AsyncSessionCredentialsManager(
+            os.path.join(self.temporary_directory.name, "session.db")
+        )
+
+    async def asyncTearDown(self):
+        await self.async_session_credentials_manager.closeDatabase()
+        self.temporary_directory.cleanup()
+
+    async def test_iteration_runs_on_a_single_thread(self):
+        await self.async_session_credentials_manager.addEntries(
+            [("127.0.0.1", 6150, f"uuid-{index}", "token") for index in range(250)]
+        )
+
+        async_store = self.async_session_credentials_manager.getAsyncStore()
+        session_credentials_manager = (
+            self.async_session_credentials_manager.getManager()
+        )
+        thread_name_set = set()
+
+        def iter_entries():
+            for entry in session_credentials_manager.iterEntries(page_size=100):
+                thread_name_set.add(threading.current_thread().name)
+                yield entry
+
+        entry_list = [
+            entry async for entry in async_store.iterate(iter_entries(), page_size=100)
+        ]
+
+        self.assertEqual(len(entry_list), 250)
+        self.assertEqual(len(thread_name_set), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Copyright 2023 The Anweddol project
+See the LICENSE file for licensing informations
+---
+
+Tests of the credentials store keyset pagination, against an
+in-memory database.
+
+"""
+
+from itertools import islice
+import unittest
+
+from anwdlclient.tools.store import CredentialsStore, MEMORY_DATABASE_PATH
+
+TEST_TABLE_NAME = "TestTable"
+# (EntryID, CreationTimestamp, ServerIP, ServerPort) rows
+TEST_ENTRY_LIST = [
+    (1, 100, "10.0.0.1", 6150),
+    (2, 200, "10.0.0.2", 6150),
+    (3, 300, "10.0.0.1", 6151),
+    (4, 400, "10.0.0.1", 6150),
+    (5, 500, "10.0.0.2", 6150),
+    (6, 600, "10.0.0.1", 6150),
+]
+
+
+class TestIterTableEntries(unittest.TestCase):
+    def setUp(self):
+        self.store = CredentialsStore(MEMORY_DATABASE_PATH)
+        self.store.execute(
+            f"""CREATE TABLE {TEST_TABLE_NAME} (
+                EntryID INTEGER NOT NULL PRIMARY KEY,
+                CreationTimestamp INTEGER NOT NULL,
+                ServerIP TEXT NOT NULL,
+                ServerPort INTEGER NOT NULL
+            )"""
+        )
+        self.store.executemany(
+            f"INSERT INTO {TEST_TABLE_NAME} VALUES (?, ?, ?, ?)",
+            TEST_ENTRY_LIST,
+            commit=True,
+        )
+
+    def tearDown(self):
+        self.store.closeDatabase()
+
+    def _iter_entry_ids(self, **kwargs):
+        return [
+            entry[0]
+            for entry in self.store.iterTableEntries(
+                TEST_TABLE_NAME, ["EntryID"], **kwargs
+            )
+        ]
+
+    def test_every_page_is_read(self):
+        for page_size in (1, 2, 3, 5, 6, 7):
+            with self.subTest(page_size=page_size):
+                self.assertEqual(
+                    self._iter_entry_ids(page_size=page_size), [1, 2, 3, 4, 5, 6]
+                )
+
+    def test_descending_order(self):
+        for page_size in (1, 2, 4, 6):
+            with self.subTest(page_size=page_size):
+                self.assertEqual(
+                    self._iter_entry_ids(descending_order=True, page_size=page_size),
+                    [6, 5, 4, 3, 2, 1],
+                )
+
+    # 'created_after' is inclusive, 'created_before' is exclusive
+    def test_creation_timestamp_bounds(self):
+        self.assertEqual(self._iter_entry_ids(created_after=300), [3, 4, 5, 6])
+        self.assertEqual(self._iter_entry_ids(created_before=300), [1, 2])
+        self.assertEqual(
+            self._iter_entry_ids(created_after=200, created_before=500, page_size=1),
+            [2, 3, 4],
+        )
+        self.assertEqual(
+            self._iter_entry_ids(
+                created_after=200, created_before=500, descending_order=True
+            ),
+            [4, 3, 2],
+        )
+        self.assertEqual(self._iter_entry_ids(created_after=700), [])
+        self.assertEqual(
+            self._iter_entry_ids(created_after=400, created_before=400), []
+        )
+
+    def test_server_filters(self):
+        self.assertEqual(self._iter_entry_ids(server_ip="10.0.0.1"), [1, 3, 4, 6])
+        self.assertEqual(
+            self._iter_entry_ids(
+                server_ip="10.0.0.1", server_port=6150, descending_order=True
+            ),
+            [6, 4, 1],
+        )
+        self.assertEqual(
+            self._iter_entry_ids(server_ip="10.0.0.1", created_after=300, page_size=1),
+            [3, 4, 6],
+        )
+
+    # The listing limit stops the iteration, as the CLI '--limit' option does
+    def test_limited_iteration(self):
+        entry_iterator = self.store.iterTableEntries(
+            TEST_TABLE_NAME, ["EntryID"], descending_order=True, page_size=2
+        )
+
+        self.assertEqual([entry[0] for entry in islice(entry_iterator, 3)], [6, 5, 4])
+
+        entry_iterator.close()
+        self.assertEqual(list(entry_iterator), [])
+
+    def test_invalid_page_size(self):
+        with self.assertRaises(ValueError):
+            self._iter_entry_ids(page_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,195 @@
+"""
+Copyright 2023 The Anweddol project
+See the LICENSE file for licensing informations
+---
+
+Tests of the HTTPS features of the web client : certificate pinning
+and custom CA bundle, against a local HTTPS server.
+
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import ipaddress
+import datetime
+import tempfile
+import threading
+import unittest
+import hashlib
+import json
+import ssl
+import os
+
+from cryptography import x509
+from cryptography.x509.oid import NameOID
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from requests.adapters import HTTPAdapter
+import requests
+
+from anwdlclient.web.client import WebClientInterface
+
+
+class _StatRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.session_reused_list.append(self.connection.session_reused)
+
+        response_body = json.dumps(
+            {"success": True, "message": "OK", "data": {}}
+        ).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response_body)))
+        self.end_headers()
+        self.wfile.write(response_body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _create_certificate(certificate_file_path, private_key_file_path):
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(private_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(
+            x509.SubjectAlternativeName(
+                [x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]
+            ),
+            critical=False,
+        )
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(private_key, hashes.SHA256())
+    )
+
+    with open(certificate_file_path, "wb") as fd:
+        fd.write(certificate.public_bytes(serialization.Encoding.PEM))
+
+    with open(private_key_file_path, "wb") as fd:
+        fd.write(
+            private_key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+
+    return hashlib.sha256(
+        certificate.public_bytes(serialization.Encoding.DER)
+    ).hexdigest()
+
+
+class TestWebClientSSL(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_folder = tempfile.TemporaryDirectory()
+        cls.certificate_file_path = os.path.join(cls.tmp_folder.name, "server.pem")
+        private_key_file_path = os.path.join(cls.tmp_folder.name, "server.key")
+        cls.certificate_sha256 = _create_certificate(
+            cls.certificate_file_path, private_key_file_path
+        )
+
+        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ssl_context.load_cert_chain(cls.certificate_file_path, private_key_file_path)
+
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _StatRequestHandler)
+        cls.server.socket = ssl_context.wrap_socket(cls.server.socket, server_side=True)
+        cls.server.session_reused_list = []
+        cls.server_thread = threading.Thread(
+            target=cls.server.serve_forever, daemon=True
+        )
+        cls.server_thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.tmp_folder.cleanup()
+
+    def _send_stat_request(self, verify_ssl_certificate=True, **kwargs):
+        with WebClientInterface(
+            "127.0.0.1",
+            server_listen_port=self.server.server_address[1],
+            enable_ssl=True,
+            share_session=False,
+            timeout=10,
+            **kwargs,
+        ) as web_client:
+            return web_client.sendRequest(
+                "STAT", verify_ssl_certificate=verify_ssl_certificate
+            )
+
+    # The SSL contexts are set on the connection pools with this hook
+    def test_connection_pool_hook_is_available(self):
+        self.assertTrue(hasattr(HTTPAdapter, "build_connection_pool_key_attributes"))
+
+    def test_hardened_ssl_context(self):
+        with WebClientInterface(
+            "127.0.0.1", enable_ssl=True, share_session=False
+        ) as web_client:
+            ssl_context = web_client.getSSLContext()
+
+        self.assertEqual(ssl_context.minimum_version, ssl.TLSVersion.TLSv1_2)
+        self.assertTrue(ssl_context.options & ssl.OP_NO_COMPRESSION)
+        self.assertFalse(ssl_context.options & ssl.OP_NO_TICKET)
+        self.assertEqual(ssl_context.verify_mode, ssl.CERT_REQUIRED)
+        self.assertTrue(ssl_context.check_hostname)
+
+    # The pooled connections are closed between the requests, so that the
+    # second one is sent on a new connection resuming the first TLS session
+    def test_tls_session_is_resumed_on_a_new_connection(self):
+        self.server.session_reused_list.clear()
+
+        with WebClientInterface(
+            "127.0.0.1",
+            server_listen_port=self.server.server_address[1],
+            enable_ssl=True,
+            share_session=False,
+            ca_bundle_file_path=self.certificate_file_path,
+            timeout=10,
+        ) as web_client:
+            for _ in range(2):
+                self.assertTrue(web_client.sendRequest("STAT")[0])
+                web_client.getSession().get_adapter(
+                    web_client.base_url
+                ).poolmanager.clear()
+
+        self.assertEqual(self.server.session_reused_list, [False, True])
+
+    def test_custom_ca_bundle(self):
+        is_response_valid, _, _ = self._send_stat_request(
+            ca_bundle_file_path=self.certificate_file_path
+        )
+
+        self.assertTrue(is_response_valid)
+
+    def test_matching_pinned_certificate(self):
+        is_response_valid, _, _ = self._send_stat_request(
+            ca_bundle_file_path=self.certificate_file_path,
+            pinned_certificate_sha256=self.certificate_sha256,
+        )
+
+        self.assertTrue(is_response_valid)
+
+    # The pinned certificate is checked even if the certificate is not verified
+    def test_mismatching_pinned_certificate(self):
+        with self.assertRaises(requests.exceptions.SSLError):
+            self._send_stat_request(
+                verify_ssl_certificate=False,
+                pinned_certificate_sha256="0" * 64,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()